@@ -0,0 +1,81 @@
+"""
+주가/누적 수익률 차트의 그림 생성 시간과 직렬화 크기 벤치마크
+
+전체 점을 그리는 SVG(Scatter) 방식과 다운샘플링(minmax, LTTB) + WebGL(Scattergl) 방식을 비교합니다.
+실행: python -m benchmarks.bench_charts
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from market.downsample import DEFAULT_MAX_POINTS, line_trace
+
+# (설명, 종목 수, 봉 개수, 봉 간격)
+SCENARIOS = [
+    ('1년 일봉', 10, 252, 'B'),
+    ('10년 일봉', 10, 2520, 'B'),
+    ('20일 1분봉', 10, 20 * 390, 'min'),
+    ('1년 1분봉', 10, 252 * 390, 'min'),
+]
+
+
+def synthetic_prices(n_tickers, n_bars, freq, seed=0):
+    """기하 브라운 운동으로 만든 가상 종가 DataFrame"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2015-01-01', periods=n_bars, freq=freq)
+    steps = rng.normal(0.0003, 0.02, size=(n_bars, n_tickers))
+    prices = 100 * np.exp(np.cumsum(steps, axis=0))
+    return pd.DataFrame(prices, index=index, columns=[f'T{i:02d}' for i in range(n_tickers)])
+
+
+def build_figure(df, max_points, method):
+    """페이지와 같은 방식으로 선 그래프 그림 생성"""
+    fig = go.Figure()
+    for ticker in df.columns:
+        fig.add_trace(line_trace(df[ticker], max_points, method, mode='lines', name=ticker))
+    return fig
+
+
+def measure(df, max_points, method, repeat):
+    """그림 생성 시간, 직렬화 시간(중앙값, ms)과 직렬화된 JSON 크기(bytes)"""
+    build_times, serialize_times = [], []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = build_figure(df, max_points, method)
+        build_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        payload = fig.to_json()
+        serialize_times.append(time.perf_counter() - start)
+        size = len(payload.encode())
+    return np.median(build_times) * 1000, np.median(serialize_times) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_POINTS, help='종목별 최대 점 개수')
+    parser.add_argument('--repeat', type=int, default=3, help='시나리오별 반복 횟수')
+    args = parser.parse_args()
+
+    header = f"{'시나리오':<12}{'모드':<14}{'생성(ms)':>10}{'직렬화(ms)':>12}{'크기(KB)':>12}"
+    print(header)
+    print('-' * len(header))
+    modes = (
+        ('전체/SVG', None, None),
+        ('minmax/WebGL', args.max_points, 'minmax'),
+        ('LTTB/WebGL', args.max_points, 'lttb'),
+    )
+    build_figure(synthetic_prices(1, 10, 'B'), None, None)  # plotly 초기화 비용 제외
+    for label, n_tickers, n_bars, freq in SCENARIOS:
+        df = synthetic_prices(n_tickers, n_bars, freq)
+        for mode, max_points, method in modes:
+            build_ms, serialize_ms, size = measure(df, max_points, method, args.repeat)
+            print(f"{label:<12}{mode:<14}{build_ms:>10.1f}{serialize_ms:>12.1f}{size / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
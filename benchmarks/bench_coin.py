@@ -0,0 +1,147 @@
+"""
+05_coin 페이지 처리 단계별 벤치마크
+
+네트워크 없이 ReplayProvider 데이터로 종목 수(10/100/1000)와 기간(1y/10y)별로
+수집, 수익률/통계 계산, 차트 생성, 직렬화 시간을 측정하고 결과를 JSON으로 저장합니다.
+--compare로 이전 결과 파일을 주면 느려진 항목을 표시합니다.
+
+실행: python -m benchmarks.bench_coin [--output results.json] [--compare old.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from market.downsample import DEFAULT_MAX_POINTS, line_trace
+from market.fetch import TickerCache
+from market.providers import ReplayProvider
+from market.stats import compute_statistics
+
+TICKER_COUNTS = (10, 100, 1000)
+PERIODS = ('1y', '10y')
+STAGES = ('fetch', 'returns', 'figure', 'serialize')
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def build_figure(df, max_points=None):
+    """페이지의 주가 차트와 같은 방식으로 그림 생성"""
+    fig = go.Figure()
+    for ticker in df.columns:
+        fig.add_trace(line_trace(df[ticker], max_points, mode='lines', name=ticker))
+    return fig
+
+
+def run_case(n_tickers, period, max_points, repeat, latency):
+    """한 경우(종목 수 x 기간)의 단계별 시간 중앙값(ms)과 직렬화 크기"""
+    tickers = [f'SYN{i:04d}' for i in range(n_tickers)]
+    timings = {stage: [] for stage in STAGES}
+    size = 0
+    provider = ReplayProvider(latency=latency)
+    provider.history(tickers[0], period=period)  # 가상 데이터 인덱스 생성 비용 제외
+    for _ in range(repeat):
+        cache = TickerCache(provider=provider)  # 매번 빈 캐시에서 수집
+
+        start = time.perf_counter()
+        histories, _ = cache.get_many(tickers, period=period)
+        prices = pd.DataFrame({t: h['Close'] for t, h in histories.items()})
+        timings['fetch'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        compute_statistics(prices)
+        timings['returns'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        fig = build_figure(prices, max_points)
+        timings['figure'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        payload = fig.to_json()
+        timings['serialize'].append(time.perf_counter() - start)
+        size = len(payload.encode())
+
+    result = {f'{stage}_ms': float(np.median(values) * 1000) for stage, values in timings.items()}
+    result['payload_bytes'] = size
+    return result
+
+
+def environment():
+    """결과 비교에 필요한 실행 환경 정보"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """이전 결과보다 threshold 배 이상 느려진 항목 출력. 반환값: 느려진 항목 수"""
+    baseline = json.loads(Path(baseline_path).read_text())
+    old_cases = {(c['tickers'], c['period'], c['mode']): c for c in baseline['cases']}
+    regressions = 0
+    for case in results['cases']:
+        old = old_cases.get((case['tickers'], case['period'], case['mode']))
+        if old is None:
+            continue
+        for stage in STAGES:
+            key = f'{stage}_ms'
+            if old[key] > 0 and case[key] / old[key] >= threshold:
+                regressions += 1
+                print(f"⚠️ 느려짐: {case['tickers']}종목 {case['period']} {case['mode']} {stage} "
+                      f"{old[key]:.1f}ms -> {case[key]:.1f}ms")
+    if not regressions:
+        print(f"✅ {baseline_path} 대비 {threshold}배 이상 느려진 항목 없음")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, nargs='+', default=list(TICKER_COUNTS), help='종목 수 목록')
+    parser.add_argument('--periods', nargs='+', default=list(PERIODS), help='기간 목록')
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_POINTS, help='다운샘플링 모드의 종목별 점 개수')
+    parser.add_argument('--repeat', type=int, default=3, help='경우별 반복 횟수')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청당 가상 네트워크 지연 (초)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/<시각>.json)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='느려짐으로 판단할 배수')
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'cases': []}
+    header = f"{'종목':>6}{'기간':>6}  {'모드':<10}" + ''.join(f'{s + "(ms)":>15}' for s in STAGES) + f"{'크기(KB)':>12}"
+    print(header)
+    print('-' * len(header))
+    for n_tickers in args.tickers:
+        for period in args.periods:
+            for mode, max_points in (('full', None), ('downsample', args.max_points)):
+                case = run_case(n_tickers, period, max_points, args.repeat, args.latency)
+                case.update({'tickers': n_tickers, 'period': period, 'mode': mode})
+                results['cases'].append(case)
+                print(f"{n_tickers:>6}{period:>6}  {mode:<10}"
+                      + ''.join(f"{case[f'{s}_ms']:>15.1f}" for s in STAGES)
+                      + f"{case['payload_bytes'] / 1024:>12.1f}")
+
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+북마크 지도 레이어의 생성 시간과 전송 크기 벤치마크
+
+북마크마다 folium.Marker를 하나씩 추가하던 방식과, 화면 범위 안의 점만 보내는 marker_layer 방식을
+북마크 수(1천/1만/10만)와 화면 범위(전국/도시/동네)별로 비교합니다.
+실행: python -m benchmarks.bench_map
+"""
+import argparse
+import time
+
+import folium
+import numpy as np
+
+from bookmarks.render import PointSet, marker_layer
+
+COUNTS = (1_000, 10_000, 100_000)
+# (설명, (남, 서, 북, 동) 또는 None, 확대 수준)
+VIEWS = [
+    ('전국', None, 6),
+    ('도시', (37.40, 126.80, 37.70, 127.20), 11),
+    ('동네', (37.555, 126.965, 37.575, 126.990), 15),
+]
+
+
+def synthetic_points(n, seed=0):
+    """남한 범위에 고르게 흩어진 가상 북마크"""
+    rng = np.random.default_rng(seed)
+    return PointSet([f'장소 {i}' for i in range(n)], rng.uniform(33.0, 38.6, n), rng.uniform(124.5, 130.0, n))
+
+
+def rendered_size(layer):
+    """레이어를 지도에 넣어 만든 HTML 크기 (bytes)"""
+    m = folium.Map(location=(36.5, 127.5), zoom_start=6)
+    layer.add_to(m)
+    return len(m.get_root().render().encode())
+
+
+def per_marker_layer(points):
+    """예전 방식: 북마크마다 Marker 하나"""
+    layer = folium.FeatureGroup()
+    for name, lat, lon in zip(points.names, points.lats, points.lons):
+        folium.Marker([lat, lon], tooltip=name).add_to(layer)
+    return layer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=list(COUNTS), help='북마크 수 목록')
+    parser.add_argument('--baseline-max', type=int, default=10_000, help='예전 방식을 측정할 최대 북마크 수')
+    args = parser.parse_args()
+
+    header = f"{'북마크 수':>10}  {'화면':<6}{'방식':<10}{'요소 수':>10}{'생성(ms)':>10}{'렌더(ms)':>10}{'크기(KB)':>12}"
+    print(header)
+    print('-' * len(header))
+    for n in args.counts:
+        points = synthetic_points(n)
+        if n <= args.baseline_max:
+            start = time.perf_counter()
+            layer = per_marker_layer(points)
+            build_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            size = rendered_size(layer)
+            render_ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>10,}  {'전체':<6}{'마커':<10}{n:>10,}{build_ms:>10.1f}{render_ms:>10.1f}{size / 1024:>12.1f}")
+        for view, bounds, zoom in VIEWS:
+            start = time.perf_counter()
+            layer, info = marker_layer(points, bounds, zoom)
+            build_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            size = rendered_size(layer)
+            render_ms = (time.perf_counter() - start) * 1000
+            mode = '화면/묶음' if info['mode'] == 'clusters' else '화면/마커'
+            print(f"{n:>10,}  {view:<6}{mode:<10}{info['sent']:>10,}{build_ms:>10.1f}{render_ms:>10.1f}{size / 1024:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
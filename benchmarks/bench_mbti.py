@@ -0,0 +1,63 @@
+"""
+MBTI 일괄 채점 벤치마크
+
+응답자마다 점수 dict를 만들어 더하던 예전 방식과, 가중치 행렬 곱 한 번으로 채점하는 MbtiEngine을
+응답자 수(1만/10만/100만)별로 비교합니다.
+실행: python -m benchmarks.bench_mbti
+"""
+import argparse
+import time
+
+import numpy as np
+
+from mbti.engine import MbtiEngine
+from mbti.questions import questions
+
+COUNTS = (10_000, 100_000, 1_000_000)
+
+
+def per_row_types(answers):
+    """예전 방식: 응답자마다 지표 점수 dict를 더한 뒤 유형 결정"""
+    types = []
+    for row in answers.tolist():
+        scores = {'E': 0, 'I': 0, 'S': 0, 'N': 0, 'T': 0, 'F': 0, 'J': 0, 'P': 0}
+        for q_data, selected_idx in zip(questions, row):
+            option = q_data['options'][selected_idx]
+            scores[option['score_type']] += option['score_value']
+        types.append(''.join(a if scores[a] >= scores[b] else b for a, b in (('E', 'I'), ('S', 'N'), ('T', 'F'), ('J', 'P'))))
+    return types
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=list(COUNTS), help='응답자 수 목록')
+    parser.add_argument('--baseline-max', type=int, default=100_000, help='예전 방식을 측정할 최대 응답자 수')
+    args = parser.parse_args()
+
+    engine = MbtiEngine(questions)
+    rng = np.random.default_rng(0)
+    header = f"{'응답자 수':>12}  {'방식':<8}{'채점(ms)':>12}{'분포(ms)':>12}{'행/초':>16}"
+    print(header)
+    print('-' * len(header))
+    for n in args.counts:
+        answers = rng.integers(0, engine.option_counts, size=(n, engine.n_questions))
+        if n <= args.baseline_max:
+            start = time.perf_counter()
+            types = per_row_types(answers)
+            score_ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>12,}  {'행마다':<8}{score_ms:>12.1f}{'':>12}{n / score_ms * 1000:>16,.0f}")
+        start = time.perf_counter()
+        result = engine.score(answers)
+        score_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        result.type_counts()
+        result.axis_counts()
+        result.margin_distribution()
+        agg_ms = (time.perf_counter() - start) * 1000
+        if n <= args.baseline_max:
+            assert list(result.types) == types
+        print(f"{n:>12,}  {'행렬 곱':<8}{score_ms:>12.1f}{agg_ms:>12.1f}{n / score_ms * 1000:>16,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+페이지 동시 접속 부하 테스트 (Streamlit AppTest)
+
+페이지마다 새 프로세스를 띄우고, 그 안에서 가상 세션 N개를 스레드로 동시에 실행합니다.
+- 세션들은 실제 서버처럼 한 프로세스 안에 있으므로 공유 데이터 캐시(shared.cache)와 cache_resource를 함께 씁니다.
+- AppTest는 실행하는 동안 가짜 Runtime을 프로세스 전역(Runtime._instance)에 두었다가 지우므로
+  실행이 겹치면 서로 깨집니다. 그래서 실행 자체는 잠금으로 한 번에 하나씩 하고,
+  실행 시간(rerun p50/p95)과 다른 세션을 기다린 시간까지 더한 응답 시간(대기 포함 p95)을 따로 봅니다.
+- 세션마다 첫 실행 뒤 페이지별 시나리오대로 위젯 값을 바꿔 가며 R번 다시 실행(rerun)합니다.
+- 첫 실행(import와 캐시 채우기 포함)과 rerun의 지연, 프로세스 최대 RSS(ru_maxrss)를 보고합니다.
+- 실행 추적(shared.trace)을 임시 파일로 받아 실행 한 번의 종류별(fetch/parse/...) 평균 시간도 보여줍니다.
+- 자식 프로세스의 저장소 위치(APP_DATA_DIR)를 임시 폴더로 돌리므로 설문 응답, 주가/인구 저장소, 경계 캐시 등
+  실제 .cache와 static에는 아무것도 쓰지 않습니다 (그래서 페이지마다 디스크 캐시도 비어 있는 상태에서 시작).
+05_coin은 네트워크 없이 재현되도록 MARKET_DATA_PROVIDER=replay로 실행합니다.
+04_plotlytest는 AppTest가 파일 업로드를 흉내 낼 수 없어 업로드 전 화면만 잽니다.
+
+실행: python -m benchmarks.load_test [--sessions 4] [--reruns 5] [--pages 06_pyramid.py 07_trend.py] [--json out.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ('main.py', 'pages/00_mbti.py', 'pages/01_stack', 'pages/03_folium.py', 'pages/04_plotlytest.py',
+         'pages/05_coin.py', 'pages/06_pyramid.py', 'pages/07_trend.py')
+PERCENTILES = (50, 95)
+
+
+def _labeled(widgets, prefix):
+    return next(w for w in widgets if w.label.startswith(prefix))
+
+
+def _main(at, i):
+    at.text_input[0].input(f"세션{i}")
+    at.button[0].click()
+
+
+def _mbti(at, i):
+    # 결과 보기는 누르지 않음 (부하 테스트 응답이 누적 저장소에 쌓이지 않게)
+    radio = at.radio(key=f"question_{i % len(at.radio)}")
+    radio.set_value(i % len(radio.options))
+
+
+def _stack(at, i):
+    at.button(key="push_button" if i % 3 else "pop_button").click()
+
+
+def _folium(at, i):
+    _labeled(at.slider, "개수").set_value(1 + i % 20)
+
+
+def _coin(at, i):
+    overlays = _labeled(at.multiselect, "주가 차트 오버레이")
+    overlays.set_value(overlays.options[:i % (len(overlays.options) + 1)])
+
+
+def _pyramid(at, i):
+    scheme = _labeled(at.selectbox, "🗂️")
+    scheme.set_value(scheme.options[i % len(scheme.options)])
+    _labeled(at.checkbox, "전체 인구 대비").set_value(i % 2 == 1)
+
+
+# 페이지 -> rerun 전에 위젯을 바꾸는 함수 (없으면 같은 화면을 다시 실행)
+SCENARIOS = {
+    'main.py': _main,
+    'pages/00_mbti.py': _mbti,
+    'pages/01_stack': _stack,
+    'pages/03_folium.py': _folium,
+    'pages/05_coin.py': _coin,
+    'pages/06_pyramid.py': _pyramid,
+}
+
+
+def run_page(page, sessions, reruns, timeout):
+    """(자식 프로세스에서) 한 페이지를 세션 N개로 동시에 실행한 측정값"""
+    from streamlit.testing.v1 import AppTest
+
+    scenario = SCENARIOS.get(page)
+    barrier = threading.Barrier(sessions)
+    run_lock = threading.Lock()  # AppTest 실행은 한 번에 하나 (위 설명)
+    first, rerun, waited, errors = [], [], [], []
+    lock = threading.Lock()
+
+    def session(i):
+        at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+        barrier.wait()  # 모든 세션이 빈 캐시에서 동시에 시작
+        for r in range(reruns + 1):
+            try:
+                if r and scenario is not None:
+                    scenario(at, i * reruns + r)
+                requested = time.perf_counter()
+                with run_lock:
+                    start = time.perf_counter()
+                    at.run()
+                    end = time.perf_counter()
+            except Exception as e:
+                with lock:
+                    errors.append(f"{type(e).__name__}: {e}")
+                return
+            with lock:
+                (rerun if r else first).append((end - start) * 1000)
+                if r:
+                    waited.append((end - requested) * 1000)
+                errors.extend(str(e.value) for e in at.exception)
+
+    threads = [threading.Thread(target=session, args=(i,), name=f"session-{i}") for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {'first_ms': first, 'rerun_ms': rerun, 'waited_ms': waited, 'errors': errors,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def summarize_traces(path):
+    """추적 파일 -> (끝까지 실행된 rerun 수, 종류별 평균 ms)"""
+    if not path.exists():
+        return 0, {}
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines() if line]
+    complete = [r for r in records if r['status'] == 'complete']
+    kinds = {}
+    for r in complete:
+        for kind, ms in r['kinds'].items():
+            kinds[kind] = kinds.get(kind, 0.0) + ms
+    return len(complete), {kind: total / len(complete) for kind, total in sorted(kinds.items())}
+
+
+def measure(page, sessions, reruns, timeout):
+    """페이지 하나를 새 프로세스에서 실행하고 요약 (프로세스마다 import/캐시/RSS가 처음부터 시작)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_file = Path(tmp) / 'traces.jsonl'
+        env = dict(os.environ, APP_TRACE_FILE=str(trace_file), APP_DATA_DIR=str(Path(tmp) / 'data'))
+        env.setdefault('MARKET_DATA_PROVIDER', 'replay')
+        proc = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.load_test', '--child', page,
+             '--sessions', str(sessions), '--reruns', str(reruns), '--timeout', str(timeout)],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{page} 실행 실패:\n{proc.stderr[-2000:]}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result['traces'], result['kinds'] = summarize_traces(trace_file)
+    result['page'] = page
+    for name in ('first_ms', 'rerun_ms', 'waited_ms'):
+        values = result[name] or [float('nan')]
+        for p in PERCENTILES:
+            result[f'{name[:-3]}_p{p}_ms'] = float(np.percentile(values, p))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', nargs='+', default=list(PAGES), help='측정할 페이지 (저장소 루트 기준 경로)')
+    parser.add_argument('--sessions', type=int, default=4, help='페이지마다 동시에 띄울 가상 세션 수')
+    parser.add_argument('--reruns', type=int, default=5, help='세션마다 첫 실행 뒤 다시 실행할 횟수')
+    parser.add_argument('--timeout', type=float, default=120, help='실행 한 번의 제한 시간 (초)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_page(args.child, args.sessions, args.reruns, args.timeout)))
+        return
+
+    pages = [page if page in PAGES or (ROOT / page).exists() else f'pages/{page}' for page in args.pages]
+    header = (f"{'페이지':<22}{'첫 실행 p50':>12}{'p95':>9}{'rerun p50':>11}{'p95':>9}"
+              f"{'대기 포함 p95':>14}{'최대 RSS(MB)':>14}{'오류':>6}")
+    print(f"세션 {args.sessions}개 x rerun {args.reruns}번 (단위: ms)")
+    print(header)
+    print('-' * len(header))
+    results = []
+    for page in pages:
+        result = measure(page, args.sessions, args.reruns, args.timeout)
+        results.append(result)
+        print(f"{page:<22}{result['first_p50_ms']:>12.0f}{result['first_p95_ms']:>9.0f}"
+              f"{result['rerun_p50_ms']:>11.1f}{result['rerun_p95_ms']:>9.1f}{result['waited_p95_ms']:>14.1f}"
+              f"{result['peak_rss_mb']:>14.0f}{len(result['errors']):>6}")
+        if result['kinds']:
+            print(' ' * 4 + ', '.join(f"{kind} {ms:.1f}" for kind, ms in result['kinds'].items())
+                  + f"  (실행 추적 {result['traces']}건 평균)")
+        for error in dict.fromkeys(result['errors']):
+            print(' ' * 4 + f"❌ {error[:200]}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'params': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
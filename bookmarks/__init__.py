@@ -0,0 +1,3 @@
+"""
+03_folium 북마크 지도에서 쓰는 모듈 (지도 레이어 생성 등)
+"""
@@ -0,0 +1,179 @@
+"""
+북마크 지도 레이어 생성
+
+지도를 매번 새로 만들어 모든 마커를 보내는 대신, st_folium이 돌려준 현재 화면 범위(bounds) 안의 점만 보냅니다.
+- 화면 안의 점이 MAX_MARKERS개 이하면 FastMarkerCluster 하나(좌표 배열 + JS 콜백)로 보내 브라우저에서 묶고,
+- 그보다 많으면 서버에서 화면 픽셀 격자(CELL_PX) 단위로 묶어 격자마다 개수 표시 하나만 보냅니다.
+어느 쪽이든 보내는 양은 전체 북마크 수가 아니라 화면 크기와 MAX_MARKERS로 제한됩니다.
+점이 많은 넓은 화면에서는 저장소가 SQL로 격자 묶음까지 계산하므로(BookmarkStore.grid_clusters)
+점을 파이썬으로 가져오지 않고 cluster_layer로 묶음만 그립니다.
+"""
+import html
+
+import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster
+
+MAX_MARKERS = 2000  # 화면 안 점이 이 수 이하면 개별 마커 (브라우저에서 묶음)
+CELL_PX = 64        # 서버 격자 묶음의 한 칸 크기 (화면 픽셀)
+TILE_SIZE = 256
+
+# FastMarkerCluster 행([위도, 경도, 이름])을 이름 툴팁이 있는 마커로
+MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+CLUSTER_STYLE = (
+    "background: rgba(49, 130, 189, 0.85); color: white; border-radius: 50%; "
+    "width: {size}px; height: {size}px; line-height: {size}px; text-align: center; "
+    "font-size: 12px; font-weight: bold; border: 2px solid white;"
+)
+
+
+class PointSet:
+    """북마크 좌표/이름을 열 단위 배열로 (화면 범위 거르기와 격자 묶음을 한 번에 계산)"""
+
+    def __init__(self, names, lats, lons):
+        self.names = np.asarray(names, dtype=object)
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+
+    @classmethod
+    def from_places(cls, places):
+        """[(이름, 위도, 경도)] 목록에서 생성"""
+        if not places:
+            return cls([], [], [])
+        names, lats, lons = zip(*places)
+        return cls(names, lats, lons)
+
+    def __len__(self):
+        return len(self.lats)
+
+    def subset(self, mask):
+        return PointSet(self.names[mask], self.lats[mask], self.lons[mask])
+
+
+def parse_bounds(bounds):
+    """st_folium의 bounds -> (남, 서, 북, 동), 아직 없으면 None"""
+    if not bounds or not bounds.get('_southWest') or not bounds.get('_northEast'):
+        return None
+    south_west, north_east = bounds['_southWest'], bounds['_northEast']
+    if south_west.get('lat') is None or north_east.get('lat') is None:
+        return None
+    return south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng']
+
+
+def pad_bounds(bounds, pad=0.1):
+    """화면 범위를 가장자리마다 폭의 pad 비율만큼 넓힘 (살짝 움직여도 마커가 비지 않게)"""
+    south, west, north, east = bounds
+    pad_lat = (north - south) * pad
+    pad_lon = (east - west) * pad
+    return south - pad_lat, west - pad_lon, north + pad_lat, east + pad_lon
+
+
+def view_bounds(center, zoom, width, height):
+    """중심과 확대 수준, 지도 크기(픽셀)로 계산한 화면 범위 (브라우저가 범위를 보내기 전 첫 실행용)"""
+    scale = TILE_SIZE * 2.0 ** zoom
+    x, y = mercator_pixels(np.array([center[0]]), np.array([center[1]]), zoom)
+
+    def to_lat(py):
+        n = np.pi * (1 - 2 * py / scale)
+        return float(np.degrees(np.arctan(np.sinh(n))))
+
+    def to_lon(px):
+        return float(px / scale * 360.0 - 180.0)
+
+    return (to_lat(y[0] + height / 2), to_lon(x[0] - width / 2),
+            to_lat(y[0] - height / 2), to_lon(x[0] + width / 2))
+
+
+def viewport_mask(points, bounds, pad=0.1):
+    """화면 범위(가장자리 pad 비율만큼 넓힘) 안의 점. bounds가 None이면 전부"""
+    if bounds is None:
+        return np.ones(len(points), dtype=bool)
+    south, west, north, east = pad_bounds(bounds, pad)
+    return ((points.lats >= south) & (points.lats <= north)
+            & (points.lons >= west) & (points.lons <= east))
+
+
+def mercator_pixels(lats, lons, zoom):
+    """위경도 -> 확대 수준 zoom에서의 웹 메르카토르 픽셀 좌표"""
+    scale = TILE_SIZE * 2.0 ** zoom
+    x = (lons + 180.0) / 360.0 * scale
+    sin = np.sin(np.radians(np.clip(lats, -85.0511, 85.0511)))
+    y = (0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)) * scale
+    return x, y
+
+
+def grid_clusters(points, zoom, cell_px=CELL_PX):
+    """
+    화면 픽셀 격자 칸마다 점을 묶습니다.
+    반환값: (칸별 평균 위도, 평균 경도, 점 개수, 칸의 첫 번째 점 이름)
+    """
+    x, y = mercator_pixels(points.lats, points.lons, zoom)
+    cells = (np.floor(x / cell_px).astype(np.int64) << 32) + np.floor(y / cell_px).astype(np.int64)
+    unique, first, inverse, counts = np.unique(cells, return_index=True, return_inverse=True, return_counts=True)
+    lat = np.bincount(inverse, weights=points.lats) / counts
+    lon = np.bincount(inverse, weights=points.lons) / counts
+    return lat, lon, counts, points.names[first]
+
+
+def marker_layer(points, bounds=None, zoom=6, max_markers=MAX_MARKERS, cell_px=CELL_PX):
+    """
+    화면 안의 북마크만 담은 FeatureGroup과 요약 정보를 반환합니다.
+    요약: {'total': 전체 수, 'visible': 화면 안 수, 'mode': 'markers' 또는 'clusters', 'sent': 보낸 지도 요소 수}
+    """
+    visible = points.subset(viewport_mask(points, bounds))
+    layer = folium.FeatureGroup(name="북마크")
+    info = {'total': len(points), 'visible': len(visible), 'mode': 'markers', 'sent': len(visible)}
+    if len(visible) == 0:
+        return layer, info
+
+    if len(visible) <= max_markers:
+        rows = [[la, lo, html.escape(str(name))]
+                for la, lo, name in zip(visible.lats.tolist(), visible.lons.tolist(), visible.names)]
+        FastMarkerCluster(rows, callback=MARKER_CALLBACK).add_to(layer)
+        return layer, info
+
+    lat, lon, counts, names = grid_clusters(visible, zoom, cell_px)
+    _add_clusters(layer, lat, lon, counts, names)
+    info.update(mode='clusters', sent=len(counts))
+    return layer, info
+
+
+def cluster_layer(clusters, total=None):
+    """
+    이미 묶은 격자 칸 (위도, 경도, 개수, 이름)으로 만든 FeatureGroup과 요약 정보 (marker_layer와 같은 형식).
+    total이 None이면 칸의 점 개수 합을 전체 수로 씁니다.
+    """
+    lat, lon, counts, names = clusters
+    visible = int(np.sum(counts))
+    layer = folium.FeatureGroup(name="북마크")
+    _add_clusters(layer, lat, lon, counts, names)
+    info = {'total': visible if total is None else total, 'visible': visible, 'mode': 'clusters', 'sent': len(counts)}
+    return layer, info
+
+
+def _add_clusters(layer, lat, lon, counts, names):
+    for la, lo, count, name in zip(lat, lon, counts, names):
+        if count == 1:
+            folium.Marker([la, lo], tooltip=html.escape(str(name))).add_to(layer)
+            continue
+        size = int(24 + 8 * min(np.log10(count), 4))
+        folium.Marker(
+            [la, lo],
+            tooltip=f"{count:,}개 (예: {html.escape(str(name))})",
+            icon=folium.DivIcon(
+                html=f'<div style="{CLUSTER_STYLE.format(size=size)}">{html.escape(_short_count(count))}</div>',
+                icon_size=(size, size),
+                icon_anchor=(size // 2, size // 2)
+            )
+        ).add_to(layer)
+
+
+def _short_count(count):
+    return f"{count / 1000:.0f}k" if count >= 10000 else f"{count:,}"
@@ -0,0 +1,265 @@
+"""
+SQLite 북마크 저장소
+
+북마크를 세션 상태의 리스트 대신 로컬 SQLite 파일에 저장해 새로고침 후에도 남고 여러 세션이 함께 씁니다.
+- 좌표는 R-tree 가상 테이블로 색인해 화면 범위(bounding box) 조회가 전체 스캔 없이 O(log n + 결과 수)입니다.
+  (R-tree 모듈이 없는 SQLite에서는 (위도, 경도) B-tree 색인으로 대신합니다)
+- k-최근접 조회는 작은 상자부터 반경을 두 배씩 넓혀가며 R-tree로 후보를 찾고 하버사인 거리로 확정합니다.
+- CSV 일괄 가져오기는 청크 단위로 읽어 한 트랜잭션에 executemany로 넣습니다.
+- 행마다 확대 수준 0의 메르카토르 픽셀 좌표(mx, my)를 함께 저장해, 넓은 화면의 격자 묶음은
+  GROUP BY로 칸별 개수만 가져옵니다 (점 수만큼 파이썬으로 읽지 않음).
+"""
+import io
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bookmarks.render import CELL_PX, PointSet, mercator_pixels
+from shared.paths import data_dir
+
+DEFAULT_PATH = data_dir('bookmarks.sqlite3')
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+IMPORT_CHUNK_ROWS = 50_000
+
+# CSV 머리글 후보 (소문자로 비교)
+NAME_COLUMNS = ('이름', '장소', '장소 이름', 'name', 'place', 'title')
+LAT_COLUMNS = ('위도', 'lat', 'latitude', 'y')
+LON_COLUMNS = ('경도', 'lon', 'lng', 'long', 'longitude', 'x')
+
+
+def haversine_km(lat1, lon1, lats, lons):
+    """한 점에서 여러 점까지의 대원 거리 (km)"""
+    lat1, lon1 = math.radians(lat1), math.radians(lon1)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = (np.sin((lats - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lats) * np.sin((lons - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _find_column(columns, candidates):
+    lowered = {str(c).strip().lower(): c for c in columns}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+class BookmarkStore:
+    """R-tree 공간 색인이 있는 SQLite 북마크 저장소 (스레드마다 연결 하나)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.has_rtree = self._create_schema()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bookmarks (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    lat REAL NOT NULL,
+                    lon REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    mx REAL,
+                    my REAL
+                )
+            """)
+            self._add_mercator_columns(conn)
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_rtree
+                    USING rtree(id, min_lat, max_lat, min_lon, max_lon)
+                """)
+                return True
+            except sqlite3.OperationalError:
+                conn.execute('CREATE INDEX IF NOT EXISTS bookmarks_lat_lon ON bookmarks (lat, lon)')
+                return False
+
+    @staticmethod
+    def _add_mercator_columns(conn):
+        """mx/my 컬럼이 없던 이전 저장소에 컬럼을 추가하고 기존 행을 채움"""
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(bookmarks)')}
+        if 'mx' in columns:
+            return
+        conn.execute('ALTER TABLE bookmarks ADD COLUMN mx REAL')
+        conn.execute('ALTER TABLE bookmarks ADD COLUMN my REAL')
+        rows = conn.execute('SELECT id, lat, lon FROM bookmarks').fetchall()
+        if rows:
+            ids, lats, lons = zip(*rows)
+            mx, my = mercator_pixels(np.array(lats), np.array(lons), 0)
+            conn.executemany('UPDATE bookmarks SET mx = ?, my = ? WHERE id = ?',
+                             zip(mx.tolist(), my.tolist(), ids))
+
+    # ---------------------------------------------------------------- 쓰기
+
+    def add(self, name, lat, lon):
+        """북마크 하나 추가, 새 id 반환"""
+        return self.add_many([(name, lat, lon)])[0]
+
+    def add_many(self, rows):
+        """[(이름, 위도, 경도)]를 한 트랜잭션으로 추가, 새 id 목록 반환"""
+        rows = [(str(name), float(lat), float(lon)) for name, lat, lon in rows]
+        for _, lat, lon in rows:
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError(f"위도는 -90~90, 경도는 -180~180 범위여야 합니다: ({lat}, {lon})")
+        mx, my = mercator_pixels(np.array([r[1] for r in rows], dtype=np.float64),
+                                 np.array([r[2] for r in rows], dtype=np.float64), 0)
+        conn = self._connect()
+        now = time.time()
+        with self._write_lock, conn:
+            start = conn.execute('SELECT COALESCE(MAX(id), 0) FROM bookmarks').fetchone()[0] + 1
+            ids = list(range(start, start + len(rows)))
+            conn.executemany(
+                'INSERT INTO bookmarks (id, name, lat, lon, created_at, mx, my) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(i, name, lat, lon, now, x, y)
+                 for i, (name, lat, lon), x, y in zip(ids, rows, mx.tolist(), my.tolist())]
+            )
+            if self.has_rtree:
+                conn.executemany(
+                    'INSERT INTO bookmarks_rtree (id, min_lat, max_lat, min_lon, max_lon) VALUES (?, ?, ?, ?, ?)',
+                    [(i, lat, lat, lon, lon) for i, (_, lat, lon) in zip(ids, rows)]
+                )
+        return ids
+
+    def import_csv(self, source, chunk_rows=IMPORT_CHUNK_ROWS):
+        """
+        이름/위도/경도 컬럼이 있는 CSV를 가져옵니다 (source: 경로, 바이트 또는 파일 객체).
+        좌표가 비었거나 범위를 벗어난 행은 건너뜁니다. 반환값: (추가한 수, 건너뛴 수)
+        """
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        added = skipped = 0
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, encoding_errors='replace'):
+            name_col = _find_column(chunk.columns, NAME_COLUMNS)
+            lat_col = _find_column(chunk.columns, LAT_COLUMNS)
+            lon_col = _find_column(chunk.columns, LON_COLUMNS)
+            if lat_col is None or lon_col is None:
+                raise ValueError("위도(lat)와 경도(lon/lng) 컬럼이 있는 CSV만 가져올 수 있습니다.")
+            lats = pd.to_numeric(chunk[lat_col], errors='coerce')
+            lons = pd.to_numeric(chunk[lon_col], errors='coerce')
+            valid = lats.between(-90, 90) & lons.between(-180, 180)
+            names = chunk[name_col].astype(str) if name_col is not None else pd.Series(
+                [f'{la:.5f}, {lo:.5f}' for la, lo in zip(lats, lons)], index=chunk.index
+            )
+            rows = list(zip(names[valid], lats[valid], lons[valid]))
+            if rows:
+                self.add_many(rows)
+            added += len(rows)
+            skipped += int((~valid).sum())
+        return added, skipped
+
+    def delete(self, ids):
+        conn = self._connect()
+        params = [(int(i),) for i in ids]
+        with self._write_lock, conn:
+            conn.executemany('DELETE FROM bookmarks WHERE id = ?', params)
+            if self.has_rtree:
+                conn.executemany('DELETE FROM bookmarks_rtree WHERE id = ?', params)
+
+    def clear(self):
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute('DELETE FROM bookmarks')
+            if self.has_rtree:
+                conn.execute('DELETE FROM bookmarks_rtree')
+
+    # ---------------------------------------------------------------- 조회
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM bookmarks').fetchone()[0]
+
+    def _bbox_query(self, columns, bounds, limit=None, group_by=None, group_params=()):
+        south, west, north, east = bounds
+        if self.has_rtree:
+            sql = (f'SELECT {columns} FROM bookmarks_rtree r JOIN bookmarks b ON b.id = r.id '
+                   'WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?')
+        else:
+            sql = (f'SELECT {columns} FROM bookmarks b '
+                   'WHERE b.lat BETWEEN ? AND ? AND b.lon BETWEEN ? AND ?')
+        params = (south, north, west, east, *group_params)
+        if group_by is not None:
+            sql += f' GROUP BY {group_by}'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return self._connect().execute(sql, params)
+
+    def count_in(self, bounds):
+        """상자 (남, 서, 북, 동) 안의 북마크 수"""
+        return self._bbox_query('COUNT(*)', bounds).fetchone()[0]
+
+    def in_bounds(self, bounds, limit=None):
+        """상자 (남, 서, 북, 동) 안의 북마크 [(id, 이름, 위도, 경도)]"""
+        return self._bbox_query('b.id, b.name, b.lat, b.lon', bounds, limit).fetchall()
+
+    def points(self, bounds=None):
+        """상자 안(None이면 전체)의 북마크를 PointSet으로 (지도 레이어용)"""
+        if bounds is None:
+            rows = self._connect().execute('SELECT name, lat, lon FROM bookmarks').fetchall()
+        else:
+            rows = self._bbox_query('b.name, b.lat, b.lon', bounds).fetchall()
+        return PointSet.from_places(rows)
+
+    def grid_clusters(self, bounds, zoom, cell_px=CELL_PX):
+        """
+        상자 안의 북마크를 확대 수준 zoom의 화면 픽셀 격자 칸마다 SQL로 묶습니다 (render.grid_clusters와 같은 칸).
+        반환값: (칸별 평균 위도, 평균 경도, 점 개수, 칸에서 id가 가장 작은 점 이름)
+        """
+        scale = 2.0 ** zoom / cell_px  # 확대 수준 0 픽셀 -> 칸 번호 (좌표가 0 이상이라 CAST가 내림과 같음)
+        # SQLite는 MIN()이 있는 집계에서 다른 컬럼을 그 최솟값 행에서 가져옴
+        rows = self._bbox_query(
+            'AVG(b.lat), AVG(b.lon), COUNT(*), b.name, MIN(b.id)', bounds,
+            group_by='CAST(b.mx * ? AS INTEGER), CAST(b.my * ? AS INTEGER)', group_params=(scale, scale)
+        ).fetchall()
+        if not rows:
+            return np.array([]), np.array([]), np.array([], dtype=np.int64), np.array([], dtype=object)
+        lat, lon, counts, names, _ = zip(*rows)
+        return np.array(lat), np.array(lon), np.array(counts, dtype=np.int64), np.array(names, dtype=object)
+
+    def nearest(self, lat, lon, k=5, start_km=1.0):
+        """
+        (lat, lon)에서 가까운 k개 [(id, 이름, 위도, 경도, 거리 km)].
+        반경 r의 원을 감싸는 상자로 후보를 찾고, 원 안에 k개가 모이면 확정합니다 (없으면 반경을 두 배로).
+        """
+        if k <= 0 or self._connect().execute('SELECT 1 FROM bookmarks LIMIT 1').fetchone() is None:
+            return []
+        radius = start_km
+        while True:
+            dlat = radius / KM_PER_DEGREE
+            # 상자가 원을 모두 덮도록 극에 가까운 쪽 위도의 경도 폭 사용
+            edge = min(abs(lat) + dlat, 89.9)
+            dlon = min(radius / (KM_PER_DEGREE * math.cos(math.radians(edge))), 180.0)
+            whole_world = dlat >= 180 or dlon >= 180
+            if whole_world:
+                rows = self._connect().execute('SELECT id, name, lat, lon FROM bookmarks').fetchall()
+            else:
+                rows = self.in_bounds((lat - dlat, lon - dlon, lat + dlat, lon + dlon))
+            if rows:
+                lats = np.array([r[2] for r in rows])
+                lons = np.array([r[3] for r in rows])
+                distances = haversine_km(lat, lon, lats, lons)
+                inside = np.flatnonzero(distances <= radius)
+                if len(inside) >= k or whole_world:
+                    # 전체를 본 경우에는 저장된 수가 k보다 적을 수 있음
+                    candidates = inside if len(inside) >= k else np.arange(len(rows))
+                    best = candidates[np.argsort(distances[candidates], kind='stable')[:k]]
+                    return [(*rows[i], float(distances[i])) for i in best]
+            radius *= 2
@@ -1,6 +1,9 @@
 import streamlit as st
+from shared.trace import finish_trace, start_trace
+start_trace('main')
 st.title('나의 첫 웹 서비스 만들기!')
 name = st.text_input('이름을 입력하세요:')
 menu = st.selectbox('좋아하는 음식을 선택해주세요:', ['망고빙수','아몬드봉봉'])
 if st.button('인사말 생성') : 
   st.write(name+'님! 당신이 좋아하는 음식은 '+ menu +'이군요? 저도 좋아요!')
+finish_trace()
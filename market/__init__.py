@@ -0,0 +1 @@
+"""05_coin 페이지에서 사용하는 주가 데이터 처리 모듈"""
@@ -0,0 +1,102 @@
+"""
+차트용 시계열 다운샘플링
+
+긴 시계열을 정해진 점 개수로 줄이되, 버킷마다 시각적으로 두드러진 점을 남겨
+급등락 같은 모양이 사라지지 않도록 합니다.
+- minmax: 버킷마다 최저/최고점을 남김 (전부 벡터 연산이라 빠름, 기본값)
+- lttb: Largest-Triangle-Three-Buckets (모양 보존이 더 좋지만 버킷마다 순차 계산)
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+DEFAULT_MAX_POINTS = 2000  # 시계열 하나당 브라우저로 보낼 최대 점 개수
+
+
+def lttb_indices(x, y, threshold):
+    """LTTB로 남길 점의 인덱스 (처음과 마지막 점은 항상 포함)"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 처음/마지막 점을 뺀 n-2개의 점을 threshold-2개의 버킷으로 나눔
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0  # 직전 버킷에서 선택된 점
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        # 다음 버킷의 평균점과 직전 선택점으로 만든 삼각형의 넓이가 가장 큰 점을 선택
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y, threshold):
+    """버킷마다 최저점과 최고점을 남기는 인덱스 (처음과 마지막 점 포함, 시간 순서 유지)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+
+    n_buckets = (threshold - 2) // 2
+    size = -(-n // n_buckets)  # 올림 나눗셈
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(buckets).all(axis=1)
+
+    offsets = np.arange(n_buckets)[valid] * size
+    lows = np.nanargmin(buckets[valid], axis=1) + offsets
+    highs = np.nanargmax(buckets[valid], axis=1) + offsets
+    picked = np.sort(np.stack([lows, highs], axis=1), axis=1).ravel()
+    return np.unique(np.concatenate([[0], picked, [n - 1]]))
+
+
+def downsample_series(series, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """결측값을 제외한 Series를 최대 max_points개의 점으로 줄여 (x, y) 반환"""
+    series = series.dropna()
+    if max_points is None or len(series) <= max_points:
+        return series.index, series.to_numpy()
+    values = series.to_numpy()
+    if method == 'lttb':
+        x = series.index.asi8 if hasattr(series.index, 'asi8') else np.arange(len(series))
+        idx = lttb_indices(x, values, max_points)
+    else:
+        idx = minmax_indices(values, max_points)
+    return series.index[idx], values[idx]
+
+
+def _plot_x(index):
+    """
+    plotly에 넘길 x 값. tz 정보가 있는 DatetimeIndex는 원소마다 파이썬 객체로 변환되어 매우 느리므로
+    현지 시각 그대로의 datetime64 배열로 바꿔서 넘깁니다.
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.to_numpy()
+    return np.asarray(index)
+
+
+def line_trace(series, max_points=None, method='minmax', **kwargs):
+    """
+    선 그래프 trace 생성.
+    max_points가 주어지면 다운샘플링한 뒤 WebGL(Scattergl)로, 아니면 전체 점을 SVG(Scatter)로 그립니다.
+    """
+    if max_points is None:
+        return go.Scatter(x=_plot_x(series.index), y=series.to_numpy(), **kwargs)
+    x, y = downsample_series(series, max_points, method)
+    return go.Scattergl(x=_plot_x(x), y=y, **kwargs)
@@ -0,0 +1,128 @@
+"""
+주가/누적 수익률 내보내기 (CSV, 압축 CSV, Parquet)
+
+전체 데이터를 한 번에 문자열로 만들지 않고 행 단위 청크로 나눠 파일에 바로 씁니다.
+결과 파일은 선택 종목, 기간, 가격 데이터의 해시로 이름을 붙여 디스크에 보관하므로
+같은 내보내기를 다시 요청하면 파일을 새로 만들지 않습니다.
+- 보관 파일은 최근에 쓴 순서로 MAX_FILES개, MAX_BYTES까지만 남기고 오래 안 쓴 것부터 지웁니다.
+- 다운로드는 파일 내용을 메모리에 올려 보내므로 MAX_CELLS(가격 + 누적 수익률 칸 수)를 넘는 내보내기는 만들지 않습니다.
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from shared.paths import data_dir
+
+DEFAULT_ROOT = data_dir('exports')
+CHUNK_ROWS = 50_000
+MAX_FILES = 64                 # 보관할 내보내기 파일 수
+MAX_BYTES = 512 * 1024 * 1024  # 보관할 내보내기 파일 전체 크기
+MAX_CELLS = 2_000_000          # 한 번에 내보낼 수 있는 최대 칸 수 (CSV로 수십 MB)
+
+# 형식 -> (표시 이름, MIME 타입, 확장자)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', '.csv'),
+    'csv.gz': ('CSV (gzip 압축)', 'application/gzip', '.csv.gz'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', '.parquet'),
+}
+
+
+def export_key(prices, period, fmt):
+    """선택 종목, 기간, 형식, 가격 데이터 내용으로 만든 해시"""
+    digest = hashlib.sha256()
+    digest.update(f"{','.join(map(str, prices.columns))}|{period}|{fmt}".encode())
+    digest.update(pd.util.hash_pandas_object(prices, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:24]
+
+
+def export_cells(prices):
+    """내보내기 파일의 칸 수 (가격 + 누적 수익률)"""
+    return len(prices) * prices.shape[1] * 2
+
+
+def prune(root=DEFAULT_ROOT, keep=None, max_files=MAX_FILES, max_bytes=MAX_BYTES):
+    """최근에 쓴 순서로 max_files개, max_bytes까지만 남기고 나머지 내보내기 파일을 지움 (keep 파일은 항상 남김)"""
+    root = Path(root)
+    files = []
+    for path in root.iterdir():
+        if path.suffix == '.tmp' or not path.is_file():
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # 다른 세션이 먼저 지움
+            continue
+        files.append((path == keep, stat.st_mtime_ns, stat.st_size, path))
+    files.sort(key=lambda f: (f[0], f[1]), reverse=True)
+    total = 0
+    for i, (kept, _, size, path) in enumerate(files):
+        total += size
+        if not kept and (i >= max_files or total > max_bytes):
+            path.unlink(missing_ok=True)
+
+
+def _chunks(prices, cumulative, chunk_rows):
+    """가격과 누적 수익률을 합친 행 청크 (전체를 한 번에 합치지 않음)"""
+    for start in range(0, len(prices), chunk_rows):
+        stop = start + chunk_rows
+        yield pd.concat([
+            prices.iloc[start:stop].add_suffix('_Price'),
+            cumulative.iloc[start:stop].add_suffix('_CumReturn(%)')
+        ], axis=1)
+
+
+def _write(path, fmt, prices, cumulative, chunk_rows):
+    if fmt == 'parquet':
+        writer = None
+        try:
+            for chunk in _chunks(prices, cumulative, chunk_rows):
+                table = pa.Table.from_pandas(chunk)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    opener = gzip.open if fmt == 'csv.gz' else open
+    with opener(path, 'wt', encoding='utf-8', newline='') as f:
+        for i, chunk in enumerate(_chunks(prices, cumulative, chunk_rows)):
+            chunk.to_csv(f, header=(i == 0), index_label='Date')
+
+
+def prepare_export(prices, cumulative, period, fmt='csv', root=DEFAULT_ROOT, chunk_rows=CHUNK_ROWS):
+    """
+    내보내기 파일 경로 반환 (같은 해시의 파일이 있으면 그대로 사용, 없으면 청크 단위로 새로 작성).
+    칸 수가 MAX_CELLS를 넘으면 ValueError
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    if export_cells(prices) > MAX_CELLS:
+        raise ValueError(f"내보낼 데이터가 너무 큽니다 ({export_cells(prices):,}칸, 최대 {MAX_CELLS:,}칸).")
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    path = root / f"{export_key(prices, period, fmt)}{EXPORT_FORMATS[fmt][2]}"
+    if path.exists():
+        try:
+            os.utime(path)  # 최근에 쓴 파일로 표시 (prune이 오래 안 쓴 파일부터 지움)
+            return path
+        except FileNotFoundError:  # 확인한 사이에 다른 세션의 prune이 지움
+            pass
+
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix='.tmp')
+    os.close(fd)
+    try:
+        _write(tmp_path, fmt, prices, cumulative, chunk_rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    prune(root, keep=path)
+    return path
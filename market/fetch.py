@@ -0,0 +1,91 @@
+"""종목 단위 캐시와 병렬 수집을 담당하는 주가 데이터 수집 계층"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from market.providers import YFinanceProvider
+
+DEFAULT_TTL = 3600  # 1시간 캐시
+NEGATIVE_TTL = 60  # 빈 결과(일시적인 요청 실패/요청 제한일 수 있음)는 1분만 캐시
+MAX_WORKERS = 8  # 동시에 요청할 최대 종목 수
+
+
+class TickerCache:
+    """
+    종목별로 주가 이력을 캐시하고, 캐시에 없는 종목만 스레드 풀에서 동시에 가져옵니다.
+    provider는 market.providers의 제공자처럼 history(ticker, period) 메서드를 가진 객체면 됩니다.
+    entries는 항목 보관소로, 기본은 dict이고 get/[]=/clear가 있으면
+    (예: shared.cache의 메모리 예산 캐시 이름공간) 무엇이든 쓸 수 있습니다.
+    빈 결과는 negative_ttl 동안만 캐시하므로 일시적인 실패가 ttl 내내 모든 세션에 '데이터 없음'으로 남지 않습니다.
+    """
+
+    def __init__(self, provider=None, ttl=DEFAULT_TTL, max_workers=MAX_WORKERS, entries=None,
+                 negative_ttl=NEGATIVE_TTL):
+        self.provider = provider or YFinanceProvider()
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self.max_workers = max_workers
+        self._entries = {} if entries is None else entries  # (ticker, period) -> (저장 시각, OHLCV DataFrame)
+        self._lock = threading.Lock()
+
+    def _lookup(self, ticker, period, now):
+        entry = self._entries.get((ticker, period))
+        if entry is None or now - entry[0] > (self.negative_ttl if entry[1].empty else self.ttl):
+            return None
+        return entry[1]
+
+    def missing(self, tickers, period='1y'):
+        """캐시에 없거나 만료된 종목 목록"""
+        now = time.time()
+        with self._lock:
+            return [t for t in tickers if self._lookup(t, period, now) is None]
+
+    def get_many(self, tickers, period='1y'):
+        """
+        종목별 OHLCV 이력을 반환합니다.
+        반환값: (ticker -> DataFrame 딕셔너리, ticker -> 오류 메시지 딕셔너리)
+        빈 DataFrame은 데이터가 없는 종목을 의미합니다.
+        """
+        tickers = list(dict.fromkeys(tickers))  # 순서를 유지한 중복 제거
+        to_fetch = self.missing(tickers, period)
+
+        errors = {}
+        if to_fetch:
+            fetched, errors = self._fetch(to_fetch, period)
+            now = time.time()
+            with self._lock:
+                for ticker, hist in fetched.items():
+                    self._entries[(ticker, period)] = (now, hist)
+
+        now = time.time()
+        result = {}
+        with self._lock:
+            for ticker in tickers:
+                hist = self._lookup(ticker, period, now)
+                if hist is not None:
+                    result[ticker] = hist
+        return result, errors
+
+    def _fetch(self, tickers, period):
+        """누락 종목을 제한된 스레드 풀에서 동시에 요청"""
+        def load(ticker):
+            try:
+                return ticker, self.provider.history(ticker, period=period), None
+            except Exception as e:
+                return ticker, None, str(e)
+
+        fetched, errors = {}, {}
+        workers = max(1, min(self.max_workers, len(tickers)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for ticker, hist, error in pool.map(load, tickers):
+                if error is not None:
+                    errors[ticker] = error
+                else:
+                    fetched[ticker] = hist if hist is not None else pd.DataFrame()
+        return fetched, errors
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
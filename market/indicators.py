@@ -0,0 +1,199 @@
+"""
+기술적 지표 (SMA / EMA / RSI / 볼린저 밴드 / MACD)
+
+각 지표는 전체 이력을 벡터 연산으로 한 번에 계산(fit)한 뒤, 마지막 상태를 들고 있다가
+새 봉이 들어오면 update()로 O(1)에 다음 값을 계산합니다.
+IndicatorCache는 (종목, 지표, 파라미터)별로 결과를 보관해 같은 요청에는 다시 계산하지 않고,
+가격 이력이 뒤로 늘어난 경우에는 늘어난 봉만 update()로 이어서 계산합니다.
+"""
+import copy
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+class SMA:
+    """단순 이동평균"""
+    columns = ['sma']
+
+    def __init__(self, window=20):
+        self.window = window
+
+    def fit(self, prices):
+        tail = prices.iloc[-self.window:].tolist()
+        self._buffer = deque(tail, maxlen=self.window)
+        self._sum = float(sum(tail))
+        return prices.rolling(self.window).mean().to_frame('sma')
+
+    def update(self, price):
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(price)
+        self._sum += price
+        value = self._sum / self.window if len(self._buffer) == self.window else np.nan
+        return [value]
+
+
+class EMA:
+    """지수 이동평균 (첫 값에서 시작하는 재귀식, pandas ewm(adjust=False)와 동일)"""
+    columns = ['ema']
+
+    def __init__(self, span=20):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+
+    def fit(self, prices):
+        ema = prices.ewm(span=self.span, adjust=False).mean()
+        self._last = float(ema.iloc[-1]) if len(ema) else np.nan
+        return ema.to_frame('ema')
+
+    def update(self, price):
+        self._last = price if np.isnan(self._last) else self._last + self.alpha * (price - self._last)
+        return [self._last]
+
+
+class RSI:
+    """상대강도지수 (Wilder 평활)"""
+    columns = ['rsi']
+
+    def __init__(self, window=14):
+        self.window = window
+        self.alpha = 1.0 / window
+
+    def fit(self, prices):
+        diff = prices.diff()
+        gain = diff.clip(lower=0).ewm(alpha=self.alpha, adjust=False).mean()
+        loss = (-diff).clip(lower=0).ewm(alpha=self.alpha, adjust=False).mean()
+        self._prev = float(prices.iloc[-1]) if len(prices) else np.nan
+        self._gain = float(gain.iloc[-1]) if len(gain) else np.nan
+        self._loss = float(loss.iloc[-1]) if len(loss) else np.nan
+        return (100 - 100 / (1 + gain / loss)).to_frame('rsi')
+
+    def update(self, price):
+        if not np.isnan(self._prev):
+            change = price - self._prev
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if np.isnan(self._gain):
+                self._gain, self._loss = gain, loss
+            else:
+                self._gain += self.alpha * (gain - self._gain)
+                self._loss += self.alpha * (loss - self._loss)
+        self._prev = price
+        if np.isnan(self._gain) or self._loss == 0:
+            return [100.0 if self._loss == 0 and self._gain > 0 else np.nan]
+        return [100 - 100 / (1 + self._gain / self._loss)]
+
+
+class Bollinger:
+    """볼린저 밴드 (이동평균 ± k * 이동표준편차, 표본표준편차 기준)"""
+    columns = ['middle', 'upper', 'lower']
+
+    def __init__(self, window=20, num_std=2.0):
+        self.window = window
+        self.num_std = num_std
+
+    def fit(self, prices):
+        tail = prices.iloc[-self.window:].tolist()
+        self._buffer = deque(tail, maxlen=self.window)
+        self._sum = float(sum(tail))
+        self._sumsq = float(sum(p * p for p in tail))
+        middle = prices.rolling(self.window).mean()
+        std = prices.rolling(self.window).std()
+        return pd.DataFrame({
+            'middle': middle,
+            'upper': middle + self.num_std * std,
+            'lower': middle - self.num_std * std,
+        })
+
+    def update(self, price):
+        if len(self._buffer) == self.window:
+            old = self._buffer[0]
+            self._sum -= old
+            self._sumsq -= old * old
+        self._buffer.append(price)
+        self._sum += price
+        self._sumsq += price * price
+        if len(self._buffer) < self.window:
+            return [np.nan, np.nan, np.nan]
+        n = self.window
+        mean = self._sum / n
+        std = np.sqrt(max(self._sumsq - n * mean * mean, 0.0) / (n - 1))
+        return [mean, mean + self.num_std * std, mean - self.num_std * std]
+
+
+class MACD:
+    """MACD (빠른 EMA - 느린 EMA, 시그널 EMA, 히스토그램)"""
+    columns = ['macd', 'signal', 'histogram']
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    def fit(self, prices):
+        macd = self._fast.fit(prices)['ema'] - self._slow.fit(prices)['ema']
+        signal = self._signal.fit(macd)['ema']
+        return pd.DataFrame({'macd': macd, 'signal': signal, 'histogram': macd - signal})
+
+    def update(self, price):
+        macd = self._fast.update(price)[0] - self._slow.update(price)[0]
+        signal = self._signal.update(macd)[0]
+        return [macd, signal, macd - signal]
+
+
+INDICATORS = {
+    'sma': SMA,
+    'ema': EMA,
+    'rsi': RSI,
+    'bollinger': Bollinger,
+    'macd': MACD,
+}
+
+
+class IndicatorCache:
+    """(종목, 지표, 파라미터)별 지표 결과와 스트리밍 상태를 보관 (entries: 보관소, 기본은 dict)"""
+
+    def __init__(self, entries=None):
+        self._entries = {} if entries is None else entries  # key -> (지표 객체, 결과 DataFrame, 마지막 종가)
+        self._lock = threading.Lock()
+
+    def get(self, ticker, prices, name, **params):
+        """
+        지표 결과를 반환합니다.
+        - 같은 이력으로 다시 요청하면 캐시된 결과를 그대로 반환
+        - 이력이 뒤로 늘어났으면 새 봉만 update()로 계산해 덧붙임
+        - 그 외(기간 변경, 마지막 봉의 종가가 바뀐 경우 등)에는 전체 이력으로 다시 계산
+        캐시된 지표 객체는 여러 세션이 공유하므로 update()는 복사본에서 하고 결과와 함께 새로 넣습니다.
+        """
+        prices = prices.dropna()
+        key = (ticker, name, tuple(sorted(params.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            indicator, result, last_price = entry
+            n = len(result)
+            # 저장소는 마지막 봉(장중 값일 수 있음)을 다시 받으므로 시작/끝 시각과 함께 마지막 종가도 같아야 이어 씀
+            if n and len(prices) >= n and prices.index[0] == result.index[0] \
+                    and prices.index[n - 1] == result.index[-1] and float(prices.iloc[n - 1]) == last_price:
+                if len(prices) == n:
+                    return result
+                indicator = copy.deepcopy(indicator)
+                new = prices.iloc[n:]
+                rows = [indicator.update(float(p)) for p in new.to_numpy()]
+                result = pd.concat([result, pd.DataFrame(rows, index=new.index, columns=indicator.columns)])
+                with self._lock:
+                    self._entries[key] = (indicator, result, float(prices.iloc[-1]))
+                return result
+
+        indicator = INDICATORS[name](**params)
+        result = indicator.fit(prices)
+        with self._lock:
+            self._entries[key] = (indicator, result, float(prices.iloc[-1]) if len(prices) else np.nan)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,207 @@
+"""
+장중 1분봉 실시간 모드
+
+LiveFeed는 종목 묶음마다 하나씩 만들어 모든 세션이 공유합니다.
+폴링은 간격(interval)마다 한 번만 실제로 요청하고, 새로 들어온 봉만 버퍼에 덧붙이며
+누적 수익률과 통계도 새 봉만큼만 갱신합니다. 그래서 갱신 비용은 장이 진행되거나
+보는 사람이 늘어도 일정합니다.
+- 아직 끝나지 않은 분의 봉은 다음 폴링에서 같은 시각으로 다시 오므로 마지막 줄을 덮어씁니다.
+- 거래일이 바뀌면 버퍼와 통계를 비우고 새 거래일의 봉부터 다시 쌓습니다.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+LIVE_INTERVAL = 60  # 폴링 간격 (초)
+BARS_PER_YEAR = 252 * 390  # 1분봉 기준 연간 봉 개수 (미국 정규장)
+
+
+class RunningStats:
+    """종목별 통계를 봉 하나당 O(1)로 갱신 (Welford 방식의 평균/분산)"""
+
+    def __init__(self, n_tickers):
+        shape = n_tickers
+        self.first = np.full(shape, np.nan)
+        self.last = np.full(shape, np.nan)
+        self.high = np.full(shape, -np.inf)
+        self.low = np.full(shape, np.inf)
+        self.peak = np.full(shape, -np.inf)
+        self.max_drawdown = np.zeros(shape)
+        self.count = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, row):
+        """새 봉 한 줄 (종목별 가격, 결측은 NaN) 반영"""
+        valid = ~np.isnan(row)
+        has_prev = valid & ~np.isnan(self.last)
+
+        # 수익률 평균/분산
+        ret = np.where(has_prev, row / np.where(has_prev, self.last, 1.0) - 1.0, 0.0)
+        self.count += has_prev
+        delta = np.where(has_prev, ret - self.mean, 0.0)
+        self.mean += np.where(has_prev, delta / np.maximum(self.count, 1), 0.0)
+        self.m2 += np.where(has_prev, delta * (ret - self.mean), 0.0)
+
+        # 가격 범위, 낙폭
+        self.first = np.where(valid & np.isnan(self.first), row, self.first)
+        self.last = np.where(valid, row, self.last)
+        self.high = np.where(valid, np.maximum(self.high, row), self.high)
+        self.low = np.where(valid, np.minimum(self.low, row), self.low)
+        self.peak = np.where(valid, np.maximum(self.peak, row), self.peak)
+        drawdown = np.where(valid, row / self.peak - 1.0, 0.0)
+        self.max_drawdown = np.minimum(self.max_drawdown, drawdown)
+
+    def copy(self):
+        """같은 값을 가진 새 통계 (배열만 복사)"""
+        other = RunningStats.__new__(RunningStats)
+        other.__dict__ = {name: value.copy() for name, value in self.__dict__.items()}
+        return other
+
+    def summary(self, tickers):
+        """현재 통계를 DataFrame으로 (수익률/변동성/낙폭은 %)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volatility = np.sqrt(self.m2 / (self.count - 1)) * np.sqrt(BARS_PER_YEAR) * 100
+        volatility[self.count < 2] = np.nan
+        return pd.DataFrame({
+            '현재가': self.last,
+            '수익률': (self.last / self.first - 1.0) * 100,
+            '연율 변동성': volatility,
+            '최대 낙폭': self.max_drawdown * 100,
+            '최고가': np.where(np.isinf(self.high), np.nan, self.high),
+            '최저가': np.where(np.isinf(self.low), np.nan, self.low),
+        }, index=tickers)
+
+
+class LiveFeed:
+    """여러 세션이 공유하는 종목 묶음의 1분봉 버퍼"""
+
+    def __init__(self, tickers, provider, interval=LIVE_INTERVAL, capacity=512):
+        self.tickers = list(tickers)
+        self.provider = provider
+        self.interval = interval
+        self.size = 0
+        self.times = np.empty(capacity, dtype='datetime64[ns]')
+        self.prices = np.full((capacity, len(self.tickers)), np.nan)
+        self.cumulative = np.full((capacity, len(self.tickers)), np.nan)
+        self.stats = RunningStats(len(self.tickers))
+        self._stats_before_last = None  # 마지막 봉을 반영하기 직전의 통계 (마지막 봉을 덮어쓸 때 사용)
+        self.last_poll = 0.0
+        self.tz = None
+        self._lock = threading.Lock()
+
+    def _reset(self):
+        """새 거래일이 시작되면 전날 봉과 통계를 비움 (버퍼 크기는 유지)"""
+        self.size = 0
+        self.prices.fill(np.nan)
+        self.cumulative.fill(np.nan)
+        self.stats = RunningStats(len(self.tickers))
+        self._stats_before_last = None
+
+    def _grow(self):
+        """버퍼가 가득 차면 두 배로 늘림 (덧붙이기 비용은 상각 O(1))"""
+        capacity = len(self.times) * 2
+        times = np.empty(capacity, dtype='datetime64[ns]')
+        times[:self.size] = self.times[:self.size]
+        prices = np.full((capacity, len(self.tickers)), np.nan)
+        prices[:self.size] = self.prices[:self.size]
+        cumulative = np.full((capacity, len(self.tickers)), np.nan)
+        cumulative[:self.size] = self.cumulative[:self.size]
+        self.times, self.prices, self.cumulative = times, prices, cumulative
+
+    def _fetch_new(self):
+        """마지막 봉 이후의 1분봉을 종목별로 동시에 요청"""
+        start = self.last_timestamp()  # 첫 요청은 최근 거래일 전체
+
+        def load(ticker):
+            try:
+                hist = self.provider.history(ticker, period='1d', start=start, interval='1m')
+                return ticker, hist['Close'] if hist is not None and not hist.empty else None
+            except Exception:
+                return ticker, None
+
+        with ThreadPoolExecutor(max_workers=min(8, len(self.tickers))) as pool:
+            closes = {t: c for t, c in pool.map(load, self.tickers) if c is not None}
+        if not closes:
+            return pd.DataFrame(columns=self.tickers)
+        return pd.DataFrame(closes).reindex(columns=self.tickers)
+
+    def poll(self, force=False):
+        """간격이 지났으면 새 봉을 가져와 덧붙임. 반환값: 새로 추가된 봉 개수"""
+        with self._lock:
+            now = time.time()
+            if not force and now - self.last_poll < self.interval:
+                return 0
+            self.last_poll = now  # 간격마다 한 세션만 실제로 요청
+
+        new_bars = self._fetch_new()
+        with self._lock:
+            return self.append(new_bars)
+
+    def append(self, new_bars):
+        """
+        마지막 봉 이후의 봉을 덧붙이고 누적 수익률/통계를 새 봉만큼만 갱신합니다.
+        마지막 봉과 시각이 같은 봉은 그 줄을 덮어쓰고(장중 값 -> 확정 값), 더 이른 봉은 버립니다.
+        반환값: 새로 추가되거나 바뀐 봉 개수
+        """
+        if new_bars.empty:
+            return 0
+        if self.tz is None and getattr(new_bars.index, 'tz', None) is not None:
+            self.tz = new_bars.index.tz
+        # 시장 시간대의 벽시계 시각으로 맞춘 뒤 tz를 떼므로 normalize()가 곧 거래일
+        index = new_bars.index.tz_convert(self.tz) if getattr(new_bars.index, 'tz', None) is not None else new_bars.index
+        index = index.tz_localize(None) if index.tz is not None else index
+        new_bars = new_bars.set_axis(index).sort_index()
+        new_bars = new_bars[~new_bars.index.duplicated(keep='last')]
+
+        session = new_bars.index[-1].normalize()
+        if self.size and pd.Timestamp(self.times[self.size - 1]).normalize() < session:
+            self._reset()
+        new_bars = new_bars[new_bars.index >= session]  # 새 거래일이 섞여 오면 그날 봉만
+        if self.size:
+            new_bars = new_bars[new_bars.index >= self.times[self.size - 1]]
+
+        values = new_bars.reindex(columns=self.tickers).to_numpy(dtype=np.float64)
+        last = len(values) - 1
+        for i, (ts, row) in enumerate(zip(new_bars.index.to_numpy(), values)):
+            if self.size and ts == self.times[self.size - 1]:
+                # 같은 분의 봉이 다시 오면 마지막 줄을 되돌리고 새 값으로 다시 반영 (새 값이 없는 종목은 이전 값)
+                row = np.where(np.isnan(row), self.prices[self.size - 1], row)
+                self.size -= 1
+                self.stats = self._stats_before_last
+            elif self.size == len(self.times):
+                self._grow()
+            if i == last:
+                # 다음 폴링에서 덮어쓸 수 있는 봉은 마지막 봉뿐이므로 묶음마다 한 번만 보관
+                self._stats_before_last = self.stats.copy()
+            self.stats.update(row)
+            self.times[self.size] = ts
+            self.prices[self.size] = row
+            self.cumulative[self.size] = (self.stats.last / self.stats.first - 1.0) * 100
+            self.size += 1
+        return len(values)
+
+    def last_timestamp(self):
+        if not self.size:
+            return None
+        ts = pd.Timestamp(self.times[self.size - 1])
+        return ts.tz_localize(self.tz) if self.tz is not None else ts
+
+    def snapshot(self):
+        """
+        현재까지의 (가격, 누적 수익률, 통계).
+        버퍼는 다른 세션의 폴링이 계속 덮어쓰므로 잠금 안에서 복사해 돌려줍니다 (잠금 밖에서 그려도 안전).
+        """
+        with self._lock:
+            times = self.times[:self.size].copy()
+            prices = self.prices[:self.size].copy()
+            cumulative = self.cumulative[:self.size].copy()
+            summary = self.stats.summary(self.tickers)
+        index = pd.DatetimeIndex(times)
+        if self.tz is not None:
+            index = index.tz_localize(self.tz)
+        return (pd.DataFrame(prices, index=index, columns=self.tickers, copy=False),
+                pd.DataFrame(cumulative, index=index, columns=self.tickers, copy=False), summary)
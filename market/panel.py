@@ -0,0 +1,202 @@
+"""
+대규모 종목 스크리닝용 종가 패널
+
+종가를 float32 행렬(날짜 x 종목) 하나와 날짜/종목 인덱스로 보관합니다.
+디스크에는 .npy로 저장해 메모리 맵으로 열 수 있으므로, 여러 세션이 같은 패널을 복사 없이 공유합니다.
+저장할 때마다 새 버전 디렉터리를 만들고, 최근 KEEP_VERSIONS개만 남기고 이전 버전은 지웁니다.
+스크리닝 조건(수익률, 변동성, 낙폭, 기준 종목과의 상관계수)은 모두 행렬 연산으로 한 번에 계산합니다.
+"""
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.paths import data_dir
+
+DEFAULT_ROOT = data_dir('panel')
+TRADING_DAYS = 252
+KEEP_VERSIONS = 2  # 방금 바뀐 버전을 열던 세션이 있을 수 있어 직전 버전까지 남김
+MAX_WORKERS = 8  # 패널을 만들 때 동시에 요청할 최대 종목 수
+
+
+def _daily_close(hist):
+    """OHLCV 이력 -> 날짜(tz 없음, 자정) 인덱스의 float32 종가"""
+    close = hist['Close'].astype(np.float32)
+    index = close.index.tz_localize(None) if close.index.tz is not None else close.index
+    return close.set_axis(index.normalize())
+
+
+class PricePanel:
+    """float32 종가 행렬 + 날짜 인덱스 + 종목 목록"""
+
+    def __init__(self, closes, dates, tickers):
+        self.closes = closes
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.tickers = list(tickers)
+        self._columns = {t: i for i, t in enumerate(self.tickers)}
+
+    @classmethod
+    def from_histories(cls, histories):
+        """종목별 OHLCV DataFrame 딕셔너리로 패널 생성 (날짜는 합집합, 없는 날은 NaN)"""
+        return cls._from_closes({ticker: _daily_close(hist) for ticker, hist in histories.items()
+                                 if hist is not None and not hist.empty})
+
+    @classmethod
+    def from_provider(cls, provider, tickers, period='1y', max_workers=MAX_WORKERS):
+        """
+        제공자(보통 market.store.PriceStore)에서 종목별 이력을 받아 바로 종가만 남기며 패널 생성.
+        OHLCV 전체는 종목을 받는 동안만 들고 있으므로 종목이 많아도 메모리에는 종가 열만 쌓입니다.
+        반환값: (패널, ticker -> 오류 메시지)
+        """
+        def load(ticker):
+            try:
+                hist = provider.history(ticker, period=period)
+                return ticker, None if hist is None or hist.empty else _daily_close(hist), None
+            except Exception as e:
+                return ticker, None, str(e)
+
+        tickers = list(dict.fromkeys(tickers))
+        closes, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+            for ticker, close, error in pool.map(load, tickers):
+                if error is not None:
+                    errors[ticker] = error
+                elif close is not None:
+                    closes[ticker] = close
+        return cls._from_closes(closes), errors
+
+    @classmethod
+    def _from_closes(cls, closes):
+        frame = pd.DataFrame(closes).sort_index()
+        return cls(frame.to_numpy(dtype=np.float32), frame.index.values, frame.columns)
+
+    def column(self, ticker):
+        return self._columns[ticker]
+
+    @property
+    def nbytes(self):
+        return self.closes.nbytes + self.dates.nbytes
+
+    def save(self, root=DEFAULT_ROOT):
+        """
+        새 버전 디렉터리에 기록한 뒤 CURRENT 파일을 원자적으로 교체합니다.
+        읽는 쪽은 항상 완성된 한 버전만 보게 됩니다.
+        """
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        version = Path(tempfile.mkdtemp(dir=root, prefix='v'))
+        np.save(version / 'closes.npy', np.ascontiguousarray(self.closes, dtype=np.float32))
+        np.save(version / 'dates.npy', self.dates)
+        (version / 'tickers.json').write_text(json.dumps(self.tickers))
+
+        fd, tmp_path = tempfile.mkstemp(dir=root, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(version.name)
+        os.replace(tmp_path, root / 'CURRENT')
+        self.prune(root, keep=version.name)
+        return version
+
+    @staticmethod
+    def prune(root=DEFAULT_ROOT, keep=None, versions=KEEP_VERSIONS):
+        """
+        최근 versions개(keep 버전 포함)만 남기고 이전 버전 디렉터리를 지움.
+        이미 메모리 맵으로 연 세션은 파일이 지워져도 계속 읽을 수 있습니다.
+        """
+        root = Path(root)
+        dirs = sorted((d for d in root.glob('v*') if d.is_dir() and d.name != keep),
+                      key=lambda d: d.stat().st_mtime_ns, reverse=True)
+        for old in dirs[max(versions - (keep is not None), 0):]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    @staticmethod
+    def current_version(root=DEFAULT_ROOT):
+        """가장 최근에 저장된 버전 이름 (없으면 None)"""
+        current = Path(root) / 'CURRENT'
+        return current.read_text().strip() if current.exists() else None
+
+    @classmethod
+    def load(cls, root=DEFAULT_ROOT, version=None, mmap=True):
+        """
+        version 이름의 패널(None이면 가장 최근에 저장된 패널)을 엽니다.
+        mmap=True면 읽기 전용 메모리 맵. 패널이 없거나 그 버전이 이미 지워졌으면 None
+        """
+        name = cls.current_version(root) if version is None else version
+        if name is None or not (Path(root) / name / 'tickers.json').exists():
+            return None
+        version = Path(root) / name
+        closes = np.load(version / 'closes.npy', mmap_mode='r' if mmap else None)
+        dates = np.load(version / 'dates.npy')
+        tickers = json.loads((version / 'tickers.json').read_text())
+        return cls(closes, dates, tickers)
+
+
+def screen_metrics(panel, lookback=TRADING_DAYS, reference=None):
+    """
+    최근 lookback개 봉 구간에서 모든 종목의 지표를 한 번에 계산합니다.
+    수익률/변동성/낙폭은 %, 상관계수는 reference 종목과의 일간 수익률 상관계수입니다.
+    """
+    window = np.asarray(panel.closes[-(lookback + 1):], dtype=np.float32)
+    valid = ~np.isnan(window)
+    rows = np.arange(window.shape[0])[:, None]
+    cols = np.arange(window.shape[1])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        first_idx = np.where(valid, rows, window.shape[0] - 1).min(axis=0)
+        last_idx = np.where(valid, rows, 0).max(axis=0)
+        total_return = (window[last_idx, cols] / window[first_idx, cols] - 1) * 100
+
+        returns = window[1:] / window[:-1] - 1
+        volatility = np.nanstd(returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+        filled = pd.DataFrame(window).ffill().to_numpy(dtype=np.float32)
+        peak = np.fmax.accumulate(np.nan_to_num(filled, nan=-np.inf), axis=0)
+        drawdown = np.nanmin(filled / peak - 1, axis=0) * 100
+
+    correlation = np.full(window.shape[1], np.nan, dtype=np.float32)
+    if reference is not None:
+        ref = returns[:, panel.column(reference)][:, None]
+        mask = ~np.isnan(returns) & ~np.isnan(ref)
+        count = mask.sum(axis=0)
+        x = np.where(mask, returns, 0)
+        y = np.where(mask, ref, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = x.sum(axis=0) / count
+            mean_y = y.sum(axis=0) / count
+            cov = (x * y).sum(axis=0) / count - mean_x * mean_y
+            var_x = (x * x).sum(axis=0) / count - mean_x ** 2
+            var_y = (y * y).sum(axis=0) / count - mean_y ** 2
+            correlation = np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+        correlation[count < 2] = np.nan
+
+    no_data = ~valid.any(axis=0)
+    total_return[no_data] = np.nan
+    return pd.DataFrame({
+        '수익률': total_return,
+        '연간 변동성': volatility,
+        '최대 낙폭': drawdown,
+        '상관계수': correlation,
+    }, index=panel.tickers)
+
+
+def screen(panel, lookback=TRADING_DAYS, reference=None, min_return=None, max_volatility=None,
+           max_drawdown=None, min_correlation=None, max_correlation=None):
+    """조건을 모두 만족하는 종목의 지표를 수익률 내림차순으로 반환 (조건이 None이면 적용하지 않음)"""
+    metrics = screen_metrics(panel, lookback, reference)
+    mask = metrics['수익률'].notna().to_numpy().copy()
+    if min_return is not None:
+        mask &= metrics['수익률'].to_numpy() >= min_return
+    if max_volatility is not None:
+        mask &= metrics['연간 변동성'].to_numpy() <= max_volatility
+    if max_drawdown is not None:
+        # 최대 낙폭은 음수이므로 -max_drawdown(%) 이상이어야 함
+        mask &= metrics['최대 낙폭'].to_numpy() >= -abs(max_drawdown)
+    if reference is not None and min_correlation is not None:
+        mask &= metrics['상관계수'].to_numpy() >= min_correlation
+    if reference is not None and max_correlation is not None:
+        mask &= metrics['상관계수'].to_numpy() <= max_correlation
+    return metrics[mask].sort_values('수익률', ascending=False)
@@ -0,0 +1,181 @@
+"""
+주가 데이터 제공자
+
+모든 제공자는 history(ticker, period, start, interval)로 yfinance와 같은 모양의 OHLCV DataFrame을 돌려줍니다.
+- YFinanceProvider: Yahoo Finance (네트워크 필요)
+- ReplayProvider: 네트워크 없이 고정 데이터(기록된 파일 또는 결정적인 가상 데이터)를 제공
+- RecordingProvider: 다른 제공자의 응답을 ReplayProvider가 읽을 수 있는 파일로 기록
+
+환경 변수 MARKET_DATA_PROVIDER=replay 로 페이지 전체를 오프라인 데이터로 실행할 수 있습니다.
+(MARKET_DATA_FIXTURES에 기록 파일 디렉터리를 지정하면 그 파일을 우선 사용)
+"""
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 390  # 미국 정규장 1분봉 개수
+MARKET_TZ = 'America/New_York'
+
+# yfinance 기간 문자열 -> 오늘 기준 시작 시점
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def period_start(period, now=None):
+    """기간 문자열의 시작 시점 (tz 없는 Timestamp, 'max'는 None)"""
+    now = pd.Timestamp.now() if now is None else now
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"지원하지 않는 기간입니다: {period}")
+    return (now - PERIOD_OFFSETS[period]).normalize()
+
+
+class MarketDataProvider(ABC):
+    """데이터 제공자 기본 클래스 (name: 데이터 출처 이름, 저장소를 출처별로 나누는 데 사용)"""
+
+    name = 'base'
+
+    @abstractmethod
+    def history(self, ticker, period='1y', start=None, interval='1d'):
+        """
+        OHLCV 이력 (인덱스: 거래 시각, 컬럼: Open/High/Low/Close/Volume).
+        start가 주어지면 그 시점 이후, 아니면 period 전체를 반환합니다.
+        """
+
+    def now(self):
+        """기간(period)을 셀 기준 시각 (tz 없는 Timestamp)"""
+        return pd.Timestamp.now()
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance에서 주가 이력을 가져오는 데이터 제공자"""
+
+    name = 'yfinance'
+
+    def history(self, ticker, period='1y', start=None, interval='1d'):
+        import yfinance as yf
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start, interval=interval)
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+def _fixture_path(root, ticker, interval):
+    return Path(root) / f"{ticker}_{interval}.parquet"
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    네트워크 없이 항상 같은 데이터를 돌려주는 제공자.
+    fixture_dir에 기록된 파일이 있으면 그 데이터를, 없으면 종목 이름으로 시드를 정한
+    기하 브라운 운동 가상 데이터를 만듭니다. latency로 요청당 지연을 흉내낼 수 있습니다.
+    """
+
+    name = 'replay'
+
+    def __init__(self, fixture_dir=None, end='2025-06-30', latency=0.0, seed=0):
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self.end = pd.Timestamp(end)
+        self.latency = latency
+        self.seed = seed
+        self._indexes = {}
+        self._index_lock = threading.Lock()
+
+    def history(self, ticker, period='1y', start=None, interval='1d'):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fixture_dir is not None and _fixture_path(self.fixture_dir, ticker, interval).exists():
+            full = pd.read_parquet(_fixture_path(self.fixture_dir, ticker, interval))
+        else:
+            full = self._synthetic(ticker, interval)
+        return self._slice(full, period, start)
+
+    def now(self):
+        """고정 데이터의 마지막 날 다음 날 (실제 오늘과 상관없이 같은 기간을 돌려주도록)"""
+        return self.end + pd.Timedelta(days=1)
+
+    def _slice(self, full, period, start):
+        index = full.index.tz_localize(None) if full.index.tz is not None else full.index
+        if start is not None:
+            cutoff = pd.Timestamp(start)
+            cutoff = cutoff.tz_localize(None) if cutoff.tz is not None else cutoff
+            return full[index >= cutoff]
+        cutoff = period_start(period, now=self.now())
+        return full if cutoff is None else full[index >= cutoff]
+
+    def _index(self, interval):
+        """가상 데이터의 거래 시각 인덱스 (만들기 비싸므로 간격별로 한 번만 생성)"""
+        with self._index_lock:
+            if interval in self._indexes:
+                return self._indexes[interval]
+            if interval == '1d':
+                index = pd.bdate_range(end=self.end, periods=252 * 30, tz=MARKET_TZ, name='Date')
+            else:
+                days = pd.bdate_range(end=self.end, periods=5)
+                minutes = pd.timedelta_range('9h30min', periods=MINUTES_PER_DAY, freq='min')
+                index = pd.DatetimeIndex(
+                    (days.values[:, None] + minutes.values[None, :]).ravel(), name='Datetime'
+                ).tz_localize(MARKET_TZ)
+            self._indexes[interval] = index
+            return index
+
+    def _synthetic(self, ticker, interval):
+        """종목별로 결정적인 가상 OHLCV (일봉 30년 또는 최근 5거래일의 1분봉)"""
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+        index = self._index(interval)
+        drift, vol = (0.0003, 0.018) if interval == '1d' else (0.0, 0.0008)
+
+        start_price = 20 + 480 * rng.random()
+        close = start_price * np.exp(np.cumsum(rng.normal(drift, vol, len(index))))
+        spread = np.abs(rng.normal(0, vol, len(index))) * close
+        open_ = np.concatenate([[start_price], close[:-1]])
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 50_000_000, len(index)),
+        }, index=index)
+
+
+class RecordingProvider(MarketDataProvider):
+    """다른 제공자의 응답을 fixture_dir에 기록 (ReplayProvider(fixture_dir)로 다시 재생)"""
+
+    def __init__(self, provider, fixture_dir):
+        self.provider = provider
+        self.name = provider.name
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+
+    def history(self, ticker, period='1y', start=None, interval='1d'):
+        hist = self.provider.history(ticker, period=period, start=start, interval=interval)
+        if hist is not None and not hist.empty:
+            hist.to_parquet(_fixture_path(self.fixture_dir, ticker, interval))
+        return hist
+
+    def now(self):
+        return self.provider.now()
+
+
+def make_provider():
+    """환경 변수에 따라 페이지에서 사용할 기본 제공자 생성"""
+    if os.environ.get('MARKET_DATA_PROVIDER', 'yfinance').lower() == 'replay':
+        return ReplayProvider(fixture_dir=os.environ.get('MARKET_DATA_FIXTURES'))
+    return YFinanceProvider()
@@ -0,0 +1,105 @@
+"""
+몬테카를로 포트폴리오 위험 분석 (VaR / CVaR)
+
+과거 일간 로그 수익률의 평균과 공분산으로 다변량 정규분포를 추정하고,
+고정 크기 청크 단위로 경로를 시뮬레이션해 메모리 사용량을 일정하게 유지합니다.
+청크마다 SeedSequence에서 나눈 독립 시드를 쓰므로, 프로세스 풀 사용 여부와 관계없이
+같은 seed면 같은 결과가 나옵니다.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 10_000  # 청크당 경로 수 (청크당 메모리: 경로 x 체크포인트 x 종목 x 4바이트)
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+
+RiskResult = namedtuple('RiskResult', ['terminal_returns', 'fan', 'var', 'cvar'])
+
+
+def estimate_parameters(prices):
+    """가격 DataFrame에서 일간 로그 수익률의 평균 벡터와 공분산 행렬 추정 (모든 종목이 있는 날만 사용)"""
+    log_returns = np.log(prices).diff().dropna(how='any')
+    if len(log_returns) < 2:
+        raise ValueError("수익률 분포를 추정하기에 데이터가 부족합니다.")
+    return log_returns.mean().to_numpy(), log_returns.cov().to_numpy()
+
+
+def _checkpoints(horizon, n_points=60):
+    """팬 차트에 기록할 시점 (0일차 포함, 마지막 날은 항상 포함)"""
+    return np.unique(np.linspace(0, horizon, min(n_points, horizon + 1)).astype(np.int64))
+
+
+def _simulate_chunk(args):
+    """
+    한 청크의 경로를 시뮬레이션해 체크포인트 시점의 포트폴리오 가치(시작 = 1) 반환.
+    정규분포 로그 수익률의 k일 합은 평균 k*mean, 공분산 k*cov인 정규분포이므로
+    매일이 아니라 체크포인트 사이의 구간 수익률만 뽑아도 체크포인트 시점의 분포는 정확히 같습니다.
+    """
+    seed, n_paths, mean, chol, weights, checkpoints = args
+    rng = np.random.default_rng(seed)
+    steps = np.diff(checkpoints).astype(np.float32)
+    shocks = rng.standard_normal((n_paths, len(steps), len(mean)), dtype=np.float32)
+    log_returns = shocks @ chol.T.astype(np.float32)
+    log_returns *= np.sqrt(steps)[:, None]
+    log_returns += steps[:, None] * mean.astype(np.float32)
+    np.cumsum(log_returns, axis=1, out=log_returns)
+
+    # 매수 후 보유: 시점별 포트폴리오 가치 = sum(비중 x 종목 누적 성장률)
+    np.exp(log_returns, out=log_returns)
+    values = np.empty((n_paths, len(checkpoints)), dtype=np.float32)
+    values[:, 0] = 1.0
+    values[:, 1:] = log_returns @ weights.astype(np.float32)
+    return values
+
+
+def simulate_portfolio(mean, cov, weights, horizon=252, n_paths=100_000, seed=42,
+                       chunk_size=CHUNK_SIZE, workers=None):
+    """
+    포트폴리오 가치 경로를 시뮬레이션합니다.
+    반환값: (체크포인트 시점 배열, 경로 x 체크포인트 가치 행렬)
+    workers가 2 이상이면 청크를 프로세스 풀에 나눠 실행합니다.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    # 공분산이 양의 준정부호에 가깝도록 대각선에 아주 작은 값을 더해 분해
+    chol = np.linalg.cholesky(cov + np.eye(len(cov)) * 1e-12)
+    checkpoints = _checkpoints(horizon)
+
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, n, mean, chol, weights, checkpoints) for s, n in zip(seeds, sizes)]
+
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, tasks))
+    else:
+        chunks = [_simulate_chunk(task) for task in tasks]
+    return checkpoints, np.concatenate(chunks)
+
+
+def value_at_risk(terminal_returns, confidence=0.95):
+    """VaR, CVaR (손실을 양수 비율로 표시)"""
+    cutoff = np.quantile(terminal_returns, 1 - confidence)
+    tail = terminal_returns[terminal_returns <= cutoff]
+    return -cutoff, -tail.mean()
+
+
+def portfolio_risk(prices, weights, horizon=252, n_paths=100_000, confidence=0.95, seed=42, workers=None):
+    """
+    가격 이력과 비중으로 포트폴리오 위험을 계산합니다.
+    fan: 시점(거래일) x 백분위 포트폴리오 가치 DataFrame, terminal_returns: 경로별 최종 수익률
+    """
+    mean, cov = estimate_parameters(prices)
+    checkpoints, values = simulate_portfolio(mean, cov, weights, horizon, n_paths, seed, workers=workers)
+    terminal_returns = values[:, -1].astype(np.float64) - 1.0
+    var, cvar = value_at_risk(terminal_returns, confidence)
+    fan = pd.DataFrame(
+        np.percentile(values, FAN_PERCENTILES, axis=0).T,
+        index=pd.Index(checkpoints, name='거래일'),
+        columns=[f'P{p}' for p in FAN_PERCENTILES],
+    )
+    return RiskResult(terminal_returns=terminal_returns, fan=fan, var=var, cvar=cvar)
@@ -0,0 +1,142 @@
+"""
+여러 종목의 통계 지표를 가격 행렬 하나로 한 번에 계산하는 통계 엔진
+
+일간 수익률은 한 번만 계산해 누적 수익률, 변동성, 샤프/소르티노 비율, 베타, 상관계수가 함께 사용합니다.
+상장일이 달라 비어 있는 값(NaN)은 종목별/종목쌍별로 유효한 구간만 사용해 계산합니다.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252  # 연간 거래일 수
+
+StatisticsResult = namedtuple('StatisticsResult', ['returns', 'cumulative', 'summary', 'correlation'])
+
+
+def daily_returns(prices):
+    """가격 행렬(날짜 x 종목)의 일간 수익률 행렬, 첫 행과 결측 구간은 NaN"""
+    values = np.asarray(prices, dtype=np.float64)
+    returns = np.full_like(values, np.nan)
+    returns[1:] = values[1:] / values[:-1] - 1.0
+    return returns
+
+
+def cumulative_returns(prices):
+    """
+    가격 행렬(날짜 x 종목)의 누적 수익률(%).
+    중간에 빈 날은 직전 가격으로 채우므로 빈 구간을 건넌 변동도 반영되어 마지막 값이 총 수익률과 같습니다.
+    상장 전처럼 첫 가격 이전은 0입니다.
+    """
+    filled = pd.DataFrame(prices).ffill().to_numpy(dtype=np.float64)
+    first, _ = _first_last_valid(filled)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = filled / first
+    return np.nan_to_num((growth - 1.0) * 100, nan=0.0)
+
+
+def max_drawdown(prices):
+    """종목별 최대 낙폭(%)"""
+    filled = pd.DataFrame(prices).ffill().to_numpy(dtype=np.float64)
+    running_max = np.fmax.accumulate(np.nan_to_num(filled, nan=-np.inf), axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = filled / running_max - 1.0
+    return np.nanmin(drawdown, axis=0) * 100
+
+
+def _first_last_valid(values):
+    """종목별 첫 번째/마지막 유효 가격"""
+    valid = ~np.isnan(values)
+    rows = np.arange(values.shape[0])[:, None]
+    first_idx = np.where(valid, rows, values.shape[0]).min(axis=0)
+    last_idx = np.where(valid, rows, -1).max(axis=0)
+    cols = np.arange(values.shape[1])
+    has_data = last_idx >= 0
+    first = np.where(has_data, values[np.minimum(first_idx, values.shape[0] - 1), cols], np.nan)
+    last = np.where(has_data, values[np.maximum(last_idx, 0), cols], np.nan)
+    return first, last
+
+
+def correlation_matrix(returns):
+    """
+    결측값을 종목쌍별로 제외한 상관계수 행렬.
+    마스크 행렬의 곱으로 모든 종목쌍의 합계를 한 번에 구합니다.
+    """
+    mask = (~np.isnan(returns)).astype(np.float64)
+    x = np.nan_to_num(returns, nan=0.0)
+
+    n = mask.T @ mask               # 종목쌍별 유효 관측 수
+    sx = x.T @ mask                 # sx[i, j] = j가 유효한 날의 i 수익률 합
+    sxx = (x * x).T @ mask
+    sxy = x.T @ x
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+        corr = cov / np.sqrt(var)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def beta(returns, benchmark_returns):
+    """벤치마크 대비 종목별 베타 (두 수익률이 모두 유효한 날만 사용)"""
+    bench = np.asarray(benchmark_returns, dtype=np.float64).reshape(-1, 1)
+    mask = ~np.isnan(returns) & ~np.isnan(bench)
+    count = mask.sum(axis=0)
+    x = np.where(mask, returns, 0.0)
+    y = np.where(mask, bench, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = x.sum(axis=0) / count
+        mean_y = y.sum(axis=0) / count
+        cov = (x * y).sum(axis=0) / count - mean_x * mean_y
+        var = (y * y).sum(axis=0) / count - mean_y ** 2
+        result = cov / var
+    result[count < 2] = np.nan
+    return result
+
+
+def compute_statistics(prices, benchmark=None, risk_free_rate=0.0):
+    """
+    가격 DataFrame(날짜 x 종목)의 통계를 한 번에 계산합니다.
+    benchmark: 베타 계산용 벤치마크 가격 Series (없으면 베타는 NaN)
+    risk_free_rate: 연간 무위험 수익률 (샤프/소르티노 비율 계산용, 소수)
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    returns = daily_returns(values)
+
+    first, last = _first_last_valid(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_return = (last / first - 1.0) * 100
+
+        mean = np.nanmean(returns, axis=0)
+        std = np.nanstd(returns, axis=0, ddof=1)
+        excess = mean - risk_free_rate / TRADING_DAYS
+        downside = np.sqrt(np.nanmean(np.minimum(returns - risk_free_rate / TRADING_DAYS, 0.0) ** 2, axis=0))
+
+        sharpe = excess / std * np.sqrt(TRADING_DAYS)
+        sortino = excess / downside * np.sqrt(TRADING_DAYS)
+
+    if benchmark is not None:
+        bench_values = benchmark.reindex(prices.index).to_numpy(dtype=np.float64)
+        betas = beta(returns, daily_returns(bench_values.reshape(-1, 1))[:, 0])
+    else:
+        betas = np.full(values.shape[1], np.nan)
+
+    summary = pd.DataFrame({
+        '현재 주가': last,
+        '총 수익률': total_return,
+        '연간 변동성': std * np.sqrt(TRADING_DAYS) * 100,
+        '최대 낙폭': max_drawdown(values),
+        '샤프 비율': sharpe,
+        '소르티노 비율': sortino,
+        '베타': betas,
+        '최고가': np.nanmax(values, axis=0),
+        '최저가': np.nanmin(values, axis=0),
+    }, index=prices.columns)
+
+    return StatisticsResult(
+        returns=pd.DataFrame(returns, index=prices.index, columns=prices.columns),
+        cumulative=pd.DataFrame(cumulative_returns(values), index=prices.index, columns=prices.columns),
+        summary=summary,
+        correlation=pd.DataFrame(correlation_matrix(returns), index=prices.columns, columns=prices.columns),
+    )
@@ -0,0 +1,140 @@
+"""
+종목별 OHLCV 이력을 Parquet 파일로 보관하는 로컬 주가 저장소
+
+한 번 받은 이력은 디스크에 남겨 두고, 갱신할 때는 마지막 저장일 이후의 봉만 요청해 이어 붙입니다.
+파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 여러 세션이 동시에 갱신해도 깨지지 않습니다.
+(가장 마지막에 쓴 세션의 결과가 남습니다.)
+"""
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from market.providers import MarketDataProvider, period_start
+from shared.paths import data_dir
+
+DEFAULT_ROOT = data_dir('prices')
+FRESH_TTL = 3600  # 이 시간 안에 갱신된 파일은 네트워크 없이 그대로 사용
+TICKER_PATTERN = re.compile(r'^[A-Za-z0-9.\-^=]+$')  # 'AAPL', 'BRK-B', '^GSPC', 'KRW=X', '005930.KS'
+
+
+def validate_ticker(ticker):
+    """파일 이름으로 써도 안전한 종목 코드인지 확인 (경로 구분자 등이 있으면 ValueError)"""
+    if not isinstance(ticker, str) or not TICKER_PATTERN.fullmatch(ticker):
+        raise ValueError(f"올바르지 않은 종목 코드입니다: {ticker!r}")
+    return ticker
+
+
+def store_root(provider, root=DEFAULT_ROOT):
+    """
+    제공자별 저장 위치. 실제 시세(yfinance)는 root 바로 아래, 그 밖의 출처(replay 등)는 root/<이름> 아래에 두어
+    가상 데이터가 실제 이력 파일에 섞이지 않게 합니다.
+    """
+    name = getattr(provider, 'name', 'yfinance')
+    return Path(root) if name == 'yfinance' else Path(root) / name
+
+
+def _naive(index):
+    """tz 정보가 있는 인덱스를 비교용 tz 없는 인덱스로 변환"""
+    return index.tz_localize(None) if getattr(index, 'tz', None) is not None else index
+
+
+class PriceStore(MarketDataProvider):
+    """
+    디스크에 저장된 이력을 먼저 사용하고 부족한 부분만 provider에서 가져오는 데이터 제공자.
+    TickerCache의 provider 자리에 그대로 넣어 쓸 수 있습니다.
+    root를 주지 않으면 제공자 출처별 위치(store_root)를 사용합니다.
+    """
+
+    def __init__(self, provider, root=None, fresh_ttl=FRESH_TTL):
+        self.provider = provider
+        self.name = provider.name
+        self.root = store_root(provider) if root is None else Path(root)
+        self.fresh_ttl = fresh_ttl
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def now(self):
+        return self.provider.now()
+
+    def _path(self, ticker):
+        return self.root / f"{validate_ticker(ticker)}.parquet"
+
+    def read(self, ticker):
+        """저장된 이력과 메타데이터 (없으면 None, {})"""
+        path = self._path(ticker)
+        if not path.exists():
+            return None, {}
+        table = pq.read_table(path)
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()
+                if k in (b'covered_from', b'updated_at')}
+        return table.to_pandas(), meta
+
+    def write(self, ticker, df, covered_from):
+        """임시 파일에 기록한 뒤 원자적으로 교체"""
+        table = pa.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'covered_from'] = str(covered_from).encode()
+        metadata[b'updated_at'] = str(time.time()).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        path = self._path(ticker)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f".{ticker}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pq.write_table(table, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def history(self, ticker, period='1y', start=None, interval='1d'):
+        """저장소를 거쳐 기간에 해당하는 OHLCV 이력을 반환 (일봉 기간 요청만 저장, 나머지는 그대로 전달)"""
+        if start is not None or interval != '1d':
+            return self.provider.history(ticker, period=period, start=start, interval=interval)
+        start = period_start(period, now=self.provider.now())
+        stored, meta = self.read(ticker)
+
+        covered = False
+        if stored is not None and not stored.empty:
+            covered_from = meta.get('covered_from', 'max')
+            covered = covered_from == 'max' or (
+                start is not None and pd.Timestamp(covered_from) <= start
+            )
+
+        if not covered:
+            # 처음이거나 저장된 범위보다 긴 기간 요청 -> 전체 기간을 받아 저장
+            hist = self.provider.history(ticker, period=period)
+            if hist is None or hist.empty:
+                return pd.DataFrame()
+            self.write(ticker, hist, 'max' if start is None else start.isoformat())
+            return hist
+
+        updated_at = float(meta.get('updated_at', 0))
+        if time.time() - updated_at > self.fresh_ttl:
+            stored = self._refresh(ticker, stored, covered_from)
+
+        if start is None:
+            return stored
+        return stored[_naive(stored.index) >= start]
+
+    def _refresh(self, ticker, stored, covered_from):
+        """마지막 저장일부터의 봉만 받아 이어 붙임 (마지막 봉은 장중 값일 수 있어 다시 받음)"""
+        last_date = _naive(stored.index)[-1].normalize()
+        new = self.provider.history(ticker, start=last_date.strftime('%Y-%m-%d'))
+        if new is None or new.empty:
+            self.write(ticker, stored, covered_from)  # 갱신 시각만 기록
+            return stored
+
+        keep = stored[_naive(stored.index) < _naive(new.index)[0]]
+        merged = pd.concat([keep, new[stored.columns.intersection(new.columns)]])
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self.write(ticker, merged, covered_from)
+        return merged
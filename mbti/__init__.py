@@ -0,0 +1 @@
+"""00_mbti 페이지에서 사용하는 MBTI 문항과 채점 모듈"""
@@ -0,0 +1,158 @@
+"""
+행렬 기반 MBTI 채점 엔진
+
+문항 표(questions)를 한 번 (문항 x 선택지) x 8지표 가중치 행렬로 컴파일해 두고,
+응답(문항별 선택지 번호) 행렬을 원-핫으로 펼쳐 행렬 곱 한 번으로 모든 응답자의 지표 점수를 구합니다.
+- 유형은 지표 쌍(E/I, S/N, T/F, J/P)의 점수 차(margin) 부호로 정하며, 같으면 앞 글자(E/S/T/J)입니다.
+- 원-핫 행렬은 BATCH_ROWS 행씩 나눠 만들어 100만 행도 메모리를 일정하게 씁니다.
+한 사람을 채점하는 페이지도 같은 엔진을 1행짜리 배치로 사용합니다.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+AXES = ('E', 'I', 'S', 'N', 'T', 'F', 'J', 'P')
+AXIS_INDEX = {axis: i for i, axis in enumerate(AXES)}
+PAIRS = (('E', 'I'), ('S', 'N'), ('T', 'F'), ('J', 'P'))
+# 유형 번호: 지표 쌍마다 뒤 글자(I/N/F/P)면 1인 4비트 (E/I가 가장 높은 비트)
+TYPES = tuple(''.join(pair[(i >> (3 - k)) & 1] for k, pair in enumerate(PAIRS)) for i in range(16))
+TYPE_NAMES = np.array(TYPES)
+BATCH_ROWS = 262_144
+
+
+class BatchResult:
+    """여러 응답자의 채점 결과 (행 단위 배열 + 집단 분포 계산)"""
+
+    def __init__(self, scores, valid):
+        self.scores = scores                                  # (N, 8) 지표별 점수
+        self.valid = valid                                    # (N,) 모든 문항에 올바르게 답한 행
+        self.margins = scores[:, 0::2] - scores[:, 1::2]      # (N, 4) 앞 글자 - 뒤 글자
+        bits = (self.margins < 0).astype(np.int8)
+        self.type_index = bits @ np.array([8, 4, 2, 1], dtype=np.int8)
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def types(self):
+        """행별 유형 문자열 (잘못된 응답 행은 빈 문자열)"""
+        return np.where(self.valid, TYPE_NAMES[self.type_index], '')
+
+    def type_counts(self):
+        """16개 유형별 응답자 수 (올바른 행만)"""
+        counts = np.bincount(self.type_index[self.valid], minlength=len(TYPES))
+        return pd.Series(counts, index=list(TYPES), name='응답자 수')
+
+    def axis_counts(self):
+        """지표 쌍별 앞/뒤 글자 응답자 수 (행: 'E/I' 등, 열: 앞 글자, 뒤 글자)"""
+        margins = self.margins[self.valid]
+        first = (margins >= 0).sum(axis=0)
+        return pd.DataFrame(
+            {'앞 글자': first, '뒤 글자': len(margins) - first},
+            index=[f'{a}/{b}' for a, b in PAIRS]
+        )
+
+    def margin_distribution(self):
+        """지표 쌍별 점수 차(margin) 값의 분포 (행: 점수 차, 열: 'E/I' 등)"""
+        margins = self.margins[self.valid]
+        columns = {}
+        for k, (a, b) in enumerate(PAIRS):
+            values, counts = np.unique(margins[:, k], return_counts=True)
+            columns[f'{a}/{b}'] = pd.Series(counts, index=values)
+        return pd.DataFrame(columns).fillna(0).astype(np.int64).sort_index()
+
+    def group_type_counts(self, groups):
+        """집단(코호트) x 유형 응답자 수 (groups: 행별 집단 이름)"""
+        groups = np.asarray(groups)[self.valid]
+        return pd.crosstab(groups, TYPE_NAMES[self.type_index[self.valid]], rownames=['집단'], colnames=['유형']).reindex(columns=list(TYPES), fill_value=0)
+
+    def to_frame(self):
+        """행별 유형과 지표 쌍 점수 차 표"""
+        frame = pd.DataFrame(self.margins, columns=[f'{a}-{b}' for a, b in PAIRS])
+        frame.insert(0, '유형', self.types)
+        return frame
+
+
+class MbtiEngine:
+    """문항 표를 컴파일한 가중치 행렬로 응답을 채점"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.option_texts = [[opt['text'] for opt in q['options']] for q in questions]
+        self.option_counts = np.array([len(texts) for texts in self.option_texts])
+        self.n_questions = len(questions)
+        self.n_options = int(self.option_counts.max())
+
+        weights = np.zeros((self.n_questions, self.n_options, len(AXES)), dtype=np.float64)
+        for qi, q in enumerate(questions):
+            for oi, opt in enumerate(q['options']):
+                weights[qi, oi, AXIS_INDEX[opt['score_type']]] += opt['score_value']
+        # 점수가 모두 정수면 정수 점수로 돌려줌 (float32 행렬 곱은 이 범위에서 정확)
+        self.integral = bool(np.all(weights == np.round(weights)))
+        self.weights = weights.reshape(-1, len(AXES)).astype(np.float32)
+        self._offsets = np.arange(self.n_questions) * self.n_options
+
+    def score(self, answers, batch_rows=BATCH_ROWS):
+        """
+        응답 행렬 (N, 문항 수)의 선택지 번호(0부터)를 채점합니다.
+        범위를 벗어나거나 비어 있는(음수) 답이 있는 행은 valid=False로 표시하고 점수는 0입니다.
+        """
+        answers = np.asarray(answers)
+        if answers.ndim != 2 or answers.shape[1] != self.n_questions:
+            raise ValueError(f"응답은 문항 {self.n_questions}개짜리 행이어야 합니다. (받은 모양: {answers.shape})")
+        valid = np.all((answers >= 0) & (answers < self.option_counts), axis=1)
+        scores = np.zeros((len(answers), len(AXES)), dtype=np.float32)
+        for start in range(0, len(answers), batch_rows):
+            chunk = answers[start:start + batch_rows]
+            ok = valid[start:start + batch_rows]
+            onehot = np.zeros((len(chunk), len(self.weights)), dtype=np.float32)
+            columns = np.where(ok[:, None], chunk, 0) + self._offsets
+            onehot[np.arange(len(chunk))[:, None], columns] = 1
+            onehot[~ok] = 0
+            np.matmul(onehot, self.weights, out=scores[start:start + len(chunk)])
+        if self.integral:
+            scores = scores.astype(np.int32)
+        return BatchResult(scores, valid)
+
+    def score_one(self, answers):
+        """한 사람의 응답 [선택지 번호] -> (유형, {지표: 점수})"""
+        result = self.score(np.asarray([answers]))
+        if not result.valid[0]:
+            raise ValueError("모든 질문에 올바른 답을 골라야 합니다.")
+        return str(result.types[0]), {axis: result.scores[0, i].item() for i, axis in enumerate(AXES)}
+
+    def answer_columns(self, columns):
+        """
+        CSV 머리글에서 문항 컬럼 찾기: 'question_0'.. (페이지의 세션 키) 또는 'q1'.. 순서.
+        둘 다 없으면 None
+        """
+        lowered = {str(c).strip().lower(): c for c in columns}
+        for names in ([f'question_{i}' for i in range(self.n_questions)],
+                      [f'q{i + 1}' for i in range(self.n_questions)]):
+            if all(name in lowered for name in names):
+                return [lowered[name] for name in names]
+        return None
+
+    def read_answers(self, source, one_based=False):
+        """
+        응답 CSV(source: 경로, 바이트 또는 파일 객체)를 (응답 행렬, 나머지 컬럼 표)로 읽습니다.
+        문항 컬럼 이름이 없으면 숫자 컬럼이 정확히 문항 수만큼일 때만 그 컬럼들을 순서대로 문항으로 봅니다
+        (번호/학번 같은 숫자 컬럼이 더 있으면 어느 것이 답인지 알 수 없으므로 ValueError). 빈 답은 -1.
+        """
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+        df = pd.read_csv(source, encoding_errors='replace')
+        columns = self.answer_columns(df.columns)
+        if columns is None:
+            numeric = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+            if len(numeric) != self.n_questions:
+                found = f"숫자 컬럼이 {len(numeric)}개여서 답 컬럼을 고를 수 없습니다. " if numeric else ""
+                raise ValueError(
+                    f"{found}문항 {self.n_questions}개의 답 컬럼(question_0.. 또는 q1..)이 있는 CSV만 채점할 수 있습니다."
+                )
+            columns = numeric
+        answers = df[columns].apply(pd.to_numeric, errors='coerce').fillna(-1).to_numpy(np.int64)
+        if one_based:
+            answers = np.where(answers >= 0, answers - 1, -1)
+        return answers, df.drop(columns=columns)
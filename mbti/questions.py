@@ -0,0 +1,86 @@
+"""
+MBTI 문항과 유형 설명
+"""
+
+# MBTI 질문 및 답변에 따른 점수 정의
+# 각 질문은 E/I, S/N, T/F, J/P 중 하나의 지표에 영향을 줍니다.
+# 'score_type': 'E' 또는 'I' 등 해당 지표의 긍정적인 방향
+# 'score_value': 해당 답변 선택 시 부여되는 점수 (양수 또는 음수)
+questions = [
+    {
+        "question": "파티에서 새로운 사람들과 어울리는 것을 즐기시나요?",
+        "options": [
+            {"text": "네, 매우 즐깁니다.", "score_type": "E", "score_value": 1},
+            {"text": "아니요, 주로 아는 사람들과 이야기합니다.", "score_type": "I", "score_value": 1},
+        ]
+    },
+    {
+        "question": "활동적인 모임보다 조용한 시간을 선호하시나요?",
+        "options": [
+            {"text": "네, 조용한 시간이 좋습니다.", "score_type": "I", "score_value": 1},
+            {"text": "아니요, 활동적인 것이 좋습니다.", "score_type": "E", "score_value": 1},
+        ]
+    },
+    {
+        "question": "실용적이고 현실적인 정보를 선호하시나요?",
+        "options": [
+            {"text": "네, 구체적인 사실이 중요합니다.", "score_type": "S", "score_value": 1},
+            {"text": "아니요, 아이디어나 개념에 관심이 많습니다.", "score_type": "N", "score_value": 1},
+        ]
+    },
+    {
+        "question": "미래의 가능성과 아이디어에 더 관심이 많으신가요?",
+        "options": [
+            {"text": "네, 상상하고 예측하는 것을 좋아합니다.", "score_type": "N", "score_value": 1},
+            {"text": "아니요, 현재에 집중하는 편입니다.", "score_type": "S", "score_value": 1},
+        ]
+    },
+    {
+        "question": "결정을 내릴 때 논리와 객관성을 중요하게 생각하시나요?",
+        "options": [
+            {"text": "네, 합리적인 분석이 우선입니다.", "score_type": "T", "score_value": 1},
+            {"text": "아니요, 사람들과의 관계나 가치를 고려합니다.", "score_type": "F", "score_value": 1},
+        ]
+    },
+    {
+        "question": "타인의 감정과 조화를 고려하여 결정하시나요?",
+        "options": [
+            {"text": "네, 주변 사람들의 감정을 중요하게 생각합니다.", "score_type": "F", "score_value": 1},
+            {"text": "아니요, 원칙과 기준에 따라 결정합니다.", "score_type": "T", "score_value": 1},
+        ]
+    },
+    {
+        "question": "계획을 세우고 체계적으로 일을 처리하는 것을 선호하시나요?",
+        "options": [
+            {"text": "네, 미리 계획하는 것이 편합니다.", "score_type": "J", "score_value": 1},
+            {"text": "아니요, 유연하게 상황에 맞춰 움직입니다.", "score_type": "P", "score_value": 1},
+        ]
+    },
+    {
+        "question": "자유롭고 유연하게 상황에 맞춰 행동하는 것을 좋아하시나요?",
+        "options": [
+            {"text": "네, 즉흥적인 것을 즐깁니다.", "score_type": "P", "score_value": 1},
+            {"text": "아니요, 정해진 틀 안에서 일하는 것이 좋습니다.", "score_type": "J", "score_value": 1},
+        ]
+    },
+]
+
+# MBTI 유형별 설명 (간단하게)
+mbti_descriptions = {
+    "ISTJ": "청렴결백한 논리주의자",
+    "ISFJ": "용감한 수호자",
+    "INFJ": "선의의 옹호자",
+    "INTJ": "용의주도한 전략가",
+    "ISTP": "만능 재주꾼",
+    "ISFP": "호기심 많은 예술가",
+    "INFP": "열정적인 중재자",
+    "INTP": "논리적인 사색가",
+    "ESTP": "모험을 즐기는 사업가",
+    "ESFP": "자유로운 영혼의 연예인",
+    "ENFP": "재기발랄한 활동가",
+    "ENTP": "뜨거운 논쟁을 즐기는 변론가",
+    "ESTJ": "엄격한 관리자",
+    "ESFJ": "사교적인 외교관",
+    "ENFJ": "정의로운 사회운동가",
+    "ENTJ": "대담한 통솔자",
+}
@@ -0,0 +1,192 @@
+"""
+MBTI 응답 누적 저장소
+
+제출된 결과를 세션 상태 대신 로컬 SQLite(WAL) 파일에 추가만 하는(append-only) 표로 저장하고,
+같은 트랜잭션에서 유형별/글자별/시간 구간별 카운터를 UPSERT로 올려 둡니다.
+- 분포 패널은 카운터 표(유형 16행 + 글자 8행 + 구간 수)만 읽으므로 제출이 아무리 쌓여도 다시 훑지 않고,
+  새 제출이 없으면 메모리의 마지막 결과를 그대로 돌려줍니다.
+- 여러 세션의 제출은 큐에 넣고 바로 돌아오며, 쓰기 스레드 하나가 모인 만큼을 한 트랜잭션으로 씁니다
+  (세션끼리 쓰기 잠금을 두고 기다리지 않고, 커밋 수도 제출 수보다 적음).
+- WAL 모드라 읽기는 쓰기를 막지 않고 쓰기도 읽기를 막지 않습니다.
+- 쓰지 못한 묶음은 버리지 않고 간격을 늘려 가며(최대 MAX_BACKOFF초) 성공할 때까지 다시 씁니다.
+  종료할 때는 남은 제출을 FLUSH_TIMEOUT초까지만 기다립니다.
+"""
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from mbti.engine import PAIRS, TYPES
+from shared.paths import data_dir
+
+DEFAULT_PATH = data_dir('mbti.sqlite3')
+BUCKET_SECONDS = 3600  # 시간 구간 크기 (1시간)
+MAX_BATCH = 1000       # 한 트랜잭션에 쓰는 최대 제출 수
+WRITE_RETRIES = 5      # 이만큼 연속으로 실패하면 last_error로 알림 (그 뒤에도 계속 다시 시도)
+MAX_BACKOFF = 5.0      # 다시 쓰기 전에 기다리는 최대 시간 (초)
+FLUSH_TIMEOUT = 10.0   # 프로세스 종료 때 남은 제출을 기다리는 최대 시간 (초)
+
+
+class SubmissionStore:
+    """추가 전용 제출 표와 증분 카운터를 가진 SQLite 저장소 (쓰기는 백그라운드 스레드 하나)"""
+
+    def __init__(self, path=DEFAULT_PATH, bucket_seconds=BUCKET_SECONDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.bucket_seconds = bucket_seconds
+        self._queue = queue.Queue()
+        self._cached = None
+        self.last_error = None  # 계속 쓰지 못하고 있는 묶음의 오류 (페이지에서 경고용, 쓰고 나면 None)
+        self._read_lock = threading.Lock()
+        self._reader = self._connect(check_same_thread=False)
+        self._create_schema()
+        self._writer = threading.Thread(target=self._write_loop, name='mbti-store-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.flush, FLUSH_TIMEOUT)
+
+    def _connect(self, check_same_thread=True):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=check_same_thread)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _create_schema(self):
+        with self._reader as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    id INTEGER PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    type TEXT NOT NULL,
+                    scores TEXT NOT NULL,
+                    answers TEXT NOT NULL
+                )
+            """)
+            conn.execute('CREATE TABLE IF NOT EXISTS type_counts (type TEXT PRIMARY KEY, count INTEGER NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS letter_counts (letter TEXT PRIMARY KEY, count INTEGER NOT NULL)')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bucket_counts (
+                    bucket INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, type)
+                )
+            """)
+
+    # ---------------------------------------------------------------- 쓰기
+
+    def submit(self, mbti_type, scores, answers, created_at=None):
+        """제출 하나를 쓰기 큐에 넣고 바로 돌아옴 (커밋은 쓰기 스레드가 모아서)"""
+        if mbti_type not in TYPES:
+            raise ValueError(f"알 수 없는 MBTI 유형입니다: {mbti_type}")
+        self._queue.put((time.time() if created_at is None else created_at, mbti_type,
+                         json.dumps(scores), json.dumps(list(answers))))
+
+    def flush(self, timeout=None):
+        """
+        큐에 있는 제출이 모두 커밋될 때까지 기다림 (timeout초가 지나거나 쓰기 스레드가 멈췄으면 그만 기다림).
+        반환값: 모두 커밋되었으면 True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if not self._writer.is_alive():
+                    return False
+                wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(wait)
+        return True
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            attempt = 0
+            while True:
+                try:
+                    self._write(conn, batch)
+                    self.last_error = None
+                    break
+                except sqlite3.Error as e:
+                    # 잠금 등으로 실패해도 묶음을 버리지 않고 간격을 늘려 다시 씀
+                    attempt += 1
+                    if attempt >= WRITE_RETRIES:
+                        self.last_error = e
+                    time.sleep(min(0.1 * 2 ** attempt, MAX_BACKOFF))
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, conn, rows):
+        types, letters, buckets = {}, {}, {}
+        for created_at, mbti_type, _, _ in rows:
+            types[mbti_type] = types.get(mbti_type, 0) + 1
+            for letter in mbti_type:
+                letters[letter] = letters.get(letter, 0) + 1
+            key = (int(created_at // self.bucket_seconds) * self.bucket_seconds, mbti_type)
+            buckets[key] = buckets.get(key, 0) + 1
+        with conn:
+            conn.executemany('INSERT INTO submissions (created_at, type, scores, answers) VALUES (?, ?, ?, ?)', rows)
+            conn.executemany(
+                'INSERT INTO type_counts (type, count) VALUES (?, ?) '
+                'ON CONFLICT(type) DO UPDATE SET count = count + excluded.count',
+                types.items()
+            )
+            conn.executemany(
+                'INSERT INTO letter_counts (letter, count) VALUES (?, ?) '
+                'ON CONFLICT(letter) DO UPDATE SET count = count + excluded.count',
+                letters.items()
+            )
+            conn.executemany(
+                'INSERT INTO bucket_counts (bucket, type, count) VALUES (?, ?, ?) '
+                'ON CONFLICT(bucket, type) DO UPDATE SET count = count + excluded.count',
+                [(bucket, mbti_type, count) for (bucket, mbti_type), count in buckets.items()]
+            )
+
+    # ---------------------------------------------------------------- 조회
+
+    def aggregates(self, recent_buckets=24):
+        """
+        누적 분포 {'total', 'types': 유형별 수, 'letters': 글자별 수, 'buckets': 최근 구간 x 유형 수}.
+        카운터 표만 읽으며, 이 프로세스나 다른 연결의 커밋이 없었으면 마지막 결과를 재사용합니다.
+        """
+        with self._read_lock:
+            # data_version은 다른 연결(쓰기 스레드, 다른 프로세스)이 커밋하면 바뀜
+            key = (self._reader.execute('PRAGMA data_version').fetchone()[0], recent_buckets)
+            if self._cached is not None and self._cached[0] == key:
+                return self._cached[1]
+            conn = self._reader
+            conn.execute('BEGIN')  # 세 표를 같은 시점으로 읽음
+            type_counts = dict(conn.execute('SELECT type, count FROM type_counts').fetchall())
+            letter_counts = dict(conn.execute('SELECT letter, count FROM letter_counts').fetchall())
+            rows = conn.execute(
+                'SELECT bucket, type, count FROM bucket_counts WHERE bucket >= '
+                '(SELECT COALESCE(MAX(bucket), 0) FROM bucket_counts) - ?',
+                ((recent_buckets - 1) * self.bucket_seconds,)
+            ).fetchall()
+            conn.commit()
+        types = pd.Series([type_counts.get(t, 0) for t in TYPES], index=list(TYPES), name='응답자 수')
+        letters = pd.DataFrame(
+            {'앞 글자': [letter_counts.get(a, 0) for a, _ in PAIRS], '뒤 글자': [letter_counts.get(b, 0) for _, b in PAIRS]},
+            index=[f'{a}/{b}' for a, b in PAIRS]
+        )
+        buckets = pd.DataFrame(rows, columns=['bucket', 'type', 'count'])
+        buckets = buckets.pivot_table(index='bucket', columns='type', values='count', aggfunc='sum', fill_value=0)
+        buckets.index = pd.to_datetime(buckets.index, unit='s', utc=True).tz_convert('Asia/Seoul')
+        result = {'total': int(types.sum()), 'types': types, 'letters': letters, 'buckets': buckets}
+        with self._read_lock:
+            self._cached = (key, result)
+        return result
+
+    def __len__(self):
+        with self._read_lock:
+            return self._reader.execute('SELECT COUNT(*) FROM submissions').fetchone()[0]
@@ -1,122 +1,35 @@
 import streamlit as st
+import pandas as pd
 
-# MBTI 질문 및 답변에 따른 점수 정의
-# 각 질문은 E/I, S/N, T/F, J/P 중 하나의 지표에 영향을 줍니다.
-# 'score_type': 'E' 또는 'I' 등 해당 지표의 긍정적인 방향
-# 'score_value': 해당 답변 선택 시 부여되는 점수 (양수 또는 음수)
-questions = [
-    {
-        "question": "파티에서 새로운 사람들과 어울리는 것을 즐기시나요?",
-        "options": [
-            {"text": "네, 매우 즐깁니다.", "score_type": "E", "score_value": 1},
-            {"text": "아니요, 주로 아는 사람들과 이야기합니다.", "score_type": "I", "score_value": 1},
-        ]
-    },
-    {
-        "question": "활동적인 모임보다 조용한 시간을 선호하시나요?",
-        "options": [
-            {"text": "네, 조용한 시간이 좋습니다.", "score_type": "I", "score_value": 1},
-            {"text": "아니요, 활동적인 것이 좋습니다.", "score_type": "E", "score_value": 1},
-        ]
-    },
-    {
-        "question": "실용적이고 현실적인 정보를 선호하시나요?",
-        "options": [
-            {"text": "네, 구체적인 사실이 중요합니다.", "score_type": "S", "score_value": 1},
-            {"text": "아니요, 아이디어나 개념에 관심이 많습니다.", "score_type": "N", "score_value": 1},
-        ]
-    },
-    {
-        "question": "미래의 가능성과 아이디어에 더 관심이 많으신가요?",
-        "options": [
-            {"text": "네, 상상하고 예측하는 것을 좋아합니다.", "score_type": "N", "score_value": 1},
-            {"text": "아니요, 현재에 집중하는 편입니다.", "score_type": "S", "score_value": 1},
-        ]
-    },
-    {
-        "question": "결정을 내릴 때 논리와 객관성을 중요하게 생각하시나요?",
-        "options": [
-            {"text": "네, 합리적인 분석이 우선입니다.", "score_type": "T", "score_value": 1},
-            {"text": "아니요, 사람들과의 관계나 가치를 고려합니다.", "score_type": "F", "score_value": 1},
-        ]
-    },
-    {
-        "question": "타인의 감정과 조화를 고려하여 결정하시나요?",
-        "options": [
-            {"text": "네, 주변 사람들의 감정을 중요하게 생각합니다.", "score_type": "F", "score_value": 1},
-            {"text": "아니요, 원칙과 기준에 따라 결정합니다.", "score_type": "T", "score_value": 1},
-        ]
-    },
-    {
-        "question": "계획을 세우고 체계적으로 일을 처리하는 것을 선호하시나요?",
-        "options": [
-            {"text": "네, 미리 계획하는 것이 편합니다.", "score_type": "J", "score_value": 1},
-            {"text": "아니요, 유연하게 상황에 맞춰 움직입니다.", "score_type": "P", "score_value": 1},
-        ]
-    },
-    {
-        "question": "자유롭고 유연하게 상황에 맞춰 행동하는 것을 좋아하시나요?",
-        "options": [
-            {"text": "네, 즉흥적인 것을 즐깁니다.", "score_type": "P", "score_value": 1},
-            {"text": "아니요, 정해진 틀 안에서 일하는 것이 좋습니다.", "score_type": "J", "score_value": 1},
-        ]
-    },
-]
-
-# MBTI 유형별 설명 (간단하게)
-mbti_descriptions = {
-    "ISTJ": "청렴결백한 논리주의자",
-    "ISFJ": "용감한 수호자",
-    "INFJ": "선의의 옹호자",
-    "INTJ": "용의주도한 전략가",
-    "ISTP": "만능 재주꾼",
-    "ISFP": "호기심 많은 예술가",
-    "INFP": "열정적인 중재자",
-    "INTP": "논리적인 사색가",
-    "ESTP": "모험을 즐기는 사업가",
-    "ESFP": "자유로운 영혼의 연예인",
-    "ENFP": "재기발랄한 활동가",
-    "ENTP": "뜨거운 논쟁을 즐기는 변론가",
-    "ESTJ": "엄격한 관리자",
-    "ESFJ": "사교적인 외교관",
-    "ENFJ": "정의로운 사회운동가",
-    "ENTJ": "대담한 통솔자",
-}
-
-def calculate_mbti(scores):
-    """
-    점수를 바탕으로 MBTI 유형을 계산합니다.
-    """
-    mbti_type = ""
-
-    # E/I 지표
-    if scores['E'] >= scores['I']:
-        mbti_type += "E"
-    else:
-        mbti_type += "I"
+from mbti.engine import MbtiEngine
+from mbti.questions import mbti_descriptions, questions
+from mbti.store import SubmissionStore
+from shared.data import memoize, read_upload
+from shared.trace import finish_trace, span, start_trace
 
-    # S/N 지표
-    if scores['S'] >= scores['N']:
-        mbti_type += "S"
-    else:
-        mbti_type += "N"
+# Streamlit 앱 시작
+st.set_page_config(page_title="역동적인 MBTI 분석", layout="centered")
+start_trace('00_mbti')
 
-    # T/F 지표
-    if scores['T'] >= scores['F']:
-        mbti_type += "T"
-    else:
-        mbti_type += "F"
+@st.cache_resource
+def get_engine():
+    """문항 표를 가중치 행렬로 한 번만 컴파일 (모든 세션이 공유)"""
+    return MbtiEngine(questions)
 
-    # J/P 지표
-    if scores['J'] >= scores['P']:
-        mbti_type += "J"
-    else:
-        mbti_type += "P"
+@memoize('mbti_batch', spinner="🧮 응답 파일을 채점하는 중...")
+def score_file(file_hash, one_based, _data):
+    """응답 CSV 파일 내용별로 한 번만 채점 (결과 배열은 모든 세션이 공유, 공유 캐시 예산 안에서 보관)"""
+    with span('parse', '응답 CSV'):
+        answers, extra = get_engine().read_answers(_data, one_based)
+    return get_engine().score(answers), extra
 
-    return mbti_type
+@st.cache_resource
+def get_store():
+    """제출 누적 저장소 (모든 세션이 쓰기 스레드 하나를 공유)"""
+    return SubmissionStore()
 
-# Streamlit 앱 시작
-st.set_page_config(page_title="역동적인 MBTI 분석", layout="centered")
+engine = get_engine()
+store = get_store()
 
 st.title("🌟 역동적인 MBTI 분석 페이지 🌟")
 st.markdown("아래 질문에 답하여 당신의 MBTI 유형을 알아보세요!")
@@ -137,17 +50,19 @@ for i, q_data in enumerate(questions):
     
     # st.radio를 사용하여 옵션을 표시합니다.
     # default 값을 None으로 설정하여 사용자가 선택하지 않은 상태로 시작합니다.
-    # on_change 콜백 함수를 사용하여 선택이 변경될 때마다 점수를 업데이트합니다.
+    # 선택지 번호를 그대로 값으로 쓰고 문구는 엔진에 컴파일해 둔 목록에서 보여줍니다.
+    texts = engine.option_texts[i]
     selected_option_index = st.radio(
         "선택하세요:",
-        options=[opt['text'] for opt in q_data['options']],
+        options=range(len(texts)),
+        format_func=texts.__getitem__,
         key=key,
         index=st.session_state.answers.get(key, None) # 이전에 선택된 값 로드
     )
 
     # 사용자가 선택한 옵션의 인덱스를 저장합니다.
     if selected_option_index is not None:
-        st.session_state.answers[key] = [opt['text'] for opt in q_data['options']].index(selected_option_index)
+        st.session_state.answers[key] = selected_option_index
 
 # 모든 질문에 대한 답변이 완료되었는지 확인
 all_answered = all(f"question_{i}" in st.session_state.answers for i in range(len(questions)))
@@ -156,16 +71,14 @@ if st.button("✨ 결과 보기 ✨", use_container_width=True):
     if not all_answered:
         st.warning("모든 질문에 답변해주세요!")
     else:
-        # 점수를 다시 계산합니다. (on_change에서 실시간으로 업데이트되지만, 버튼 클릭 시 최종 확인)
-        st.session_state.scores = {'E': 0, 'I': 0, 'S': 0, 'N': 0, 'T': 0, 'F': 0, 'J': 0, 'P': 0}
-        for i, q_data in enumerate(questions):
-            key = f"question_{i}"
-            selected_idx = st.session_state.answers[key]
-            selected_option = q_data['options'][selected_idx]
-            st.session_state.scores[selected_option['score_type']] += selected_option['score_value']
+        # 일괄 채점과 같은 엔진으로 점수와 유형을 계산합니다.
+        answers = [st.session_state.answers[f"question_{i}"] for i in range(len(questions))]
+        mbti_result, st.session_state.scores = engine.score_one(answers)
 
-        # MBTI 유형 계산
-        mbti_result = calculate_mbti(st.session_state.scores)
+        # 같은 답으로 버튼을 다시 눌렀을 때는 한 번만 저장
+        if st.session_state.get('submitted_answers') != answers:
+            store.submit(mbti_result, st.session_state.scores, answers)
+            st.session_state.submitted_answers = answers
 
         st.markdown("---")
         st.header(f"🎉 당신의 MBTI 유형은 바로... **{mbti_result}** 입니다! 🎉")
@@ -182,3 +95,72 @@ if st.button("✨ 결과 보기 ✨", use_container_width=True):
             st.metric(label="사고(T) vs 감정(F)", value=f"T: {st.session_state.scores['T']}, F: {st.session_state.scores['F']}")
         with col4:
             st.metric(label="판단(J) vs 인식(P)", value=f"J: {st.session_state.scores['J']}, P: {st.session_state.scores['P']}")
+
+# 📊 지금까지 제출된 결과 분포 (저장소의 누적 카운터만 읽음)
+st.markdown("---")
+st.subheader("📊 지금까지의 응답 분포")
+with span('fetch', '누적 분포'):
+    summary = store.aggregates()
+if store.last_error is not None:
+    st.warning(f"⚠️ 일부 결과를 아직 저장하지 못해 다시 시도하는 중입니다: {store.last_error}")
+if summary['total'] == 0:
+    st.info("👆 아직 제출된 결과가 없습니다.")
+else:
+    st.caption(f"👥 누적 {summary['total']:,}명")
+    st.bar_chart(summary['types'])
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("🧭 지표별 분포")
+        st.dataframe(summary['letters'])
+    with col2:
+        st.write("⏱️ 최근 시간대별 제출 수")
+        st.line_chart(summary['buckets'].sum(axis=1).rename("제출 수"))
+
+# 📦 응답 파일 일괄 채점 (코호트 단위)
+st.markdown("---")
+st.subheader("📦 응답 파일 일괄 채점")
+st.caption(f"문항 {engine.n_questions}개의 선택지 번호 컬럼(question_0.. 또는 q1..)이 있는 CSV. 다른 컬럼(예: 반, 기수)은 집단으로 묶을 때 사용합니다.")
+batch_file = st.file_uploader("응답 CSV 파일", type=["csv"])
+if batch_file is not None:
+    one_based = st.checkbox("선택지 번호가 1부터 시작합니다")
+    try:
+        data, file_hash = read_upload(batch_file)
+        result, extra = score_file(file_hash, one_based, data)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+
+    valid_count = int(result.valid.sum())
+    st.success(f"✅ {len(result):,}명 중 {valid_count:,}명을 채점했습니다."
+               + (f" (답이 비었거나 범위를 벗어난 {len(result) - valid_count:,}명은 제외)" if valid_count < len(result) else ""))
+
+    with span('compute', '집단 분포'):
+        counts = result.type_counts()
+        axis_counts = result.axis_counts()
+        margins = result.margin_distribution()
+    st.bar_chart(counts)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("🧭 지표별 분포")
+        st.dataframe(axis_counts)
+    with col2:
+        st.write("📏 지표별 점수 차 분포")
+        st.dataframe(margins)
+
+    if len(extra.columns):
+        group_col = st.selectbox("👥 집단별로 보기", [None] + list(extra.columns),
+                                 format_func=lambda c: "(선택 안 함)" if c is None else str(c))
+        if group_col is not None:
+            with span('compute', '집단별 유형'):
+                group_counts = result.group_type_counts(extra[group_col].astype(str).to_numpy())
+            st.dataframe(group_counts)
+
+    # CSV는 다운로드를 누를 때만 만듦 (100만 행이면 매번 만들기에는 무거움)
+    st.download_button(
+        "💾 채점 결과 CSV 다운로드",
+        lambda: pd.concat([extra.reset_index(drop=True), result.to_frame()], axis=1).to_csv(index=False).encode("utf-8-sig"),
+        file_name="mbti_results.csv",
+        mime="text/csv"
+    )
+
+finish_trace()
@@ -1,26 +1,173 @@
 import streamlit as st
 import folium
+import pandas as pd
+from pathlib import Path
 from streamlit_folium import st_folium
 
+from bookmarks.render import MAX_MARKERS, cluster_layer, marker_layer, pad_bounds, parse_bounds, view_bounds
+from bookmarks.store import BookmarkStore
+from population.choropleth import choropleth_layer, palette_for, payload_size, quantile_bins, region_values, value_payload
+from population.geometry import level_for_zoom
+from shared.data import age_index as get_age_index, geometry as get_geometry, memoize, read_file, read_upload
+from shared.data import region_tree as get_region_tree
+from shared.trace import finish_trace, span, start_trace
+
+start_trace('03_folium')
 st.title("🗺️ 나만의 위치 북마크 지도")
 
 st.write("아래에 장소 정보를 입력하고 지도에 표시해보세요!")
 
+DEFAULT_CENTER = (37.5665, 126.9780)
+DEFAULT_ZOOM = 6
+MAP_WIDTH, MAP_HEIGHT = 700, 500
+POPULATION_FILE = Path(__file__).resolve().parent / 'people_sum.cvs'
+DEFAULT_GEOJSON = Path(__file__).resolve().parent / 'regions.geojson'
+
+@st.cache_resource
+def get_store():
+    """SQLite 북마크 저장소 (새로고침해도 남고 모든 세션이 공유)"""
+    return BookmarkStore()
+
+store = get_store()
+
+@memoize('choropleth_values')
+def get_choropleth_values(population_hash, geometry_key, start, end, _population, _geometry):
+    """(인구 파일, 경계 파일, 연령 범위)별 지역 값과 색 구간 (경계와 따로 캐시)"""
+    tree, age_index = _population
+    values = region_values(tree, age_index, _geometry.codes, start, end)
+    bins = quantile_bins(values)
+    return value_payload(_geometry.codes, values, bins), bins.tolist()
+
 # 장소 입력
 place = st.text_input("장소 이름", value="서울 시청")
 lat = st.number_input("위도 (Latitude)", value=37.5665, format="%.6f")
 lon = st.number_input("경도 (Longitude)", value=126.9780, format="%.6f")
 
-# 세션 상태 저장
-if "places" not in st.session_state:
-    st.session_state.places = []
-
 if st.button("지도에 추가하기"):
-    st.session_state.places.append((place, lat, lon))
+    try:
+        store.add(place, lat, lon)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+
+# 📥 CSV 일괄 가져오기
+with st.expander("📥 CSV로 한 번에 가져오기"):
+    st.caption("이름(name), 위도(lat), 경도(lon/lng) 컬럼이 있는 CSV 파일")
+    csv_file = st.file_uploader("북마크 CSV 파일", type=["csv"])
+    if csv_file is not None and st.button("가져오기"):
+        try:
+            added, skipped = store.import_csv(csv_file)
+            st.success(f"✅ {added:,}개를 가져왔습니다." + (f" (좌표가 잘못된 {skipped:,}개는 건너뜀)" if skipped else ""))
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+# 🎨 인구 단계구분도 (행정구역 경계 GeoJSON + people_sum.cvs)
+choropleth = None
+with st.expander("🎨 인구 단계구분도"):
+    show_choropleth = st.checkbox("행정구역을 연령 범위 인구로 색칠하기")
+    geojson_file = st.file_uploader(
+        "행정구역 경계 GeoJSON (행정기관코드 속성 필요, 업로드하지 않으면 pages/regions.geojson 사용)",
+        type=["geojson", "json"]
+    )
+    if show_choropleth:
+        try:
+            if geojson_file is None and not DEFAULT_GEOJSON.exists():
+                raise ValueError("행정구역 경계 GeoJSON 파일을 업로드하세요.")
+            # 경계, 인구 트리와 누적합 인덱스는 공유 캐시에서 (파일 내용 해시별로 한 번만 생성)
+            geo_data, geo_hash = read_upload(geojson_file) if geojson_file else read_file(DEFAULT_GEOJSON)
+            geometry = get_geometry(geo_hash, geo_data)
+            population_data, population_hash = read_file(POPULATION_FILE)
+            population = get_region_tree(population_hash, population_data), get_age_index(population_hash, population_data)
+        except (OSError, ValueError) as e:
+            st.error(f"❌ {e}")
+        else:
+            age_index = population[1]
+            start, end = st.slider("연령 범위", age_index.min_age, age_index.max_age,
+                                   (age_index.min_age, age_index.max_age))
+            if age_index.snap_range(start, end) != (start, end):
+                start, end = age_index.snap_range(start, end)
+                st.caption(f"ℹ️ 인구 파일의 연령 구간에 맞춰 {start}~{end}세 범위로 계산합니다.")
+            payload, bins = get_choropleth_values(population_hash, geometry.key, start, end, population, geometry)
+            choropleth = geometry, payload, bins
+            st.caption(f"🔗 경계 {len(geometry.codes):,}개 중 {len(payload):,}개 지역을 인구 파일과 연결했습니다.")
 
 # 지도 그리기
-m = folium.Map(location=[37.5665, 126.9780], zoom_start=6)
-for name, lat, lon in st.session_state.places:
-    folium.Marker([lat, lon], tooltip=name).add_to(m)
+# 기본 지도는 항상 같은 모양으로 만들어 브라우저에서 다시 그려지지 않게 하고,
+# 화면 위치는 center/zoom으로, 마커는 저장소에서 화면 범위로 조회한 것만 레이어로 따로 보냄
+view = st.session_state.get("map_view", {})
+center = view.get("center") or DEFAULT_CENTER
+zoom = view.get("zoom") or DEFAULT_ZOOM
+bounds = parse_bounds(view.get("bounds")) or view_bounds(center, zoom, MAP_WIDTH, MAP_HEIGHT)
+
+# 화면 안 점이 많으면(전국 보기 등) 점을 가져오지 않고 저장소에서 격자 칸별 개수만 받음
+with span('fetch', '북마크'):
+    query_bounds = pad_bounds(bounds)
+    if store.count_in(query_bounds) <= MAX_MARKERS:
+        points, clusters = store.points(query_bounds), None
+    else:
+        points, clusters = None, store.grid_clusters(query_bounds, zoom)
+    total = len(store)
+
+with span('figure', '지도 레이어'):
+    m = folium.Map(location=DEFAULT_CENTER, zoom_start=DEFAULT_ZOOM)
+    layer, info = marker_layer(points, bounds, zoom) if clusters is None else cluster_layer(clusters)
+    info["total"] = total
+    layers = [layer]
+    if choropleth is not None:
+        # 경계는 정적 파일 URL로 (브라우저가 한 번만 받음), 값과 색만 매번 보냄
+        geometry, payload, bins = choropleth
+        static_base = "/" + st.get_option("server.baseUrlPath").strip("/") if st.get_option("server.enableStaticServing") else None
+        if geometry.url(level_for_zoom(zoom)) is None:
+            static_base = None  # 경계 파일이 정적 폴더 밖(APP_DATA_DIR)에 있으면 레이어에 직접 넣음
+        layers.insert(0, choropleth_layer(geometry, level_for_zoom(zoom), payload, palette_for(bins), static_base))
+
+with span('serialize', '지도'):
+    result = st_folium(
+        m,
+        key="bookmark_map",
+        width=MAP_WIDTH,
+        height=MAP_HEIGHT,
+        center=center,
+        zoom=zoom,
+        feature_group_to_add=layers,
+        returned_objects=["bounds", "zoom", "center"]
+    )
+
+# 화면을 옮기면 새 범위로 레이어를 다시 만듦 (브라우저가 아직 범위를 보내지 않은 첫 실행은 제외)
+if result and parse_bounds(result.get("bounds")) is not None:
+    new_center = result.get("center") or {}
+    new_view = {
+        "bounds": result["bounds"],
+        "zoom": result.get("zoom"),
+        "center": (new_center["lat"], new_center["lng"]) if "lat" in new_center else view.get("center")
+    }
+    if new_view != view:
+        st.session_state.map_view = new_view
+        st.rerun()
+
+mode = "개별 마커" if info["mode"] == "markers" else "격자 묶음"
+st.caption(f"📍 전체 {info['total']:,}개 중 화면 안 {info['visible']:,}개 ({mode}, 지도 요소 {info['sent']:,}개 전송)")
+
+if choropleth is not None:
+    legend = " ".join(
+        f'<span style="background:{color};padding:0 8px;margin-right:4px;"></span>{lo:,}~{hi:,}'
+        for color, lo, hi in zip(palette_for(bins), bins[:-1], bins[1:])
+    )
+    st.markdown(f"🎨 {legend}", unsafe_allow_html=True)
+    level = level_for_zoom(zoom)
+    sent = "한 번만 전송" if static_base is not None else "정적 파일 제공이 꺼져 있어 매번 전송"
+    st.caption(f"🗺️ 확대 수준 {level} 경계 {geometry.sizes()[level] / 1024:,.0f}KB ({sent}), "
+               f"값 {payload_size(payload) / 1024:,.1f}KB")
+
+# 📏 입력한 위치에서 가까운 북마크
+st.subheader("📏 가까운 북마크")
+k = st.slider("개수", 1, 20, 5)
+nearest = store.nearest(lat, lon, k)
+if nearest:
+    st.dataframe(pd.DataFrame(
+        [(name, la, lo, round(dist, 3)) for _, name, la, lo, dist in nearest],
+        columns=["장소", "위도", "경도", "거리 (km)"]
+    ), hide_index=True)
+else:
+    st.info("👆 아직 저장된 북마크가 없습니다.")
 
-st_folium(m, width=700, height=500)
+finish_trace()
@@ -1,59 +1,153 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
+from population.charts import age_bar_chart
+from population.widgets import search_region
+from shared.data import age_index as get_age_index, read_upload
+from shared.data import region_tree as get_region_tree, search_index as get_search_index
+from shared.lazy import lazy_import
+from shared.trace import finish_trace, span, start_trace
+
+px = lazy_import('plotly.express')  # 파일을 올려 차트를 그릴 때만 import (population.charts도 같은 방식)
+
+start_trace('04_plotlytest')
 st.title("📊 지역별 연령대 인구 시각화")
 
 # 📁 데이터 업로드
-uploaded_file = st.file_uploader("CSV 파일을 업로드하세요 (cp949 인코딩)", type=["csv"])
+uploaded_file = st.file_uploader("CSV 파일을 업로드하세요 (cp949 또는 utf-8 인코딩)", type=["csv"])
 if uploaded_file:
-    df = pd.read_csv(uploaded_file, encoding="cp949")
-    
-    # 📍 지역 선택
-    region = st.selectbox("📍 지역을 선택하세요", df['행정구역'].unique())
-    
-    # ✅ 연령 구간 컬럼만 필터링
-    age_cols = [col for col in df.columns if '세' in col and '계' in col]
-    age_labels = [col.split('_')[-1] for col in age_cols]  # ex) 0~9세, 10~19세...
-
-    # 🎚️ 연령 구간 슬라이더
+    try:
+        # 파싱 결과, 트리, 인덱스는 공유 캐시에서 (파일 내용 해시별로 한 번만 생성, 모든 세션이 공유)
+        data, file_hash = read_upload(uploaded_file)
+        tree = get_region_tree(file_hash, data)
+        if len(tree) == 0:
+            raise ValueError("행정구역에 10자리 행정기관코드(예: 포곡읍(4146125000))가 있는 파일만 사용할 수 있습니다.")
+        # 🧮 연령 누적합 인덱스 (파일마다 한 번만 생성)
+        age_index = get_age_index(file_hash, data)
+        search_index = get_search_index('population', file_hash, tree)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+
+    # 📍 지역 선택 (검색 또는 코드 트리를 따라 내려가며 선택)
+    node = search_region(tree, search_index)
+    region = node.label
+    st.caption(" > ".join(n.short_name for n in tree.path(node)))
+    if node.derived:
+        st.caption("ℹ️ 파일에 이 지역의 행이 없어 파일에 포함된 하위 지역을 합산한 값입니다.")
+
+    # 🗂️ 연령 구간 체계
+    scheme = st.selectbox("🗂️ 연령 구간 단위를 선택하세요", age_index.schemes(), index=0)
+
+    # 🎚️ 연령 범위 슬라이더
     selected_range = st.slider(
-        "🎚️ 시각화할 연령 구간을 선택하세요",
-        min_value=0,
-        max_value=len(age_labels)-1,
-        value=(0, len(age_labels)-1),
-        format="%d단계"
+        "🎚️ 시각화할 연령 범위를 선택하세요",
+        min_value=age_index.min_age,
+        max_value=age_index.max_age,
+        value=(age_index.min_age, age_index.max_age),
+        format="%d세"
     )
 
-    # 📌 선택 지역 행 가져오기
-    row = df[df['행정구역'] == region].iloc[0]
+    # 범위 끝이 파일의 연령 구간 중간에 걸리면 구간 경계로 넓혀서 계산
+    snapped_range = age_index.snap_range(*selected_range)
+    if snapped_range != tuple(selected_range):
+        st.caption(f"ℹ️ 파일의 연령 구간에 맞춰 {snapped_range[0]}~{snapped_range[1]}세 범위로 계산합니다.")
+    selected_range = snapped_range
 
-    # 🧹 인구 수 전처리
-    selected_labels = age_labels[selected_range[0]:selected_range[1]+1]
-    selected_cols = age_cols[selected_range[0]:selected_range[1]+1]
-    population = row[selected_cols].astype(str).str.replace(',', '').astype(int)
+    # 🧹 선택 범위의 구간별 인구 (누적합의 뺄셈으로 계산)
+    with span('compute', '구간 합계'):
+        buckets = age_index.buckets_in_range(scheme, selected_range[0], selected_range[1])
+        bucket_labels = [b[2] for b in buckets]
+        population = age_index.bucket_sums(buckets, region)
 
-    # 📊 데이터프레임 구성
-    df_plot = pd.DataFrame({
-        "연령구간": selected_labels,
-        "인구수": population
-    })
+        range_total = int(age_index.range_sum(selected_range[0], selected_range[1], region))
+        region_total = int(age_index.total(region))
+    st.metric(
+        f"선택 범위 인구 ({selected_range[0]}~{selected_range[1]}세)",
+        f"{range_total:,}명",
+        f"전체의 {range_total / region_total:.1%}" if region_total else None,
+        delta_color="off"
+    )
 
     # 📈 시각화
-    fig = px.bar(
-        df_plot,
-        x="연령구간",
-        y="인구수",
-        title=f"{region} 지역 연령대별 인구 수",
-        labels={"연령구간": "연령 구간", "인구수": "인구 수"},
-        color_discrete_sequence=["#636EFA"]
-    )
+    with span('figure', '연령대 막대'):
+        fig = age_bar_chart(bucket_labels, population, f"{node.name} 지역 연령대별 인구 수")
+    with span('serialize', '연령대 막대'):
+        st.plotly_chart(fig)
 
-    fig.update_layout(
-        font=dict(family="Malgun Gothic, NanumGothic, sans-serif"),
-        xaxis_tickangle=-45
+    # 🔽 하위 지역 비교 (드릴다운)
+    if node.children:
+        st.subheader(f"🔽 {node.name}의 하위 지역")
+        with span('compute', '하위 지역'):
+            labels = [c.label for c in node.children]
+            child_range = age_index.range_sum(selected_range[0], selected_range[1], labels)
+            child_total = age_index.total(labels)
+            df_children = pd.DataFrame({
+                "지역": [c.short_name for c in node.children],
+                "선택 범위 인구": child_range,
+                "비율": child_range / child_total.clip(min=1) * 100
+            })
+        with span('figure', '하위 지역'):
+            fig_children = px.bar(
+                df_children,
+                x="지역",
+                y="선택 범위 인구",
+                hover_data={"비율": ':.1f'},
+                title=f"하위 지역별 {selected_range[0]}~{selected_range[1]}세 인구",
+                color_discrete_sequence=["#00CC96"]
+            )
+            fig_children.update_layout(
+                font=dict(family="Malgun Gothic, NanumGothic, sans-serif"),
+                xaxis_tickangle=-45
+            )
+        with span('serialize', '하위 지역'):
+            st.plotly_chart(fig_children)
+
+    # 🔀 여러 지역 비교
+    st.subheader("🔀 지역 비교")
+    # 전체 지역 목록 대신 이미 고른 지역 + 검색 결과만 선택지로 보냄
+    # 다른 파일을 올리면 이전 파일의 지역 코드가 남아 있을 수 있으므로 지금 트리에 있는 코드만 유지
+    # (처음이거나 남은 코드가 모두 없어졌으면 지금 지역으로 시작)
+    stored_codes = st.session_state.get("compare_codes")
+    valid_codes = [c for c in stored_codes or [] if tree.get(c) is not None]
+    st.session_state["compare_codes"] = valid_codes if valid_codes or stored_codes == [] else [node.code]
+    compare_query = st.text_input("🔎 비교할 지역 검색", placeholder="예: 수지, ㅅㅈㄱ", key="compare_query")
+    found = [n.code for n in search_index.search(compare_query)] if compare_query.strip() else []
+    compare_codes = st.multiselect(
+        "비교할 지역을 선택하세요",
+        options=list(dict.fromkeys(st.session_state["compare_codes"] + found)),
+        format_func=lambda c: tree.get(c).name,
+        key="compare_codes"
     )
-    st.plotly_chart(fig)
+    if compare_codes:
+        compare_nodes = [tree.get(c) for c in compare_codes]
+        as_share = st.checkbox("지역 인구 대비 비율(%)로 보기", value=len(compare_nodes) > 1)
+        with span('compute', '지역 비교'):
+            sums = age_index.bucket_sums(buckets, [n.label for n in compare_nodes])
+            if as_share:
+                sums = sums / age_index.total([n.label for n in compare_nodes]).clip(min=1)[:, None] * 100
+            df_compare = pd.DataFrame(sums, index=[n.name for n in compare_nodes], columns=bucket_labels)
+            df_compare = df_compare.rename_axis("지역").reset_index().melt(
+                id_vars="지역", var_name="연령구간", value_name="값"
+            )
+        with span('figure', '지역 비교'):
+            fig_compare = px.bar(
+                df_compare,
+                x="연령구간",
+                y="값",
+                color="지역",
+                barmode="group",
+                labels={"값": "비율 (%)" if as_share else "인구 수", "연령구간": "연령 구간"},
+                title="지역별 연령대 인구 비교"
+            )
+            fig_compare.update_layout(
+                font=dict(family="Malgun Gothic, NanumGothic, sans-serif"),
+                xaxis_tickangle=-45
+            )
+        with span('serialize', '지역 비교'):
+            st.plotly_chart(fig_compare)
 
 else:
     st.info("👆 위에서 CSV 파일을 업로드해주세요.")
+
+finish_trace()
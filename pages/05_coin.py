@@ -1,20 +1,36 @@
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objects as go
-import plotly.express as px
+from plotly.colors import qualitative
 from plotly.subplots import make_subplots
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from market.downsample import DEFAULT_MAX_POINTS, line_trace
+from market.export import EXPORT_FORMATS, MAX_CELLS as EXPORT_MAX_CELLS, export_cells, prepare_export
+from market.fetch import TickerCache
+from market.indicators import IndicatorCache
+from market.live import LIVE_INTERVAL, LiveFeed
+from market.panel import DEFAULT_ROOT as PANEL_ROOT, PricePanel, screen
+from market.providers import make_provider
+from market.risk import portfolio_risk
+from market.stats import compute_statistics
+from market.store import PriceStore, TICKER_PATTERN, store_root
+from shared.cache import DATA_CACHE
+from shared.lazy import lazy_import
+from shared.trace import finish_trace, span, start_trace
+
+px = lazy_import('plotly.express')  # 상관계수 히트맵을 그릴 때만 import
+
 # 페이지 설정
 st.set_page_config(
     page_title="글로벌 시가총액 Top 10 주가 분석",
     page_icon="📈",
     layout="wide"
 )
+start_trace('05_coin')
 
 st.title("📈 글로벌 시가총액 Top 10 기업 주가 분석")
 st.markdown("---")
@@ -33,30 +49,70 @@ TOP_10_COMPANIES = {
     'JPM': 'JPMorgan Chase & Co.'
 }
 
-@st.cache_data(ttl=3600)  # 1시간 캐시
+# 베타 계산용 벤치마크 지수
+BENCHMARKS = {
+    '^GSPC': 'S&P 500',
+    '^IXIC': 'NASDAQ 종합'
+}
+
+# 기술적 지표 (표시 이름 -> (지표 이름, 파라미터))
+OVERLAYS = {
+    'SMA 20': ('sma', {'window': 20}),
+    'SMA 50': ('sma', {'window': 50}),
+    'EMA 20': ('ema', {'span': 20}),
+    '볼린저 밴드 (20, 2σ)': ('bollinger', {'window': 20, 'num_std': 2.0})
+}
+OSCILLATORS = {
+    'RSI 14': ('rsi', {'window': 14}),
+    'MACD (12, 26, 9)': ('macd', {'fast': 12, 'slow': 26, 'signal': 9})
+}
+
+# 분석 기간 (yfinance 기간 문자열 -> 표시 이름)
+PERIODS = {
+    '1y': '최근 1년',
+    '5y': '최근 5년',
+    '10y': '최근 10년',
+    'max': '전체 기간'
+}
+
+@st.cache_resource
+def get_price_store():
+    """모든 세션이 공유하는 디스크 주가 저장소 (데이터 출처별 위치)"""
+    return PriceStore(make_provider())
+
+@st.cache_resource
+def get_ticker_cache():
+    """모든 세션이 공유하는 종목별 주가 캐시 (디스크 저장소를 거쳐 부족한 봉만 요청, 이력은 공유 데이터 캐시에 보관)"""
+    return TickerCache(provider=get_price_store(), ttl=3600, entries=DATA_CACHE.namespace('ticker'))  # 1시간 캐시
+
+def panel_root():
+    """종가 패널 위치 (주가 저장소처럼 데이터 출처별로 나눔)"""
+    return store_root(get_price_store().provider, PANEL_ROOT)
+
 def fetch_stock_data(tickers, period='1y'):
     """주식 데이터를 가져오는 함수"""
     try:
         if isinstance(tickers, str):
             tickers = [tickers]
         
+        # 캐시에 없는 종목만 동시에 가져오고, 나머지는 캐시에서 바로 사용
+        histories, errors = get_ticker_cache().get_many(tickers, period=period)
+        
         data = {}
         failed_tickers = []
         
         for ticker in tickers:
-            try:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=period)
-                
-                if hist.empty:
-                    failed_tickers.append(ticker)
-                    continue
-                    
-                data[ticker] = hist['Close']
-                
-            except Exception as e:
-                st.warning(f"⚠️ {ticker} 데이터 가져오기 실패: {str(e)}")
+            if ticker in errors:
+                st.warning(f"⚠️ {ticker} 데이터 가져오기 실패: {errors[ticker]}")
                 failed_tickers.append(ticker)
+                continue
+            
+            hist = histories.get(ticker)
+            if hist is None or hist.empty:
+                failed_tickers.append(ticker)
+                continue
+                
+            data[ticker] = hist['Close']
         
         if failed_tickers:
             st.error(f"❌ 다음 종목의 데이터를 가져올 수 없습니다: {', '.join(failed_tickers)}")
@@ -72,30 +128,58 @@ def fetch_stock_data(tickers, period='1y'):
         st.error(f"❌ 데이터 가져오기 중 오류 발생: {str(e)}")
         return None
 
-def calculate_cumulative_returns(df):
-    """누적 수익률 계산 함수"""
+def fetch_benchmark_data(benchmark, period='1y'):
+    """베타 계산용 벤치마크 지수 종가 (실패 시 None)"""
+    try:
+        histories, errors = get_ticker_cache().get_many([benchmark], period=period)
+        hist = histories.get(benchmark)
+        if hist is None or hist.empty:
+            return None
+        return hist['Close']
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_indicator_cache():
+    """모든 세션이 공유하는 (종목, 지표, 파라미터)별 지표 캐시 (결과는 공유 데이터 캐시에 보관)"""
+    return IndicatorCache(entries=DATA_CACHE.namespace('indicator'))
+
+def calculate_indicators(df, presets, labels):
+    """선택된 기술적 지표 계산 함수 -> {(종목, 표시 이름): 지표 DataFrame}"""
     try:
-        returns = df.pct_change().fillna(0)
-        cumulative_returns = (1 + returns).cumprod() - 1
-        return cumulative_returns * 100  # 퍼센트로 변환
+        cache = get_indicator_cache()
+        results = {}
+        for label in labels:
+            name, params = presets[label]
+            for ticker in df.columns:
+                results[(ticker, label)] = cache.get(ticker, df[ticker], name, **params)
+        return results
     except Exception as e:
-        st.error(f"❌ 누적 수익률 계산 중 오류: {str(e)}")
+        st.error(f"❌ 기술적 지표 계산 중 오류: {str(e)}")
+        return {}
+
+def calculate_statistics(df, benchmark=None):
+    """통계 엔진 실행 함수 (일간 수익률을 한 번만 계산해 누적 수익률과 통계가 공유)"""
+    try:
+        return compute_statistics(df, benchmark=benchmark)
+    except Exception as e:
+        st.error(f"❌ 통계 계산 중 오류: {str(e)}")
         return None
 
-def create_price_chart(df, selected_companies):
-    """주가 차트 생성 함수"""
+def create_price_chart(df, selected_companies, period_label='최근 1년', max_points=None, overlays=None):
+    """주가 차트 생성 함수 (max_points 지정 시 다운샘플링 + WebGL)"""
     try:
         fig = go.Figure()
         
-        colors = px.colors.qualitative.Set1
+        colors = qualitative.Set1
         
         for i, ticker in enumerate(df.columns):
             company_name = TOP_10_COMPANIES.get(ticker, ticker)
             color = colors[i % len(colors)]
             
-            fig.add_trace(go.Scatter(
-                x=df.index,
-                y=df[ticker],
+            fig.add_trace(line_trace(
+                df[ticker],
+                max_points,
                 mode='lines',
                 name=f'{company_name} ({ticker})',
                 line=dict(color=color, width=2),
@@ -104,10 +188,26 @@ def create_price_chart(df, selected_companies):
                              '주가: $%{y:,.2f}<br>' +
                              '<extra></extra>'
             ))
+            
+            # 기술적 지표 오버레이 (캐시된 결과를 차트 구간만큼 잘라서 사용)
+            for (overlay_ticker, label), result in (overlays or {}).items():
+                if overlay_ticker != ticker:
+                    continue
+                result = result.loc[df.index[0]:df.index[-1]]
+                for column in result.columns:
+                    name = label if len(result.columns) == 1 else f'{label} {column}'
+                    fig.add_trace(line_trace(
+                        result[column],
+                        max_points,
+                        mode='lines',
+                        name=f'{ticker} {name}',
+                        line=dict(color=color, width=1, dash='dot'),
+                        hovertemplate='%{fullData.name}: $%{y:,.2f}<extra></extra>'
+                    ))
         
         fig.update_layout(
             title={
-                'text': f'📊 선택된 기업 주가 추이 (최근 1년)',
+                'text': f'📊 선택된 기업 주가 추이 ({period_label})',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20}
@@ -131,20 +231,77 @@ def create_price_chart(df, selected_companies):
         st.error(f"❌ 주가 차트 생성 중 오류: {str(e)}")
         return None
 
-def create_returns_chart(cumulative_returns, selected_companies):
-    """누적 수익률 차트 생성 함수"""
+def create_indicator_chart(df, indicators, labels, max_points=None):
+    """RSI / MACD 보조지표 차트 생성 함수"""
+    try:
+        fig = make_subplots(rows=len(labels), cols=1, shared_xaxes=True, subplot_titles=labels)
+        
+        colors = qualitative.Set1
+        
+        for row, label in enumerate(labels, start=1):
+            for i, ticker in enumerate(df.columns):
+                color = colors[i % len(colors)]
+                result = indicators[(ticker, label)].loc[df.index[0]:df.index[-1]]
+                main_column = result.columns[0]
+                
+                fig.add_trace(line_trace(
+                    result[main_column],
+                    max_points,
+                    mode='lines',
+                    name=f'{ticker} {label}',
+                    legendgroup=ticker,
+                    line=dict(color=color, width=2)
+                ), row=row, col=1)
+                
+                if 'signal' in result.columns:
+                    fig.add_trace(line_trace(
+                        result['signal'],
+                        max_points,
+                        mode='lines',
+                        name=f'{ticker} 시그널',
+                        legendgroup=ticker,
+                        line=dict(color=color, width=1, dash='dot')
+                    ), row=row, col=1)
+            
+            if OSCILLATORS[label][0] == 'rsi':
+                # 과매수/과매도 기준선
+                fig.add_hline(y=70, line_dash="dash", line_color="red", opacity=0.5, row=row, col=1)
+                fig.add_hline(y=30, line_dash="dash", line_color="blue", opacity=0.5, row=row, col=1)
+            else:
+                fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5, row=row, col=1)
+        
+        fig.update_layout(
+            title={
+                'text': '📐 보조지표',
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 20}
+            },
+            hovermode='x unified',
+            height=300 * len(labels),
+            showlegend=True
+        )
+        
+        return fig
+        
+    except Exception as e:
+        st.error(f"❌ 보조지표 차트 생성 중 오류: {str(e)}")
+        return None
+
+def create_returns_chart(cumulative_returns, selected_companies, period_label='최근 1년', max_points=None):
+    """누적 수익률 차트 생성 함수 (max_points 지정 시 다운샘플링 + WebGL)"""
     try:
         fig = go.Figure()
         
-        colors = px.colors.qualitative.Set1
+        colors = qualitative.Set1
         
         for i, ticker in enumerate(cumulative_returns.columns):
             company_name = TOP_10_COMPANIES.get(ticker, ticker)
             color = colors[i % len(colors)]
             
-            fig.add_trace(go.Scatter(
-                x=cumulative_returns.index,
-                y=cumulative_returns[ticker],
+            fig.add_trace(line_trace(
+                cumulative_returns[ticker],
+                max_points,
                 mode='lines',
                 name=f'{company_name} ({ticker})',
                 line=dict(color=color, width=2),
@@ -156,7 +313,7 @@ def create_returns_chart(cumulative_returns, selected_companies):
         
         fig.update_layout(
             title={
-                'text': f'📈 선택된 기업 누적 수익률 (최근 1년)',
+                'text': f'📈 선택된 기업 누적 수익률 ({period_label})',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 20}
@@ -183,40 +340,252 @@ def create_returns_chart(cumulative_returns, selected_companies):
         st.error(f"❌ 누적 수익률 차트 생성 중 오류: {str(e)}")
         return None
 
-def display_statistics(df, cumulative_returns):
+@st.cache_resource(max_entries=16, ttl=12 * 3600)
+def get_live_feed(tickers):
+    """종목 묶음별로 모든 세션이 공유하는 1분봉 피드 (최근 묶음 16개까지, 12시간이 지나면 새로 만듦)"""
+    return LiveFeed(tickers, make_provider(), interval=LIVE_INTERVAL)
+
+@st.fragment(run_every=LIVE_INTERVAL)
+def display_live_panel(tickers, max_points=None):
+    """실시간 1분봉 패널 (페이지 전체가 아니라 이 부분만 주기적으로 다시 실행)"""
+    try:
+        feed = get_live_feed(tuple(tickers))
+        new_bars = feed.poll()
+        prices, cumulative, summary = feed.snapshot()
+        
+        if prices.empty:
+            st.info("ℹ️ 아직 오늘의 1분봉 데이터가 없습니다. (장 시작 전이거나 휴장일일 수 있음)")
+            return
+        
+        fig = create_returns_chart(cumulative, tickers, '오늘 1분봉', max_points)
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+        
+        summary.insert(0, '기업명', [f"{TOP_10_COMPANIES.get(t, t)} ({t})" for t in summary.index])
+        st.dataframe(
+            summary,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '현재가': st.column_config.NumberColumn(format="$%.2f"),
+                '수익률': st.column_config.NumberColumn(format="%.2f%%"),
+                '연율 변동성': st.column_config.NumberColumn(format="%.2f%%"),
+                '최대 낙폭': st.column_config.NumberColumn(format="%.2f%%"),
+                '최고가': st.column_config.NumberColumn(format="$%.2f"),
+                '최저가': st.column_config.NumberColumn(format="$%.2f")
+            }
+        )
+        st.caption(
+            f"마지막 봉: {feed.last_timestamp():%Y-%m-%d %H:%M} | "
+            f"이번 갱신에서 추가된 봉: {new_bars}개 | {LIVE_INTERVAL}초마다 자동 갱신"
+        )
+        
+    except Exception as e:
+        st.error(f"❌ 실시간 데이터 갱신 중 오류: {str(e)}")
+
+def display_statistics(stats):
     """통계 정보 표시 함수"""
     try:
-        stats_data = []
+        stats_df = stats.summary.copy()
+        stats_df.insert(0, '기업명', [f"{TOP_10_COMPANIES.get(t, t)} ({t})" for t in stats_df.index])
         
-        for ticker in df.columns:
-            company_name = TOP_10_COMPANIES.get(ticker, ticker)
-            
-            # 통계 계산
-            current_price = df[ticker].iloc[-1]
-            start_price = df[ticker].iloc[0]
-            total_return = ((current_price - start_price) / start_price) * 100
-            
-            daily_returns = df[ticker].pct_change().dropna()
-            volatility = daily_returns.std() * np.sqrt(252) * 100  # 연간 변동성
-            
-            max_price = df[ticker].max()
-            min_price = df[ticker].min()
-            
-            stats_data.append({
-                '기업명': f"{company_name} ({ticker})",
-                '현재 주가': f"${current_price:.2f}",
-                '총 수익률': f"{total_return:.2f}%",
-                '연간 변동성': f"{volatility:.2f}%",
-                '최고가': f"${max_price:.2f}",
-                '최저가': f"${min_price:.2f}"
-            })
-        
-        stats_df = pd.DataFrame(stats_data)
-        st.dataframe(stats_df, use_container_width=True)
+        # 숫자는 그대로 두고 표시 형식만 지정 (행마다 문자열로 변환하지 않음)
+        st.dataframe(
+            stats_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '현재 주가': st.column_config.NumberColumn(format="$%.2f"),
+                '총 수익률': st.column_config.NumberColumn(format="%.2f%%"),
+                '연간 변동성': st.column_config.NumberColumn(format="%.2f%%"),
+                '최대 낙폭': st.column_config.NumberColumn(format="%.2f%%"),
+                '샤프 비율': st.column_config.NumberColumn(format="%.2f"),
+                '소르티노 비율': st.column_config.NumberColumn(format="%.2f"),
+                '베타': st.column_config.NumberColumn(format="%.2f"),
+                '최고가': st.column_config.NumberColumn(format="$%.2f"),
+                '최저가': st.column_config.NumberColumn(format="$%.2f")
+            }
+        )
+        
+        # 상관계수 행렬
+        if len(stats.correlation) > 1:
+            with span('figure', '상관계수'):
+                fig = px.imshow(
+                    stats.correlation,
+                    text_auto='.2f',
+                    color_continuous_scale='RdBu_r',
+                    zmin=-1,
+                    zmax=1,
+                    title='🔗 일간 수익률 상관계수'
+                )
+                fig.update_layout(height=max(400, 40 * len(stats.correlation)))
+            with span('serialize', '상관계수'):
+                st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"❌ 통계 정보 계산 중 오류: {str(e)}")
 
+@st.cache_resource(max_entries=2)
+def load_price_panel(root, version):
+    """저장된 종가 패널의 한 버전을 메모리 맵으로 열기 (버전별로 한 번만 열고 모든 세션이 공유)"""
+    return PricePanel.load(root, version)
+
+def build_price_panel(universe, period):
+    """
+    종목 목록의 이력을 저장소에서 받아 종가 패널을 만들고 디스크에 저장.
+    종목 캐시(TickerCache)를 거치지 않으므로 종목이 많아도 OHLCV 전체가 메모리에 남지 않습니다.
+    """
+    try:
+        panel, errors = PricePanel.from_provider(get_price_store(), universe, period=period)
+        if not panel.tickers:
+            st.error("❌ 패널을 만들 수 있는 종목 데이터가 없습니다.")
+            return
+        panel.save(panel_root())
+        st.success(f"✅ {len(panel.tickers)}개 종목 x {len(panel.dates)}일 패널을 저장했습니다.")
+        if errors:
+            st.warning(f"⚠️ 가져오지 못한 종목: {', '.join(errors)}")
+    except Exception as e:
+        st.error(f"❌ 패널 생성 중 오류: {str(e)}")
+
+@st.cache_data(max_entries=20)
+def run_risk_simulation(prices, weights, horizon, n_paths, confidence, seed, workers):
+    """몬테카를로 시뮬레이션 실행 (같은 입력이면 캐시된 결과 사용)"""
+    return portfolio_risk(prices, weights, horizon, n_paths, confidence, seed, workers)
+
+def display_portfolio_risk(df):
+    """포트폴리오 위험 (몬테카를로 VaR / CVaR)"""
+    with st.form("risk_form"):
+        st.write("**종목별 비중** (합계가 1이 아니어도 비율대로 조정됩니다)")
+        weight_cols = st.columns(min(len(df.columns), 5))
+        weights = []
+        for i, ticker in enumerate(df.columns):
+            with weight_cols[i % len(weight_cols)]:
+                weights.append(st.number_input(ticker, min_value=0.0, value=1.0, step=0.1, key=f"weight_{ticker}"))
+        
+        option_col1, option_col2, option_col3 = st.columns(3)
+        with option_col1:
+            n_paths = st.selectbox("시뮬레이션 경로 수:", [10_000, 100_000, 200_000], index=1,
+                                   format_func=lambda x: f"{x:,}")
+            horizon = st.number_input("기간 (거래일)", min_value=5, max_value=2520, value=252, step=21)
+        with option_col2:
+            confidence = st.selectbox("신뢰수준:", [0.90, 0.95, 0.99], index=1, format_func=lambda x: f"{x:.0%}")
+            seed = st.number_input("난수 시드", min_value=0, value=42, step=1)
+        with option_col3:
+            use_pool = st.checkbox("여러 프로세스로 실행", value=False)
+        submitted = st.form_submit_button("🎲 시뮬레이션 실행")
+    
+    if submitted:
+        if sum(weights) <= 0:
+            st.warning("⚠️ 비중의 합이 0보다 커야 합니다.")
+            return
+        try:
+            with st.spinner(f'🎲 {n_paths:,}개 경로를 시뮬레이션하는 중...'):
+                st.session_state.risk_result = run_risk_simulation(
+                    df, tuple(weights), int(horizon), n_paths, confidence, int(seed),
+                    os.cpu_count() if use_pool else None
+                )
+                st.session_state.risk_confidence = confidence
+        except Exception as e:
+            st.error(f"❌ 시뮬레이션 중 오류: {str(e)}")
+            return
+    
+    result = st.session_state.get('risk_result')
+    if result is None:
+        return
+    
+    confidence = st.session_state.risk_confidence
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    metric_col1.metric(f"VaR ({confidence:.0%})", f"{result.var * 100:.2f}%")
+    metric_col2.metric(f"CVaR ({confidence:.0%})", f"{result.cvar * 100:.2f}%")
+    metric_col3.metric("기대 수익률 (중앙값)", f"{(result.fan['P50'].iloc[-1] - 1) * 100:.2f}%")
+    
+    fan = (result.fan - 1) * 100
+    fig = go.Figure()
+    for low, high, opacity in (('P5', 'P95', 0.2), ('P25', 'P75', 0.4)):
+        fig.add_trace(go.Scatter(x=fan.index, y=fan[high], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=fan.index, y=fan[low], mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor=f'rgba(55, 126, 184, {opacity})',
+                                 name=f'{low[1:]}~{high[1:]} 백분위'))
+    fig.add_trace(go.Scatter(x=fan.index, y=fan['P50'], mode='lines', name='중앙값',
+                             line=dict(color='rgb(55, 126, 184)', width=2)))
+    fig.update_layout(
+        title={
+            'text': '🎲 포트폴리오 수익률 분포 (팬 차트)',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20}
+        },
+        xaxis_title='거래일',
+        yaxis_title='누적 수익률 (%)',
+        height=450
+    )
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_screener(period):
+    """대규모 종목 스크리너"""
+    universe_text = st.text_area(
+        "스크리닝 대상 종목 (쉼표/공백/줄바꿈으로 구분):",
+        value=' '.join(TOP_10_COMPANIES.keys())
+    )
+    if st.button("🧱 종가 패널 만들기/갱신", key="build_panel"):
+        universe = [t.strip().upper() for t in universe_text.replace(',', ' ').split() if t.strip()]
+        invalid = [t for t in universe if not TICKER_PATTERN.fullmatch(t)]
+        if invalid:
+            st.warning(f"⚠️ 올바르지 않은 종목 코드는 제외합니다: {', '.join(invalid)}")
+            universe = [t for t in universe if t not in invalid]
+        with st.spinner(f'📊 {len(universe)}개 종목 데이터를 가져오는 중...'):
+            build_price_panel(universe, period)
+    
+    root = panel_root()
+    version = PricePanel.current_version(root)
+    panel = load_price_panel(str(root), version) if version is not None else None
+    if panel is None:
+        st.info("ℹ️ 먼저 종가 패널을 만들어주세요.")
+        return
+    
+    try:
+        st.caption(f"패널: {len(panel.tickers)}개 종목 x {len(panel.dates)}일 (float32, {panel.nbytes / 1e6:.1f}MB)")
+        
+        lookbacks = {'3개월': 63, '6개월': 126, '1년': 252, '전체': len(panel.dates) - 1}
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+        with filter_col1:
+            lookback = lookbacks[st.selectbox("조회 구간:", list(lookbacks.keys()), index=2)]
+            min_return = st.number_input("최소 수익률 (%)", value=-100.0, step=5.0)
+        with filter_col2:
+            max_volatility = st.number_input("최대 연간 변동성 (%)", value=200.0, step=5.0)
+            max_drawdown = st.number_input("허용 최대 낙폭 (%)", value=100.0, step=5.0)
+        with filter_col3:
+            reference = st.selectbox("상관계수 기준 종목:", [None] + panel.tickers,
+                                     format_func=lambda x: '없음' if x is None else x)
+            correlation_range = st.slider("상관계수 범위", -1.0, 1.0, (-1.0, 1.0), step=0.05)
+        
+        result = screen(
+            panel,
+            lookback=lookback,
+            reference=reference,
+            min_return=min_return,
+            max_volatility=max_volatility,
+            max_drawdown=max_drawdown,
+            min_correlation=correlation_range[0],
+            max_correlation=correlation_range[1]
+        )
+        st.write(f"**조건 충족 종목:** {len(result)}개")
+        st.dataframe(
+            result,
+            use_container_width=True,
+            column_config={
+                '수익률': st.column_config.NumberColumn(format="%.2f%%"),
+                '연간 변동성': st.column_config.NumberColumn(format="%.2f%%"),
+                '최대 낙폭': st.column_config.NumberColumn(format="%.2f%%"),
+                '상관계수': st.column_config.NumberColumn(format="%.2f")
+            }
+        )
+        
+    except Exception as e:
+        st.error(f"❌ 스크리닝 중 오류: {str(e)}")
+
 # 사이드바 - 기업 선택
 st.sidebar.header("🏢 기업 선택")
 
@@ -246,6 +615,59 @@ else:
         format_func=lambda x: f"{TOP_10_COMPANIES[x]} ({x})"
     )
 
+# 분석 기간 선택
+period = st.sidebar.selectbox(
+    "분석 기간:",
+    options=list(PERIODS.keys()),
+    format_func=lambda x: PERIODS[x],
+    index=0
+)
+
+# 벤치마크 선택
+benchmark_ticker = st.sidebar.selectbox(
+    "베타 기준 지수:",
+    options=list(BENCHMARKS.keys()),
+    format_func=lambda x: BENCHMARKS[x],
+    index=0
+)
+
+# 실시간 모드
+live_mode = st.sidebar.checkbox(
+    "🔴 실시간 모드 (1분봉)",
+    value=False,
+    help=f"{LIVE_INTERVAL}초마다 새 1분봉만 가져와 실시간 패널만 다시 그립니다."
+)
+
+# 기술적 지표
+st.sidebar.header("📐 기술적 지표")
+selected_overlays = st.sidebar.multiselect(
+    "주가 차트 오버레이:",
+    options=list(OVERLAYS.keys()),
+    default=[]
+)
+selected_oscillators = st.sidebar.multiselect(
+    "보조지표:",
+    options=list(OSCILLATORS.keys()),
+    default=[]
+)
+
+# 대용량 차트 모드
+st.sidebar.header("⚡ 차트 설정")
+fast_chart_mode = st.sidebar.checkbox(
+    "대용량 차트 모드 (다운샘플링 + WebGL)",
+    value=period in ('10y', 'max'),
+    help="종목마다 지정한 개수의 점만 브라우저로 보내 긴 기간의 차트를 빠르게 그립니다."
+)
+max_points = None
+if fast_chart_mode:
+    max_points = st.sidebar.number_input(
+        "종목별 최대 점 개수:",
+        min_value=200,
+        max_value=20000,
+        value=DEFAULT_MAX_POINTS,
+        step=100
+    )
+
 # 선택된 기업이 없는 경우 예외 처리
 if not selected_companies:
     st.warning("⚠️ 최소 하나의 기업을 선택해주세요.")
@@ -257,20 +679,25 @@ if selection_mode == "단일 선택" and len(selected_companies) == 0:
     st.stop()
 
 # 데이터 로딩
-with st.spinner('📊 주식 데이터를 가져오는 중...'):
-    stock_data = fetch_stock_data(selected_companies)
+with st.spinner('📊 주식 데이터를 가져오는 중...'), span('fetch', '주가'):
+    stock_data = fetch_stock_data(selected_companies, period=period)
 
 if stock_data is None or stock_data.empty:
     st.error("❌ 선택된 기업의 데이터를 가져올 수 없습니다. 다른 기업을 선택해주세요.")
     st.stop()
 
-# 누적 수익률 계산
-cumulative_returns = calculate_cumulative_returns(stock_data)
+# 통계 계산 (누적 수익률 포함)
+with span('fetch', '벤치마크 지수'):
+    benchmark_data = fetch_benchmark_data(benchmark_ticker, period=period)
+with span('compute', '통계'):
+    stats = calculate_statistics(stock_data, benchmark_data)
 
-if cumulative_returns is None:
+if stats is None:
     st.error("❌ 누적 수익률 계산에 실패했습니다.")
     st.stop()
 
+cumulative_returns = stats.cumulative
+
 # 메인 대시보드
 col1, col2 = st.columns([2, 1])
 
@@ -283,26 +710,76 @@ with col1:
 
 with col2:
     st.subheader("📅 분석 기간")
-    st.info("**기간:** 최근 1년")
+    st.info(f"**기간:** {PERIODS[period]}")
     st.info(f"**데이터 기준일:** {datetime.now().strftime('%Y-%m-%d')}")
 
 # 차트 표시
 st.markdown("---")
 
+# 실시간 1분봉 패널
+if live_mode:
+    st.subheader("🔴 실시간 (오늘 1분봉)")
+    display_live_panel(selected_companies, max_points)
+    st.markdown("---")
+
+# 확대 구간: 선택한 구간만 다시 다운샘플링하므로 구간이 좁을수록 원본 해상도에 가까워집니다.
+chart_prices = stock_data
+chart_returns = cumulative_returns
+if fast_chart_mode:
+    first_date = stock_data.index[0].date()
+    last_date = stock_data.index[-1].date()
+    if first_date < last_date:
+        zoom_range = st.slider(
+            "🔍 차트 확대 구간",
+            min_value=first_date,
+            max_value=last_date,
+            value=(first_date, last_date)
+        )
+        dates = stock_data.index.date
+        in_range = (dates >= zoom_range[0]) & (dates <= zoom_range[1])
+        chart_prices = stock_data[in_range]
+        chart_returns = cumulative_returns[in_range]
+
 # 주가 차트
-price_chart = create_price_chart(stock_data, selected_companies)
+with span('compute', '이동평균/밴드'):
+    overlays = calculate_indicators(stock_data, OVERLAYS, selected_overlays)
+with span('figure', '주가'):
+    price_chart = create_price_chart(chart_prices, selected_companies, PERIODS[period], max_points, overlays)
 if price_chart:
-    st.plotly_chart(price_chart, use_container_width=True)
+    with span('serialize', '주가'):
+        st.plotly_chart(price_chart, use_container_width=True)
 
 # 누적 수익률 차트
-returns_chart = create_returns_chart(cumulative_returns, selected_companies)
+with span('figure', '누적 수익률'):
+    returns_chart = create_returns_chart(chart_returns, selected_companies, PERIODS[period], max_points)
 if returns_chart:
-    st.plotly_chart(returns_chart, use_container_width=True)
+    with span('serialize', '누적 수익률'):
+        st.plotly_chart(returns_chart, use_container_width=True)
+
+# 보조지표 차트
+if selected_oscillators:
+    with span('compute', '보조지표'):
+        oscillators = calculate_indicators(stock_data, OSCILLATORS, selected_oscillators)
+    with span('figure', '보조지표'):
+        indicator_chart = create_indicator_chart(chart_prices, oscillators, selected_oscillators, max_points)
+    if indicator_chart:
+        with span('serialize', '보조지표'):
+            st.plotly_chart(indicator_chart, use_container_width=True)
 
 # 통계 정보
 st.markdown("---")
 st.subheader("📊 주요 통계 정보")
-display_statistics(stock_data, cumulative_returns)
+display_statistics(stats)
+
+# 포트폴리오 위험
+st.markdown("---")
+with st.expander("🎲 포트폴리오 위험 (몬테카를로 VaR / CVaR)"):
+    display_portfolio_risk(stock_data)
+
+# 대규모 종목 스크리너
+st.markdown("---")
+with st.expander("🔎 대규모 종목 스크리너"):
+    display_screener(period)
 
 # 추가 정보
 st.markdown("---")
@@ -313,9 +790,12 @@ info_col1, info_col2 = st.columns(2)
 with info_col1:
     st.markdown("""
     **📋 분석 지표 설명:**
-    - **총 수익률**: 1년간 주가 상승률
+    - **총 수익률**: 분석 기간 동안의 주가 상승률
     - **연간 변동성**: 주가 변동의 위험도 지표
-    - **최고가/최저가**: 1년간 최대/최소 주가
+    - **최대 낙폭**: 고점 대비 가장 크게 하락한 비율
+    - **샤프/소르티노 비율**: 변동성(하락 변동성) 대비 수익률
+    - **베타**: 기준 지수 대비 민감도
+    - **최고가/최저가**: 분석 기간 중 최대/최소 주가
     """)
 
 with info_col2:
@@ -328,25 +808,32 @@ with info_col2:
 
 # 데이터 다운로드 기능
 st.markdown("---")
-if st.button("📥 데이터 다운로드 (CSV)"):
-    try:
-        # 주가 데이터와 누적 수익률 데이터 합치기
-        download_data = pd.concat([
-            stock_data.add_suffix('_Price'),
-            cumulative_returns.add_suffix('_CumReturn(%)')
-        ], axis=1)
-        
-        csv = download_data.to_csv()
+export_col1, export_col2 = st.columns([1, 2])
+
+with export_col1:
+    export_format = st.radio(
+        "📥 다운로드 형식:",
+        options=list(EXPORT_FORMATS.keys()),
+        format_func=lambda x: EXPORT_FORMATS[x][0],
+        horizontal=True
+    )
+
+with export_col2:
+    st.write("")  # 공간 확보
+    # 파일은 다운로드 버튼을 누를 때 별도 스레드에서 청크 단위로 만들어지고, 같은 선택이면 디스크 캐시를 재사용
+    # 파일 내용은 메모리에 올려 보내므로 너무 큰 내보내기는 버튼을 만들지 않음
+    label, mime, extension = EXPORT_FORMATS[export_format]
+    if export_cells(stock_data) > EXPORT_MAX_CELLS:
+        st.warning(f"⚠️ 내보낼 데이터가 너무 큽니다 ({export_cells(stock_data):,}칸, 최대 {EXPORT_MAX_CELLS:,}칸). "
+                   "종목 수나 기간을 줄여주세요.")
+    else:
         st.download_button(
-            label="CSV 파일 다운로드",
-            data=csv,
-            file_name=f"stock_analysis_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
+            label=f"{label} 파일 다운로드",
+            data=lambda: prepare_export(stock_data, cumulative_returns, period, export_format).read_bytes(),
+            file_name=f"stock_analysis_{datetime.now().strftime('%Y%m%d')}{extension}",
+            mime=mime,
+            on_click='ignore'
         )
-        st.success("✅ 다운로드 준비가 완료되었습니다!")
-        
-    except Exception as e:
-        st.error(f"❌ 다운로드 준비 중 오류: {str(e)}")
 
 # 푸터
 st.markdown("---")
@@ -359,3 +846,5 @@ st.markdown(
     """, 
     unsafe_allow_html=True
 )
+
+finish_trace()
@@ -0,0 +1,116 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from pathlib import Path
+
+from population.age_index import BUCKET_SCHEMES, ORIGINAL_SCHEME
+from population.widgets import search_region
+from shared.data import cube_tree, population_cube, read_file, read_upload, search_index as get_search_index
+from shared.trace import finish_trace, span, start_trace
+
+DEFAULT_FILE = Path(__file__).resolve().parent / 'people_gender.csv'
+
+start_trace('06_pyramid')
+st.title("👫 지역별 인구 피라미드")
+
+# 📁 데이터 선택 (업로드하지 않으면 기본 파일 사용)
+uploaded_file = st.file_uploader("남/여 연령별 인구 CSV 파일 (업로드하지 않으면 기본 파일 사용)", type=["csv"])
+try:
+    # 큐브, 트리, 검색 인덱스는 공유 캐시에서 (파일 내용 해시별로 한 번만 생성, 모든 세션이 공유)
+    data, file_hash = read_upload(uploaded_file) if uploaded_file else read_file(DEFAULT_FILE)
+    cube = population_cube(file_hash, data)
+    tree = cube_tree(file_hash, data)
+    search_index = get_search_index('cube', file_hash, tree)
+    if len(tree) == 0:
+        raise ValueError("행정구역에 10자리 행정기관코드(예: 포곡읍(4146125000))가 있는 파일만 사용할 수 있습니다.")
+except (OSError, ValueError) as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
+# 📍 지역 선택
+node = search_region(tree, search_index, key_prefix='pyramid_search')
+st.caption(" > ".join(n.short_name for n in tree.path(node)))
+if node.label in cube.derived:
+    st.caption("ℹ️ 파일에 이 지역의 행이 없어 파일에 포함된 하위 지역을 합산한 값입니다.")
+
+# 🗂️ 연령 구간 체계
+# 파일의 연령 구간으로 나눌 수 있는 체계만 (예: 10세 구간 파일에는 5세 단위/생애주기가 없음)
+schemes = cube.schemes()
+scheme = st.selectbox("🗂️ 연령 구간 단위를 선택하세요", schemes,
+                      index=schemes.index('5세 단위') if '5세 단위' in schemes else 0)
+buckets = cube.bins if scheme == ORIGINAL_SCHEME else BUCKET_SCHEMES[scheme]
+as_share = st.checkbox("전체 인구 대비 비율(%)로 보기")
+
+with span('compute', '피라미드'):
+    male, female = cube.pyramid(node.label, buckets)
+    total = int(male.sum() + female.sum())
+    median_male, median_female, median_all = cube.median_age(node.label)
+
+# 📋 요약
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("총 인구", f"{total:,}명")
+col2.metric("👨 남자", f"{int(male.sum()):,}명")
+col3.metric("👩 여자", f"{int(female.sum()):,}명")
+col4.metric("성비 (여자 100명당 남자)", f"{male.sum() / female.sum() * 100:.1f}" if female.sum() else "-")
+if median_all is not None:
+    st.caption(f"중위 연령: 전체 {median_all}세 · 남자 {median_male}세 · 여자 {median_female}세")
+
+# 📊 피라미드 (남자는 왼쪽, 여자는 오른쪽)
+labels = [b[2] for b in buckets]
+scale = 100 / total if as_share and total else 1
+male_values = male * scale
+female_values = female * scale
+unit = "%" if as_share else "명"
+fmt = ".2f" if as_share else ","
+
+with span('figure', '피라미드'):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=-male_values,
+        name="남자",
+        orientation="h",
+        marker_color="#636EFA",
+        customdata=male_values,
+        hovertemplate=f"%{{y}}<br>남자: %{{customdata:{fmt}}}{unit}<extra></extra>"
+    ))
+    fig.add_trace(go.Bar(
+        y=labels,
+        x=female_values,
+        name="여자",
+        orientation="h",
+        marker_color="#EF553B",
+        customdata=female_values,
+        hovertemplate=f"%{{y}}<br>여자: %{{customdata:{fmt}}}{unit}<extra></extra>"
+    ))
+
+    # 가로축 눈금은 양쪽 모두 절댓값으로 표시
+    limit = float(max(male_values.max(initial=0), female_values.max(initial=0))) or 1
+    ticks = [limit * f for f in (-1, -0.5, 0, 0.5, 1)]
+    fig.update_layout(
+        title=f"{node.name} 인구 피라미드",
+        barmode="relative",
+        bargap=0.05,
+        height=max(400, 22 * len(labels)),
+        xaxis=dict(
+            title=f"인구 ({unit})",
+            tickvals=ticks,
+            ticktext=[f"{abs(t):.1f}" if as_share else f"{abs(t):,.0f}" for t in ticks]
+        ),
+        yaxis=dict(title="연령 구간"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        font=dict(family="Malgun Gothic, NanumGothic, sans-serif")
+    )
+with span('serialize', '피라미드'):
+    st.plotly_chart(fig)
+
+# 📋 표
+with st.expander("📋 구간별 인구 표"):
+    st.dataframe(pd.DataFrame({
+        "연령구간": labels,
+        "남자": male,
+        "여자": female,
+        "합계": male + female
+    }), hide_index=True)
+
+finish_trace()
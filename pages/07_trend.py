@@ -0,0 +1,163 @@
+import streamlit as st
+import pandas as pd
+
+from population.age_index import MAX_AGE
+from population.regions import RegionTree
+from population.timeseries import PopulationTimeSeries, SEX_CODES, month_label
+from population.widgets import search_region
+from shared.data import memoize, search_index
+from shared.lazy import lazy_import
+from shared.trace import finish_trace, span, start_trace
+
+px = lazy_import('plotly.express')  # 저장된 달이 있어 추이 차트를 그릴 때만 import
+
+start_trace('07_trend')
+st.title("📈 월별 인구 추이")
+
+@st.cache_resource
+def get_store():
+    """월별 인구 시계열 저장소 (모든 세션이 공유)"""
+    return PopulationTimeSeries()
+
+@memoize('trend_tree')
+def get_region_tree(version, _store):
+    """저장된 지역 목록의 행정구역 트리 (저장소가 바뀔 때만 다시 만듦)"""
+    return RegionTree(_store.labels())
+
+@memoize('trend_series', kind='fetch')
+def load_series(version, codes, sex, start_age, end_age):
+    """저장소 버전별 조회 결과 캐시 (월 x 지역, 모든 세션이 같은 DataFrame을 공유하므로 고치지 않음)"""
+    return get_store().series(list(codes), sex, start_age, end_age)
+
+def data_codes(node):
+    """파일에 행이 있는 지역 코드 (파일에 없는 상위 지역은 하위 지역들로 대신)"""
+    if not node.derived:
+        return [node.code]
+    return [code for child in node.children for code in data_codes(child)]
+
+store = get_store()
+
+# 📁 월별 파일 추가 (이미 추가한 파일은 건너뜀)
+uploaded_files = st.file_uploader(
+    "월별 인구 CSV 파일을 추가하세요 (여러 개 선택 가능, 이미 추가한 파일은 건너뜁니다)",
+    type=["csv"],
+    accept_multiple_files=True
+)
+# 이 세션에서 이미 처리한 업로드는 rerun마다 파일 전체를 다시 해시하지 않도록 (file_id -> 오류 메시지 또는 None)
+ingested = st.session_state.setdefault("trend_ingested", {})
+for uploaded_file in uploaded_files or []:
+    if uploaded_file.file_id not in ingested:
+        try:
+            with span('parse', uploaded_file.name):
+                added = store.ingest(uploaded_file, name=uploaded_file.name)
+            ingested[uploaded_file.file_id] = None
+            if added:
+                st.success(f"✅ {uploaded_file.name}: {', '.join(month_label(m) for m in added)} 추가")
+        except ValueError as e:
+            ingested[uploaded_file.file_id] = str(e)
+    if ingested[uploaded_file.file_id] is not None:
+        st.error(f"❌ {uploaded_file.name}: {ingested[uploaded_file.file_id]}")
+
+months = store.months()
+if not months:
+    st.info("👆 위에서 월별 인구 CSV 파일을 추가해주세요.")
+    st.stop()
+st.caption(f"🗓️ 저장된 월: {', '.join(month_label(m) for m in months)}")
+
+# 📍 지역 / 성별 / 연령 범위
+version = store.version
+tree = get_region_tree(version, store)
+node = search_region(tree, search_index('trend', version, tree), key_prefix='trend_search')
+st.caption(" > ".join(n.short_name for n in tree.path(node)))
+
+col1, col2 = st.columns([1, 3])
+sex = col1.radio("성별", list(SEX_CODES), horizontal=True)
+start_age, end_age = col2.slider("🎚️ 연령 범위", 0, MAX_AGE, (0, MAX_AGE), format="%d세")
+
+# 📊 선택 지역의 월별 인구
+codes = data_codes(node)
+series = load_series(version, tuple(codes), sex, start_age, end_age)
+if series.empty:
+    st.warning("⚠️ 선택한 조건의 데이터가 없습니다.")
+    st.stop()
+# 범위 끝이 파일의 연령 구간 중간에 걸리면 구간 경계로 넓혀서 계산됨
+snapped_range = series.attrs.get("age_range", (start_age, end_age))
+if snapped_range != (start_age, end_age):
+    st.caption(f"ℹ️ 파일의 연령 구간에 맞춰 {snapped_range[0]}~{snapped_range[1]}세 범위로 계산합니다.")
+start_age, end_age = snapped_range
+totals = series.sum(axis=1)
+labels = [month_label(m) for m in totals.index]
+
+if len(totals) > 1:
+    change = int(totals.iloc[-1] - totals.iloc[-2])
+    st.metric(
+        f"{labels[-1]} 인구 ({start_age}~{end_age}세, {sex})",
+        f"{int(totals.iloc[-1]):,}명",
+        f"{change:+,}명 (전월 대비)"
+    )
+else:
+    st.metric(f"{labels[-1]} 인구 ({start_age}~{end_age}세, {sex})", f"{int(totals.iloc[-1]):,}명")
+
+with span('figure', '월별 추이'):
+    fig = px.line(
+        x=labels,
+        y=totals.values,
+        markers=True,
+        labels={"x": "월", "y": "인구 수"},
+        title=f"{node.name} 월별 인구 추이"
+    )
+    fig.update_layout(font=dict(family="Malgun Gothic, NanumGothic, sans-serif"))
+with span('serialize', '월별 추이'):
+    st.plotly_chart(fig)
+
+# 🔁 전월 대비 증감
+if len(totals) > 1:
+    diff = totals.diff().iloc[1:]
+    df_diff = pd.DataFrame({
+        "월": labels[1:],
+        "증감": diff.values,
+        "증감률(%)": (totals.pct_change().iloc[1:] * 100).round(3).values
+    })
+    with span('figure', '전월 대비 증감'):
+        fig_diff = px.bar(
+            df_diff,
+            x="월",
+            y="증감",
+            hover_data=["증감률(%)"],
+            color=df_diff["증감"] >= 0,
+            color_discrete_map={True: "#00CC96", False: "#EF553B"},
+            title="전월 대비 증감"
+        )
+        fig_diff.update_layout(showlegend=False, font=dict(family="Malgun Gothic, NanumGothic, sans-serif"))
+    with span('serialize', '전월 대비 증감'):
+        st.plotly_chart(fig_diff)
+
+# 🔽 하위 지역 추이
+if node.children:
+    st.subheader(f"🔽 {node.name}의 하위 지역 추이")
+    child_codes = {child.short_name: data_codes(child) for child in node.children}
+    all_codes = tuple(code for codes in child_codes.values() for code in codes)
+    child_series = load_series(version, all_codes, sex, start_age, end_age)
+    df_children = pd.DataFrame({
+        name: child_series.reindex(columns=[int(c) for c in codes], fill_value=0).sum(axis=1)
+        for name, codes in child_codes.items()
+    })
+    df_children.index = [month_label(m) for m in df_children.index]
+    as_index = st.checkbox("첫 달 = 100 기준으로 보기", value=True)
+    if as_index:
+        df_children = df_children / df_children.iloc[0].replace(0, pd.NA) * 100
+    with span('figure', '하위 지역 추이'):
+        fig_children = px.line(
+            df_children.rename_axis("월").reset_index().melt(id_vars="월", var_name="지역", value_name="값"),
+            x="월",
+            y="값",
+            color="지역",
+            markers=True,
+            labels={"값": "지수 (첫 달 = 100)" if as_index else "인구 수"},
+            title="하위 지역별 월별 추이"
+        )
+        fig_children.update_layout(font=dict(family="Malgun Gothic, NanumGothic, sans-serif"))
+    with span('serialize', '하위 지역 추이'):
+        st.plotly_chart(fig_children)
+
+finish_trace()
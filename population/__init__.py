@@ -0,0 +1 @@
+"""04_plotlytest 페이지에서 사용하는 주민등록 인구 데이터 처리 모듈"""
@@ -0,0 +1,183 @@
+"""
+연령별 누적합(prefix sum) 인덱스
+
+지역 x 연령 구간(파일의 연령 컬럼: 1세 단위 또는 '0~9세' 같은 구간) 인구 행렬의 누적합을 한 번 만들어 두면
+어떤 연령 범위의 인구든 지역마다 뺄셈 한 번(O(1))으로, 모든 지역에 대해서는 열 두 개의 뺄셈으로 구할 수 있습니다.
+5세/10세/생애주기 같은 구간 체계를 바꿔도 원본 컬럼을 다시 읽지 않습니다.
+원본 구간보다 잘게 나눌 수는 없으므로, 경계가 원본 구간과 맞는 체계만 고를 수 있고
+나이 범위의 끝이 원본 구간 중간에 걸리면 그 구간을 통째로 포함하도록 넓혀(snap_range) 계산합니다.
+"""
+import re
+
+import numpy as np
+
+from population.ingest import REGION_COLUMN
+
+AGE_COLUMN = re.compile(
+    r'^(?P<month>\d{4}년\d{2}월)_(?P<sex>계|남|여)_(?P<lo>\d+)(?:~(?P<hi>\d+))?세(?P<over> 이상)?$'
+)
+MAX_AGE = 100  # '100세 이상'
+ORIGINAL_SCHEME = '원본 구간'
+
+# 구간 체계 이름 -> [(시작 나이, 끝 나이, 표시 이름)]
+BUCKET_SCHEMES = {
+    '1세 단위': [(a, a, f'{a}세') for a in range(MAX_AGE)] + [(MAX_AGE, MAX_AGE, f'{MAX_AGE}세 이상')],
+    '5세 단위': [(a, a + 4, f'{a}~{a + 4}세') for a in range(0, MAX_AGE, 5)] + [(MAX_AGE, MAX_AGE, f'{MAX_AGE}세 이상')],
+    '10세 단위': [(a, a + 9, f'{a}~{a + 9}세') for a in range(0, MAX_AGE, 10)] + [(MAX_AGE, MAX_AGE, f'{MAX_AGE}세 이상')],
+    '생애주기': [
+        (0, 6, '영유아 (0~6세)'),
+        (7, 12, '아동 (7~12세)'),
+        (13, 18, '청소년 (13~18세)'),
+        (19, 34, '청년 (19~34세)'),
+        (35, 49, '중년 (35~49세)'),
+        (50, 64, '장년 (50~64세)'),
+        (65, MAX_AGE, '노년 (65세 이상)'),
+    ],
+}
+
+
+def age_label(age):
+    return f'{MAX_AGE}세 이상' if age >= MAX_AGE else f'{age}세'
+
+
+def age_columns(columns, sex):
+    """
+    성별('계'/'남'/'여')의 연령 컬럼과 구간 목록 (시작 나이 순).
+    반환값: ([컬럼 이름], [(시작 나이, 끝 나이, 표시 이름)])
+    """
+    found = []
+    for col in columns:
+        match = AGE_COLUMN.match(col)
+        if match and match['sex'] == sex:
+            lo = int(match['lo'])
+            hi = int(match['hi']) if match['hi'] else lo
+            if match['over']:
+                hi = max(hi, MAX_AGE)
+            found.append((lo, hi, col.split('_')[-1], col))
+    found.sort()
+    return [f[3] for f in found], [f[:3] for f in found]
+
+
+def bin_range(bin_lo, bin_hi, starts, ends):
+    """
+    나이 범위와 겹치는 원본 구간의 [첫 구간, 마지막 구간 + 1) 위치 (이진 탐색).
+    범위 끝이 구간 중간에 걸리면 그 구간을 통째로 포함합니다.
+    """
+    first = np.searchsorted(bin_hi, starts, side='left')
+    last = np.searchsorted(bin_lo, ends, side='right')
+    return first, np.maximum(last, first)
+
+
+def aligned_schemes(bins):
+    """
+    원본 구간 bins로 정확히 나눌 수 있는 구간 체계 이름 (원본 구간 포함).
+    예를 들어 '0~9세' 같은 10세 구간 파일에서는 5세 단위/생애주기 구간을 만들 수 없으므로 빠집니다.
+    """
+    los = {b[0] for b in bins}
+    his = {b[1] for b in bins}
+    lowest, highest = bins[0][0], bins[-1][1]
+    result = [ORIGINAL_SCHEME]
+    for name, buckets in BUCKET_SCHEMES.items():
+        clipped = [(max(lo, lowest), min(hi, highest)) for lo, hi, _ in buckets]
+        if all(lo in los and hi in his for lo, hi in clipped if lo <= hi):
+            result.append(name)
+    return result
+
+
+class AgeIndex:
+    """지역 x 연령 구간 인구의 누적합 인덱스"""
+
+    def __init__(self, regions, counts, bins):
+        """counts: 지역 x 구간 정수 행렬, bins: 구간별 (시작 나이, 끝 나이, 표시 이름)"""
+        self.regions = list(regions)
+        self.positions = {region: i for i, region in enumerate(self.regions)}
+        self.bins = list(bins)
+        self._bin_lo = np.array([b[0] for b in self.bins])
+        self._bin_hi = np.array([b[1] for b in self.bins])
+        prefix = np.zeros((counts.shape[0], counts.shape[1] + 1), dtype=np.int64)
+        np.cumsum(counts, axis=1, out=prefix[:, 1:])
+        self.prefix = prefix
+
+    @classmethod
+    def from_table(cls, df, sex='계'):
+        """
+        정규화된 인구 표에서 인덱스 생성.
+        '계' 컬럼이 없는 남/여 파일은 남 + 여를 더해 '계'로 사용합니다.
+        """
+        columns, bins = age_columns(df.columns, sex)
+        if columns:
+            counts = df[columns].to_numpy(dtype=np.int64)
+        elif sex == '계' and age_columns(df.columns, '남')[0]:
+            male, bins = age_columns(df.columns, '남')
+            female, _ = age_columns(df.columns, '여')
+            counts = df[male].to_numpy(dtype=np.int64) + df[female].to_numpy(dtype=np.int64)
+        else:
+            raise ValueError(f"'{sex}' 연령별 인구 컬럼을 찾을 수 없습니다.")
+        return cls(df[REGION_COLUMN], counts, bins)
+
+    @property
+    def min_age(self):
+        return int(self._bin_lo[0])
+
+    @property
+    def max_age(self):
+        return int(self._bin_hi[-1])
+
+    def _rows(self, regions):
+        if regions is None:
+            return slice(None)
+        if isinstance(regions, str):
+            return self.positions[regions]
+        return [self.positions[r] for r in regions]
+
+    def _bin_range(self, starts, ends):
+        return bin_range(self._bin_lo, self._bin_hi, starts, ends)
+
+    def snap_range(self, start, end):
+        """나이 범위를 원본 구간 경계로 넓힌 (시작, 끝). 경계가 맞으면 그대로"""
+        first, last = self._bin_range(start, end)
+        first = min(int(first), len(self.bins) - 1)
+        last = max(int(last), first + 1)
+        return min(start, int(self._bin_lo[first])), max(end, int(self._bin_hi[last - 1]))
+
+    def range_sum(self, start, end, regions=None):
+        """
+        start세 ~ end세(포함) 인구. regions가 None이면 모든 지역의 배열.
+        범위 끝이 원본 구간 중간에 걸리면 snap_range로 넓힌 범위의 인구입니다.
+        """
+        first, last = self._bin_range(start, end)
+        prefix = self.prefix[self._rows(regions)]
+        return prefix[..., last] - prefix[..., first]
+
+    def total(self, regions=None):
+        """지역 전체 인구"""
+        return self.prefix[self._rows(regions), -1]
+
+    def bucket_sums(self, buckets, regions=None):
+        """구간 [(시작, 끝, ...)]별 인구. 결과 모양: (지역 수, 구간 수) 또는 한 지역이면 (구간 수,)"""
+        first, last = self._bin_range(np.array([b[0] for b in buckets]), np.array([b[1] for b in buckets]))
+        prefix = self.prefix[self._rows(regions)]
+        return prefix[..., last] - prefix[..., first]
+
+    def schemes(self):
+        """이 파일의 연령 구간으로 만들 수 있는 구간 체계 이름 (원본 구간 포함)"""
+        return aligned_schemes(self.bins)
+
+    def buckets_in_range(self, scheme, start, end):
+        """
+        구간 체계에서 [start, end] 범위와 겹치는 구간만, 범위 밖 부분은 잘라서 반환.
+        범위는 먼저 원본 구간 경계로 넓히므로 잘린 구간도 원본 구간의 합으로 정확히 계산됩니다.
+        """
+        if scheme not in self.schemes():
+            raise ValueError(f"'{scheme}' 구간은 이 파일의 연령 구간으로 나눌 수 없습니다.")
+        start, end = self.snap_range(start, end)
+        buckets = self.bins if scheme == ORIGINAL_SCHEME else BUCKET_SCHEMES[scheme]
+        result = []
+        for lo, hi, label in buckets:
+            lo_c, hi_c = max(lo, start), min(hi, end)
+            if lo_c > hi_c:
+                continue
+            if (lo_c, hi_c) != (lo, hi):
+                label = age_label(lo_c) if lo_c == hi_c else f'{lo_c}~{age_label(hi_c)}'
+            result.append((lo_c, hi_c, label))
+        return result
@@ -0,0 +1,32 @@
+"""
+인구 페이지와 배치 보고서가 함께 쓰는 차트
+
+plotly.express는 import가 무거우므로 차트를 처음 그릴 때 import합니다
+(이 모듈을 import하는 04_plotlytest가 파일을 올리기 전 화면에서는 import 비용을 내지 않음).
+"""
+import pandas as pd
+
+FONT = dict(family="Malgun Gothic, NanumGothic, sans-serif")
+
+
+def age_bar_chart(labels, values, title):
+    """연령 구간별 인구 막대 차트"""
+    import plotly.express as px
+
+    df_plot = pd.DataFrame({
+        "연령구간": labels,
+        "인구수": values
+    })
+    fig = px.bar(
+        df_plot,
+        x="연령구간",
+        y="인구수",
+        title=title,
+        labels={"연령구간": "연령 구간", "인구수": "인구 수"},
+        color_discrete_sequence=["#636EFA"]
+    )
+    fig.update_layout(
+        font=FONT,
+        xaxis_tickangle=-45
+    )
+    return fig
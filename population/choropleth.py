@@ -0,0 +1,124 @@
+"""
+행정구역 인구 단계구분도(choropleth) 레이어
+
+경계(GeometryCache의 확대 수준별 단순화 파일)와 값(연령 범위 인구)을 따로 보냅니다.
+- 경계는 정적 파일 URL로 넘겨 브라우저가 URL마다 한 번만 받아 지도 iframe 안에 보관하고,
+- 다시 그릴 때마다 보내는 것은 {코드: [인구, 색 번호]}와 색 목록뿐입니다.
+정적 파일 제공이 꺼져 있으면 (server.enableStaticServing) 단순화된 경계를 레이어에 직접 넣습니다.
+"""
+import json
+
+import folium
+import numpy as np
+from branca.element import MacroElement
+from jinja2 import Template
+
+# 적은 인구 -> 많은 인구 (ColorBrewer YlOrRd 6단계)
+PALETTE = ('#ffffb2', '#fed976', '#feb24c', '#fd8d3c', '#f03b20', '#bd0026')
+NO_DATA_COLOR = '#cccccc'
+
+
+def region_values(tree, age_index, codes, start, end):
+    """경계 코드 순서대로 start세 ~ end세 인구 (파일에 없는 지역은 -1)"""
+    sums = age_index.range_sum(start, end)
+    values = np.full(len(codes), -1, dtype=np.int64)
+    for i, code in enumerate(codes):
+        node = tree.nodes.get(code)
+        if node is not None:
+            values[i] = sums[node.position]
+    return values
+
+
+def quantile_bins(values, classes=len(PALETTE)):
+    """값이 있는 지역을 분위수로 나눈 구간 경계 (오름차순, 중복 제거)"""
+    known = values[values >= 0]
+    if len(known) == 0:
+        return np.array([0, 0])
+    return np.unique(np.quantile(known, np.linspace(0, 1, classes + 1)).round().astype(np.int64))
+
+
+def value_payload(codes, values, bins):
+    """
+    브라우저로 보낼 값: {코드: [인구, 색 번호]} (값이 없는 지역은 빠짐).
+    색 번호는 bins 구간 위치이고, 구간이 PALETTE보다 적으면 양 끝 색을 고르게 골라 씁니다.
+    """
+    classes = max(len(bins) - 1, 1)
+    colors = np.clip(np.searchsorted(bins, values, side='right') - 1, 0, classes - 1)
+    return {code: [int(v), int(c)] for code, v, c in zip(codes, values, colors) if v >= 0}
+
+
+def palette_for(bins):
+    """구간 수에 맞춘 색 목록"""
+    classes = max(len(bins) - 1, 1)
+    picks = np.linspace(0, len(PALETTE) - 1, classes).round().astype(int)
+    return [PALETTE[i] for i in picks]
+
+
+class ChoroplethLayer(MacroElement):
+    """FeatureGroup 안에 넣는 단계구분도 (경계는 URL에서 한 번만 받아 iframe의 window에 보관)"""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var values = {{ this.values|tojson }};
+            var palette = {{ this.palette|tojson }};
+            var layer = L.geoJson(null, {
+                style: function(feature) {
+                    var v = values[feature.properties.code];
+                    return {
+                        fillColor: v ? palette[v[1]] : {{ this.no_data_color|tojson }},
+                        fillOpacity: v ? 0.7 : 0.3,
+                        color: '#555555',
+                        weight: 0.5
+                    };
+                },
+                onEachFeature: function(feature, shape) {
+                    // 이름은 업로드한 GeoJSON에서 오므로 HTML이 아닌 글자로 넣음
+                    var v = values[feature.properties.code];
+                    var tip = document.createElement('span');
+                    tip.textContent = feature.properties.name + ': '
+                        + (v ? v[0].toLocaleString() + '명' : '자료 없음');
+                    shape.bindTooltip(tip);
+                }
+            }).addTo({{ this._parent.get_name() }});
+            {% if this.url %}
+            window.__geometry = window.__geometry || {};
+            var url = {{ this.url|tojson }};
+            if (!window.__geometry[url]) {
+                window.__geometry[url] = fetch(url, {cache: 'force-cache'}).then(function(r) { return r.json(); });
+            }
+            window.__geometry[url].then(function(data) { layer.addData(data); });
+            {% else %}
+            layer.addData(JSON.parse({{ this.inline|tojson }}));
+            {% endif %}
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, values, palette, url=None, inline=None):
+        super().__init__()
+        self._name = 'ChoroplethLayer'
+        self.values = values
+        self.palette = list(palette)
+        self.no_data_color = NO_DATA_COLOR
+        self.url = url
+        self.inline = inline
+
+
+def choropleth_layer(geometry, level, payload, palette, base_url=None):
+    """
+    단계구분도 FeatureGroup.
+    base_url이 있고 경계 파일이 정적 폴더에 있으면 경계는 그 아래 URL로, 아니면 레이어에 직접 넣습니다.
+    """
+    group = folium.FeatureGroup(name="인구 단계구분도")
+    url = geometry.url(level)
+    if base_url is not None and url is not None:
+        ChoroplethLayer(payload, palette, url=base_url.rstrip('/') + '/' + url).add_to(group)
+    else:
+        ChoroplethLayer(payload, palette, inline=geometry.geojson(level)).add_to(group)
+    return group
+
+
+def payload_size(payload):
+    """값 부분의 JSON 크기 (bytes, 다시 그릴 때 보내는 양)"""
+    return len(json.dumps(payload, separators=(',', ':')))
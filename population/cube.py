@@ -0,0 +1,149 @@
+"""
+지역 x 성별 x 나이 인구 큐브
+
+남/여 연령별 인구 파일(people_gender.csv 모양: '2025년05월_남_0세' ~ '2025년05월_여_100세 이상')을
+int32 배열 하나(지역 x [남, 여] x 연령 구간)와 작은 지역 색인(JSON)으로 저장합니다.
+- 문자열 컬럼 200여 개짜리 DataFrame 대신 숫자만 담은 연속 배열이라 메모리가 한 자릿수 이상 줄어듭니다.
+- 디스크에는 .npy로 저장해 메모리 맵으로 열므로, 여러 세션(프로세스)이 OS 페이지 캐시의 한 사본을 공유하고
+  실제로 읽은 지역의 행만 메모리에 올라옵니다.
+- 행은 행정구역 트리 순서이며 파일에 없는 상위 지역(하위 합계)도 포함합니다.
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from population.age_index import age_columns, aligned_schemes, bin_range
+from population.ingest import REGION_COLUMN, content_hash, parse_population_csv
+from population.regions import RegionTree
+from shared.paths import data_dir
+
+DEFAULT_ROOT = data_dir('population')
+SEXES = ('남', '여')
+
+
+class PopulationCube:
+    """int32 인구 배열(지역 x 성별 x 연령 구간) + 지역 목록 + 연령 구간"""
+
+    def __init__(self, regions, counts, bins, derived=()):
+        """counts: (지역 수, 2, 구간 수) 정수 배열, bins: 구간별 (시작 나이, 끝 나이, 표시 이름)"""
+        self.regions = list(regions)
+        self.positions = {region: i for i, region in enumerate(self.regions)}
+        self.counts = counts
+        self.bins = [tuple(b) for b in bins]
+        self.derived = set(derived)  # 파일에 행이 없어 하위 지역 합계로 만든 지역
+        self._bin_lo = np.array([b[0] for b in self.bins])
+        self._bin_hi = np.array([b[1] for b in self.bins])
+
+    @classmethod
+    def from_table(cls, df, derived=()):
+        """행정구역 + 남/여 연령 컬럼 표에서 큐브 생성"""
+        male, bins = age_columns(df.columns, SEXES[0])
+        female, female_bins = age_columns(df.columns, SEXES[1])
+        if not male or bins != female_bins:
+            raise ValueError("남/여 연령별 인구 컬럼이 모두 있는 파일만 사용할 수 있습니다.")
+        counts = np.empty((len(df), len(SEXES), len(bins)), dtype=np.int32)
+        counts[:, 0] = df[male].to_numpy(dtype=np.int32)
+        counts[:, 1] = df[female].to_numpy(dtype=np.int32)
+        return cls(df[REGION_COLUMN], counts, bins, derived)
+
+    @classmethod
+    def from_tree(cls, tree):
+        """행정구역 트리의 사전 집계로 생성 (파일에 없는 상위 지역 포함, 트리 순서)"""
+        return cls.from_table(tree.table(), derived=[n.label for n in tree.order if n.derived])
+
+    @property
+    def nbytes(self):
+        return self.counts.nbytes
+
+    def save(self, root=DEFAULT_ROOT, key='current'):
+        """
+        root/key 디렉터리에 counts.npy와 index.json을 기록합니다.
+        임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로, 읽는 쪽은 완성된 큐브만 보게 됩니다.
+        """
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=root, prefix=f'.{key}-'))
+        np.save(staging / 'counts.npy', np.ascontiguousarray(self.counts, dtype=np.int32))
+        index = {'regions': self.regions, 'bins': self.bins, 'derived': sorted(self.derived)}
+        (staging / 'index.json').write_text(json.dumps(index, ensure_ascii=False))
+        try:
+            os.replace(staging, root / key)
+        except OSError:
+            # 다른 세션이 같은 파일을 먼저 저장함 (내용이 같으므로 그쪽을 사용)
+            shutil.rmtree(staging, ignore_errors=True)
+        return root / key
+
+    @classmethod
+    def load(cls, root=DEFAULT_ROOT, key='current', mmap=True):
+        """저장된 큐브를 엽니다 (mmap=True면 읽기 전용 메모리 맵, 없으면 None)"""
+        path = Path(root) / key
+        if not (path / 'index.json').exists():
+            return None
+        counts = np.load(path / 'counts.npy', mmap_mode='r' if mmap else None)
+        index = json.loads((path / 'index.json').read_text())
+        return cls(index['regions'], counts, index['bins'], index['derived'])
+
+    @property
+    def min_age(self):
+        return int(self._bin_lo[0])
+
+    @property
+    def max_age(self):
+        return int(self._bin_hi[-1])
+
+    def schemes(self):
+        """이 큐브의 연령 구간으로 만들 수 있는 구간 체계 이름 (원본 구간 포함)"""
+        return aligned_schemes(self.bins)
+
+    def region(self, region):
+        """한 지역의 (2, 구간 수) int64 배열 - 0행은 남, 1행은 여"""
+        return np.asarray(self.counts[self.positions[region]], dtype=np.int64)
+
+    def pyramid(self, region, buckets=None):
+        """
+        지역의 성별 x 구간 인구. buckets [(시작, 끝, ...)]를 주면 각 구간과 겹치는 원본 구간을 합칩니다.
+        (구간 경계가 원본 구간과 맞는 체계는 schemes()로 고름)
+        """
+        row = self.region(region)
+        if buckets is None:
+            return row
+        prefix = np.zeros((row.shape[0], row.shape[1] + 1), dtype=np.int64)
+        np.cumsum(row, axis=1, out=prefix[:, 1:])
+        first, last = bin_range(self._bin_lo, self._bin_hi, [b[0] for b in buckets], [b[1] for b in buckets])
+        return prefix[:, last] - prefix[:, first]
+
+    def median_age(self, region):
+        """성별(남, 여, 전체) 중위 연령 - 인구 절반에 처음 도달하는 구간의 시작 나이"""
+        row = self.region(region)
+        result = []
+        for values in (row[0], row[1], row.sum(axis=0)):
+            total = values.sum()
+            if total == 0:
+                result.append(None)
+                continue
+            position = int(np.searchsorted(np.cumsum(values), total / 2))
+            result.append(int(self._bin_lo[position]))
+        return tuple(result)
+
+
+def ingest_cube(data, root=DEFAULT_ROOT):
+    """
+    CSV 바이트를 큐브로 변환해 저장하고 메모리 맵으로 엽니다.
+    같은 내용(해시)의 큐브가 이미 있으면 CSV를 다시 파싱하지 않습니다.
+    """
+    key = content_hash(data)
+    cube = PopulationCube.load(root, key)
+    if cube is None:
+        PopulationCube.from_tree(RegionTree(parse_population_csv(data))).save(root, key)
+        cube = PopulationCube.load(root, key)
+    return cube
+
+
+def region_tree(cube):
+    """큐브의 지역 목록으로 행정구역 트리를 만듭니다 (집계는 큐브에 있으므로 지역 구조만)"""
+    return RegionTree(pd.DataFrame({REGION_COLUMN: cube.regions}))
@@ -0,0 +1,222 @@
+"""
+행정구역 경계 GeoJSON의 확대 수준별 단순화 캐시
+
+원본 경계 폴리곤은 매 실행마다 보내기에는 너무 무거우므로, 확대 수준(ZOOM_LEVELS)마다 한 번씩
+- Douglas-Peucker로 화면 1픽셀보다 작은 굴곡을 없애고,
+- 좌표를 그 수준에서 구분되는 자릿수까지만 반올림(양자화)해 중복 점을 지운 뒤,
+- 속성은 10자리 행정기관코드와 이름만 남긴 압축 GeoJSON으로 저장합니다 (파일 내용 해시별).
+지도에는 이 파일의 URL만 넘기고 브라우저가 한 번 받아 두므로, 연령 범위를 바꿔 다시 그릴 때는 코드별 값/색만 보냅니다.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from shared.paths import STATIC_ROOT, static_dir
+
+DEFAULT_ROOT = static_dir('geometry')
+ZOOM_LEVELS = (5, 7, 9, 11, 13)
+TILE_SIZE = 256
+CODE_LENGTH = 10
+CODE_VALUE = re.compile(r'^\d{5,10}$')
+
+
+def geometry_key(data, code_property):
+    """원본 파일 내용과 코드 속성 이름으로 만든 캐시 키"""
+    digest = hashlib.sha256(data)
+    digest.update(code_property.encode())
+    return digest.hexdigest()[:24]
+
+
+def normalize_code(value):
+    """시군구(5자리)/읍면동(8자리) 코드를 오른쪽에 0을 채워 10자리로"""
+    text = str(value).strip()
+    if not CODE_VALUE.match(text):
+        return None
+    return text.ljust(CODE_LENGTH, '0')
+
+
+def code_properties(features, sample=200):
+    """
+    행정기관코드로 쓸 수 있는 속성 이름 (숫자 5~10자리 값이 가장 많은 순).
+    예: adm_cd2(10자리), SIG_CD(5자리), EMD_CD(8자리)
+    """
+    counts = {}
+    for feature in features[:sample]:
+        for key, value in (feature.get('properties') or {}).items():
+            if value is not None and CODE_VALUE.match(str(value).strip()):
+                counts[key] = counts.get(key, 0) + 1
+    return sorted(counts, key=lambda k: (-counts[k], -len(str(features[0]['properties'].get(k, '')))))
+
+
+def name_property(features):
+    """이름으로 보여줄 속성 (없으면 None)"""
+    keys = list((features[0].get('properties') or {}) if features else {})
+    for key in keys:
+        lowered = key.lower()
+        if lowered.endswith('nm') or 'name' in lowered or lowered.endswith('_kor'):
+            return key
+    return None
+
+
+def tolerance_for_zoom(zoom):
+    """확대 수준에서 화면 1픽셀에 해당하는 경도 폭 (도)"""
+    return 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def decimals_for_zoom(zoom):
+    """1픽셀의 절반을 구분할 수 있는 소수 자릿수"""
+    return max(0, math.ceil(-math.log10(tolerance_for_zoom(zoom) / 2)))
+
+
+def level_for_zoom(zoom):
+    """지도 확대 수준에 쓸 단순화 수준 (zoom 이하 중 가장 세밀한 것)"""
+    candidates = [level for level in ZOOM_LEVELS if level <= zoom]
+    return candidates[-1] if candidates else ZOOM_LEVELS[0]
+
+
+def douglas_peucker(points, tolerance):
+    """(n, 2) 좌표열을 tolerance(도) 이내로 단순화 (재귀 대신 스택)"""
+    n = len(points)
+    if n <= 2:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        a, b = points[start], points[end]
+        segment = points[start + 1:end]
+        direction = b - a
+        length = math.hypot(direction[0], direction[1])
+        if length == 0:
+            distances = np.hypot(segment[:, 0] - a[0], segment[:, 1] - a[1])
+        else:
+            distances = np.abs(direction[0] * (segment[:, 1] - a[1]) - direction[1] * (segment[:, 0] - a[0])) / length
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def _simplify_ring(ring, tolerance, decimals, exterior):
+    points = np.asarray(ring, dtype=np.float64)[:, :2]
+    simplified = np.round(douglas_peucker(points, tolerance), decimals)
+    # 반올림으로 겹친 연속 점 제거
+    changed = np.any(np.diff(simplified, axis=0) != 0, axis=1)
+    simplified = simplified[np.concatenate([[True], changed])]
+    if len(simplified) >= 4:
+        return simplified.tolist()
+    if not exterior:
+        return None  # 1픽셀보다 작은 구멍은 버림
+    # 바깥 경계가 너무 작아도 영역이 사라지지 않도록 삼각형으로 남김
+    n = len(points)
+    triangle = np.round(points[[0, n // 3, 2 * n // 3, 0]], decimals)
+    return triangle.tolist()
+
+
+def simplify_geometry(geometry, tolerance, decimals):
+    """Polygon/MultiPolygon 단순화 (다른 형식은 좌표만 반올림)"""
+    kind = geometry.get('type')
+    if kind == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif kind == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return geometry
+
+    result = []
+    for polygon in polygons:
+        rings = []
+        for i, ring in enumerate(polygon):
+            simplified = _simplify_ring(ring, tolerance, decimals, exterior=(i == 0))
+            if simplified is not None:
+                rings.append(simplified)
+        result.append(rings)
+    if len(result) > 1:
+        # 여러 조각 중 1픽셀 삼각형만 남은 조각(작은 섬)은 버리되 최소 하나는 남김
+        kept = [rings for rings in result if len(rings[0]) > 4] or result[:1]
+        return {'type': 'MultiPolygon', 'coordinates': kept}
+    return {'type': 'Polygon', 'coordinates': result[0]}
+
+
+def _atomic_write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class GeometryCache:
+    """GeoJSON 하나의 확대 수준별 단순화 결과 (디스크에 한 번 만들고 재사용)"""
+
+    def __init__(self, data, code_property=None, name_prop=None, root=DEFAULT_ROOT):
+        collection = json.loads(data)
+        features = collection.get('features') or []
+        if not features:
+            raise ValueError("Feature가 없는 GeoJSON입니다.")
+        candidates = code_properties(features)
+        self.code_property = code_property or (candidates[0] if candidates else None)
+        if self.code_property is None:
+            raise ValueError("행정기관코드(숫자 5~10자리) 속성이 있는 GeoJSON만 사용할 수 있습니다.")
+        self.name_property = name_prop or name_property(features)
+        self.key = geometry_key(data, self.code_property)
+        self.root = Path(root) / self.key
+
+        self.codes = []
+        self.names = {}
+        for feature in features:
+            properties = feature.get('properties') or {}
+            code = normalize_code(properties.get(self.code_property, ''))
+            if code is not None:
+                self.codes.append(code)
+                self.names[code] = str(properties.get(self.name_property, code)) if self.name_property else code
+        if not all(self.path(level).exists() for level in ZOOM_LEVELS):
+            self._build(features)
+
+    def path(self, level):
+        return self.root / f'z{level}.geojson'
+
+    def url(self, level):
+        """streamlit 정적 파일 경로 (실제 정적 폴더 STATIC_ROOT 밖에 저장했으면 None)"""
+        if not self.path(level).is_relative_to(STATIC_ROOT):
+            return None
+        return 'app/static/' + self.path(level).relative_to(STATIC_ROOT).as_posix()
+
+    def _build(self, features):
+        for level in ZOOM_LEVELS:
+            tolerance = tolerance_for_zoom(level)
+            decimals = decimals_for_zoom(level)
+            out = []
+            for feature in features:
+                properties = feature.get('properties') or {}
+                code = normalize_code(properties.get(self.code_property, ''))
+                if code is None or not feature.get('geometry'):
+                    continue
+                out.append({
+                    'type': 'Feature',
+                    'properties': {'code': code, 'name': self.names[code]},
+                    'geometry': simplify_geometry(feature['geometry'], tolerance, decimals),
+                })
+            text = json.dumps({'type': 'FeatureCollection', 'features': out},
+                              ensure_ascii=False, separators=(',', ':'))
+            _atomic_write(self.path(level), text)
+
+    def geojson(self, level):
+        """단순화된 GeoJSON 문자열 (정적 파일을 쓸 수 없을 때 지도에 직접 넣는 용도)"""
+        return self.path(level).read_text(encoding='utf-8')
+
+    def sizes(self):
+        """수준별 파일 크기 (bytes)"""
+        return {level: self.path(level).stat().st_size for level in ZOOM_LEVELS}
@@ -0,0 +1,65 @@
+"""
+인구 CSV 수집 단계
+
+행정안전부 주민등록 인구 통계 CSV(행정구역 + '2025년05월_계_0세' 같은 숫자 컬럼)를 한 번만 파싱합니다.
+천 단위 쉼표가 있는 숫자는 파싱하면서 바로 정수로 읽고 int32로 줄여 저장합니다.
+"""
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+REGION_COLUMN = '행정구역'
+# 행정안전부 배포 파일은 cp949, 다시 저장한 파일은 utf-8인 경우가 많음
+# (cp949 파일은 utf-8로 읽으면 거의 항상 실패하므로 utf-8을 먼저 시도)
+ENCODINGS = ('utf-8-sig', 'cp949')
+
+
+def content_hash(data):
+    """업로드 파일 내용의 해시 (캐시 키로 사용)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def detect_encoding(head, encodings=ENCODINGS):
+    """
+    파일 앞부분 바이트로 인코딩 추정 (전체를 읽지 않는 스트리밍 수집용).
+    앞부분을 자르면서 생긴 끝부분의 잘린 멀티바이트 문자는 오류로 보지 않습니다.
+    """
+    for encoding in encodings:
+        try:
+            head.decode(encoding)
+            return encoding
+        except UnicodeDecodeError as e:
+            if e.start >= len(head) - 3:
+                return encoding
+    raise ValueError(f"지원하는 인코딩({', '.join(encodings)})으로 읽을 수 없는 파일입니다.")
+
+
+def parse_population_csv(data, encodings=ENCODINGS):
+    """
+    CSV 바이트를 파싱해 행정구역(문자열) + 인구 수(int32) 컬럼의 DataFrame을 반환합니다.
+    encodings의 순서대로 시도해 처음 성공한 인코딩을 사용합니다.
+    """
+    last_error = None
+    for encoding in encodings:
+        try:
+            df = pd.read_csv(
+                io.BytesIO(data),
+                encoding=encoding,
+                thousands=',',
+                dtype={REGION_COLUMN: str}
+            )
+            break
+        except UnicodeDecodeError as e:
+            last_error = e
+    else:
+        raise ValueError(f"지원하는 인코딩({', '.join(encodings)})으로 읽을 수 없는 파일입니다: {last_error}")
+
+    if REGION_COLUMN not in df.columns:
+        raise ValueError(f"'{REGION_COLUMN}' 컬럼이 없는 파일입니다.")
+
+    df[REGION_COLUMN] = df[REGION_COLUMN].str.strip()
+    count_columns = [col for col in df.columns if col != REGION_COLUMN]
+    counts = df[count_columns].apply(pd.to_numeric, errors='coerce').fillna(0).astype(np.int32)
+    return pd.concat([df[[REGION_COLUMN]], counts], axis=1)
@@ -0,0 +1,177 @@
+"""
+행정구역 코드 트리
+
+'경기도 용인시 처인구 포곡읍(4146125000)'처럼 행정구역 이름에 붙은 10자리 행정기관코드로
+시도 → 시군구 → 구 → 읍면동 → 리 계층을 만듭니다.
+- 코드 앞 2자리: 시도, 3~5자리: 시군구(5번째 자리가 0이 아니면 시 아래의 구), 6~8자리: 읍면동, 9~10자리: 리
+- 파일에 없는 상위 지역은 하위 지역의 합계로 채우고, 파일에 있는 지역은 파일의 공식 집계를 그대로 씁니다.
+- 모든 노드의 집계는 트리를 만들 때 한 번에 계산해 두므로, 지역 조회와 비교는 DataFrame을 다시 걸러내지 않습니다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from population.ingest import REGION_COLUMN
+
+REGION_LABEL = re.compile(r'^(?P<name>.*?)\s*\((?P<code>\d{10})\)\s*$')
+NATION_CODE = '1000000000'  # 전국
+LEVEL_NAMES = {0: '전국', 1: '시도', 2: '시군구', 3: '구', 4: '읍면동', 5: '리'}
+
+
+def parse_label(label):
+    """행정구역 문자열 -> (이름, 10자리 코드), 코드가 없으면 (이름, None)"""
+    match = REGION_LABEL.match(str(label))
+    if not match:
+        return str(label).strip(), None
+    return ' '.join(match['name'].split()), match['code']
+
+
+def candidate_parents(code):
+    """가까운 순서의 상위 코드 후보 (파일에 있는 첫 번째 후보가 부모)"""
+    if code == NATION_CODE:
+        return []
+    sido = code[:2] + '0' * 8
+    candidates = []
+    if code[8:] != '00':                       # 리 -> 읍면동
+        candidates.append(code[:8] + '00')
+    if code[5:8] != '000' or code[8:] != '00':  # 읍면동 -> 구/시군구
+        candidates.append(code[:5] + '0' * 5)
+    if code[4] != '0':                          # 구 -> 시
+        candidates.append(code[:4] + '0' * 6)
+    if code != sido:                            # 시군구 -> 시도
+        candidates.append(sido)
+    candidates.append(NATION_CODE)
+    return [c for c in dict.fromkeys(candidates) if c != code]
+
+
+class RegionNode:
+    """행정구역 트리의 노드"""
+    __slots__ = ('code', 'name', 'label', 'parent', 'children', 'position', 'depth', 'derived')
+
+    def __init__(self, code, name, label):
+        self.code = code
+        self.name = name
+        self.label = label  # 원본 파일의 행정구역 문자열 (합계로 만든 노드는 이름(코드))
+        self.parent = None
+        self.children = []
+        self.position = -1  # 집계 행렬에서의 행 번호
+        self.depth = 0
+        self.derived = True  # 파일에 행이 없어 하위 지역 합계로 만든 노드
+
+    @property
+    def short_name(self):
+        """상위 지역 이름을 뺀 이름 (예: '포곡읍')"""
+        if self.parent is not None and self.name.startswith(self.parent.name):
+            return self.name[len(self.parent.name):].strip() or self.name
+        return self.name
+
+    def __repr__(self):
+        return f'RegionNode({self.code}, {self.name!r})'
+
+
+class RegionTree:
+    """코드별 O(1) 조회와 모든 노드의 사전 집계를 가진 행정구역 트리"""
+
+    def __init__(self, df):
+        count_columns = [col for col in df.columns if col != REGION_COLUMN]
+        self.columns = count_columns
+        self.nodes = {}
+        self._by_label = {}
+
+        values = df[count_columns].to_numpy(dtype=np.int64)
+        own_rows = {}
+        for i, label in enumerate(df[REGION_COLUMN]):
+            name, code = parse_label(label)
+            if code is None or code in self.nodes:
+                continue
+            self.nodes[code] = RegionNode(code, name, label)
+            own_rows[code] = i
+
+        # 부모 연결 (파일에 없는 시도/시 노드는 하위 이름에서 만들어 추가)
+        for code in list(self.nodes):
+            self._attach(self.nodes[code])
+
+        self.roots = [n for n in self.nodes.values() if n.parent is None]
+        order = self._preorder()
+        for position, node in enumerate(order):
+            node.position = position
+            node.depth = 0 if node.parent is None else node.parent.depth + 1
+            self._by_label[node.label] = node
+            self._by_label[node.name] = node
+
+        # 사전 집계: 파일 행이 있으면 그대로, 없으면 자식 합계 (깊은 노드부터)
+        aggregates = np.zeros((len(order), len(count_columns)), dtype=np.int64)
+        for node in reversed(order):
+            if node.code in own_rows:
+                aggregates[node.position] = values[own_rows[node.code]]
+                node.derived = False
+            else:
+                for child in node.children:
+                    aggregates[node.position] += aggregates[child.position]
+        self.aggregates = aggregates
+        self.order = order
+
+    def _attach(self, node):
+        for parent_code in candidate_parents(node.code):
+            parent = self.nodes.get(parent_code)
+            if parent is None and parent_code == node.code[:2] + '0' * 8:
+                # 시도 노드가 없으면 이름의 첫 단어로 만들어 둠
+                sido_name = node.name.split()[0]
+                parent = RegionNode(parent_code, sido_name, f'{sido_name} ({parent_code})')
+                self.nodes[parent_code] = parent
+                self._attach(parent)
+            if parent is not None:
+                node.parent = parent
+                parent.children.append(node)
+                return
+
+    def _preorder(self):
+        order = []
+        stack = sorted(self.roots, key=lambda n: n.code, reverse=True)
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            node.children.sort(key=lambda n: n.code)
+            stack.extend(reversed(node.children))
+        return order
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get(self, key):
+        """코드, 원본 행정구역 문자열 또는 이름으로 노드 조회 (없으면 None)"""
+        return self.nodes.get(key) or self._by_label.get(key)
+
+    def path(self, node):
+        """루트부터 노드까지의 경로"""
+        path = []
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        return path[::-1]
+
+    def level_name(self, node):
+        """노드의 행정 단위 이름 (코드 모양 기준)"""
+        code = node.code
+        if code == NATION_CODE:
+            return LEVEL_NAMES[0]
+        if code[2:] == '0' * 8:
+            return LEVEL_NAMES[1]
+        if code[5:] == '0' * 5:
+            return LEVEL_NAMES[3] if node.parent is not None and node.parent.code[2:] != '0' * 8 else LEVEL_NAMES[2]
+        if code[8:] == '00':
+            return LEVEL_NAMES[4]
+        return LEVEL_NAMES[5]
+
+    def values(self, nodes, columns=None):
+        """노드들의 사전 집계 (노드 x 컬럼 DataFrame)"""
+        positions = [n.position for n in nodes]
+        frame = pd.DataFrame(self.aggregates[positions], index=[n.name for n in nodes], columns=self.columns)
+        return frame if columns is None else frame[columns]
+
+    def table(self):
+        """모든 노드의 집계를 원본과 같은 모양(행정구역 + 숫자 컬럼)의 표로 (트리 순서)"""
+        frame = pd.DataFrame(self.aggregates, columns=self.columns)
+        frame.insert(0, REGION_COLUMN, [n.label for n in self.order])
+        return frame
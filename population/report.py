@@ -0,0 +1,312 @@
+"""
+모든 지역의 연령 분포 보고서를 한 번에 만드는 배치 생성기
+
+04_plotlytest 페이지와 같은 차트(population.charts)를 지역마다 그려 HTML로 저장합니다.
+- 지역은 프로세스 풀에 묶음 단위로 나눠 그립니다 (각 작업 프로세스는 시작할 때 연령 인덱스를 한 번만 받음).
+- 지역마다 입력(집계 값, 구간 체계, 이름, 하위 지역, 보고서 형식 버전)의 해시를 manifest.json에 남겨 두고,
+  다시 실행하면 해시가 바뀐 지역만 새로 그립니다. 그린 조각은 .fragments/에 보관해 합본을 만들 때도 재사용합니다.
+- 기본은 지역별 HTML + 같은 폴더의 plotly.min.js(폴더째로 오프라인에서 열림),
+  --inline은 파일마다 plotly.js를 넣은 완전 독립 HTML, --combined는 모든 지역을 담은 파일 하나입니다.
+
+실행: python -m population.report people_gender.csv [--out reports] [--scheme '5세 단위'] [--workers 4] [--combined]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from population.age_index import BUCKET_SCHEMES, ORIGINAL_SCHEME, AgeIndex, age_label
+from population.charts import age_bar_chart
+from population.ingest import parse_population_csv
+from population.regions import RegionTree
+
+REPORT_VERSION = 1  # 보고서 모양을 바꾸면 올려서 모든 지역을 다시 그림
+DEFAULT_SCHEME = '5세 단위'
+CHUNK_SIZE = 32
+# 유소년 / 생산연령 / 고령 인구 구간
+AGE_GROUPS = (('유소년 (0~14세)', 0, 14), ('생산연령 (15~64세)', 15, 64), ('고령 (65세 이상)', 65, 200))
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{script}
+<style>
+body {{ font-family: 'Malgun Gothic', NanumGothic, sans-serif; margin: 2rem auto; max-width: 960px; color: #222; }}
+table {{ border-collapse: collapse; margin: 0.5rem 0 1.5rem; }}
+td, th {{ border: 1px solid #ddd; padding: 0.25rem 0.75rem; text-align: right; }}
+th {{ background: #f5f5f5; }}
+td:first-child, th:first-child {{ text-align: left; }}
+section {{ border-bottom: 1px solid #eee; padding-bottom: 1rem; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+_worker_index = None  # 작업 프로세스마다 한 번 받는 AgeIndex
+_figures = {}  # 구간 체계별 차트 틀 (그림을 새로 만드는 대신 값과 제목만 바꿔 씀)
+
+
+def _init_worker(age_index):
+    global _worker_index
+    _worker_index = age_index
+    _figures.clear()
+
+
+def _chart(labels, values, title):
+    """
+    age_bar_chart와 같은 차트. 프로세스마다 처음 한 번만 만들고 이후에는 값과 제목만 바꿉니다
+    (그림 생성이 지역당 시간의 대부분이라 10배 이상 빨라짐).
+    """
+    key = tuple(labels)
+    fig = _figures.get(key)
+    if fig is None:
+        fig = _figures[key] = age_bar_chart(labels, values, title)
+    else:
+        fig.data[0].y = values
+        fig.layout.title.text = title
+    return fig
+
+
+def region_hash(age_index, task, buckets):
+    """지역 보고서 입력의 해시 (값, 구간, 이름, 하위 지역, 형식 버전)"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(age_index.prefix[age_index.positions[task['label']]]).tobytes())
+    payload = [REPORT_VERSION, buckets, task['title'], task['path'], task['children']]
+    digest.update(json.dumps(payload, ensure_ascii=False).encode())
+    return digest.hexdigest()
+
+
+def _summary_rows(age_index, label, buckets):
+    total = int(age_index.total(label))
+    rows = [('총 인구', f'{total:,}명')]
+    for name, start, end in AGE_GROUPS:
+        count = int(age_index.range_sum(start, end, label))
+        snapped = age_index.snap_range(start, end)
+        if snapped != (start, end):
+            # 파일의 연령 구간이 그룹 경계와 맞지 않으면 실제로 센 범위를 함께 표시
+            name = f'{name} - {snapped[0]}~{age_label(snapped[1])}로 계산'
+        rows.append((name, f'{count:,}명 ({count / total:.1%})' if total else f'{count:,}명'))
+    sums = age_index.bucket_sums(buckets, label)
+    if total:
+        top = int(np.argmax(sums))
+        rows.append(('가장 많은 구간', f'{buckets[top][2]} ({int(sums[top]):,}명)'))
+    return rows
+
+
+def render_fragment(task, buckets, age_index=None):
+    """지역 하나의 보고서 조각 (요약 표 + 연령 분포 차트 + 하위 지역 목록) HTML"""
+    age_index = age_index or _worker_index
+    label = task['label']
+    fig = _chart(
+        [b[2] for b in buckets],
+        age_index.bucket_sums(buckets, label),
+        f"{task['title']} 지역 연령대별 인구 수"
+    )
+    chart = fig.to_html(full_html=False, include_plotlyjs=False, div_id=f"chart-{task['code']}")
+    summary = ''.join(f'<tr><th>{html.escape(k)}</th><td>{html.escape(v)}</td></tr>'
+                      for k, v in _summary_rows(age_index, label, buckets))
+    parts = [
+        f"<section id=\"r{task['code']}\">",
+        f"<h2>{html.escape(task['title'])} <small>({task['code']})</small></h2>",
+        f"<p>{html.escape(' > '.join(task['path']))}</p>",
+        f'<table>{summary}</table>',
+        chart,
+    ]
+    if task['children']:
+        links = ', '.join(f'<a href="{{link:{code}}}">{html.escape(name)}</a>' for code, name in task['children'])
+        parts.append(f'<p>하위 지역: {links}</p>')
+    parts.append('</section>')
+    return '\n'.join(parts)
+
+
+def _render_chunk(args):
+    tasks, buckets = args
+    return [(task['code'], render_fragment(task, buckets)) for task in tasks]
+
+
+def _atomic_write(path, text):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _links(fragment, combined):
+    """조각 안의 하위 지역 링크 자리를 파일 링크 또는 합본 안의 앵커로"""
+    marker = '{link:'
+    out, position = [], 0
+    while True:
+        start = fragment.find(marker, position)
+        if start < 0:
+            out.append(fragment[position:])
+            return ''.join(out)
+        end = fragment.index('}', start)
+        code = fragment[start + len(marker):end]
+        out.append(fragment[position:start])
+        out.append(f'#r{code}' if combined else f'{code}.html')
+        position = end + 1
+
+
+def build_reports(data, out_dir, scheme=DEFAULT_SCHEME, workers=None, combined=False, inline=False,
+                  force=False, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    인구 CSV 바이트로 모든 지역 보고서를 만듭니다.
+    반환값: {'rendered': 새로 그린 지역 수, 'skipped': 건너뛴 지역 수, 'seconds': 걸린 시간, 'output': 경로}
+    """
+    started = time.perf_counter()
+    out_dir = Path(out_dir)
+    fragments_dir = out_dir / '.fragments'
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+
+    tree = RegionTree(parse_population_csv(data))
+    if len(tree) == 0:
+        raise ValueError("행정구역에 10자리 행정기관코드가 있는 파일만 사용할 수 있습니다.")
+    age_index = AgeIndex.from_table(tree.table())
+    if scheme not in age_index.schemes():
+        raise ValueError(f"'{scheme}' 구간은 이 파일의 연령 구간으로 나눌 수 없습니다. "
+                         f"사용할 수 있는 구간: {', '.join(age_index.schemes())}")
+    buckets = age_index.bins if scheme == ORIGINAL_SCHEME else BUCKET_SCHEMES[scheme]
+    buckets = [tuple(b) for b in buckets]
+
+    tasks = []
+    for node in tree.order:
+        tasks.append({
+            'code': node.code,
+            'label': node.label,
+            'title': node.name,
+            'path': [n.short_name for n in tree.path(node)],
+            'children': [(c.code, c.short_name) for c in node.children],
+        })
+
+    # manifest.json: {'mode': 마지막 출력 방식, 'regions': {코드: 입력 해시}}
+    manifest_path = out_dir / 'manifest.json'
+    manifest = {'mode': None, 'regions': {}}
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text())
+    mode = 'combined' if combined else 'pages'
+    mode += '-inline' if inline else ''
+    mode_changed = manifest['mode'] != mode
+    manifest['mode'] = mode
+    hashes = {task['code']: region_hash(age_index, task, buckets) for task in tasks}
+    todo = [task for task in tasks
+            if manifest['regions'].get(task['code']) != hashes[task['code']]
+            or not (fragments_dir / f"{task['code']}.html").exists()]
+
+    chunks = [(todo[i:i + chunk_size], buckets) for i in range(0, len(todo), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(age_index,)) as pool:
+            for results in pool.map(_render_chunk, chunks):
+                done += _save_fragments(fragments_dir, results, manifest['regions'], hashes)
+                if progress:
+                    progress(done, len(todo))
+    else:
+        _init_worker(age_index)
+        for chunk in chunks:
+            done += _save_fragments(fragments_dir, _render_chunk(chunk), manifest['regions'], hashes)
+            if progress:
+                progress(done, len(todo))
+    _atomic_write(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1))
+
+    # 출력 방식이 바뀌면 (조각은 그대로 두고) 모든 페이지를 다시 씀
+    changed = {t['code'] for t in (tasks if mode_changed else todo)}
+    output = _write_pages(out_dir, fragments_dir, tasks, changed, combined, inline)
+    return {
+        'rendered': len(todo),
+        'skipped': len(tasks) - len(todo),
+        'seconds': time.perf_counter() - started,
+        'output': output,
+    }
+
+
+def _save_fragments(fragments_dir, results, region_hashes, hashes):
+    for code, fragment in results:
+        _atomic_write(fragments_dir / f'{code}.html', fragment)
+        region_hashes[code] = hashes[code]
+    return len(results)
+
+
+def _plotly_script(inline):
+    from plotly.offline import get_plotlyjs
+    if inline:
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    return '<script src="plotly.min.js"></script>'
+
+
+def _write_pages(out_dir, fragments_dir, tasks, changed, combined, inline):
+    """조각을 지역별 파일 또는 합본 파일로 (지역별 파일은 바뀐 지역과 없는 파일만 다시 씀)"""
+    if not inline:
+        from plotly.offline import get_plotlyjs
+        js_path = out_dir / 'plotly.min.js'
+        if not js_path.exists():
+            _atomic_write(js_path, get_plotlyjs())
+
+    toc = '\n'.join(
+        f"<li style=\"margin-left: {1.5 * (len(t['path']) - 1)}rem\">"
+        f"<a href=\"{{link:{t['code']}}}\">{html.escape(t['path'][-1])}</a></li>"
+        for t in tasks
+    )
+    if combined:
+        sections = [(fragments_dir / f"{t['code']}.html").read_text(encoding='utf-8') for t in tasks]
+        body = '<h1>지역별 연령 분포 보고서</h1>\n<ul>' + toc + '</ul>\n' + '\n'.join(sections)
+        output = out_dir / 'report.html'
+        _atomic_write(output, PAGE_TEMPLATE.format(
+            title='지역별 연령 분포 보고서', script=_plotly_script(inline), body=_links(body, combined=True)
+        ))
+        return output
+
+    script = _plotly_script(inline)
+    for task in tasks:
+        path = out_dir / f"{task['code']}.html"
+        if task['code'] not in changed and path.exists():
+            continue
+        fragment = (fragments_dir / f"{task['code']}.html").read_text(encoding='utf-8')
+        body = '<p><a href="index.html">← 전체 목록</a></p>\n' + _links(fragment, combined=False)
+        _atomic_write(path, PAGE_TEMPLATE.format(title=html.escape(task['title']), script=script, body=body))
+
+    output = out_dir / 'index.html'
+    _atomic_write(output, PAGE_TEMPLATE.format(
+        title='지역별 연령 분포 보고서', script='',
+        body='<h1>지역별 연령 분포 보고서</h1>\n<ul>' + _links(toc, combined=False) + '</ul>'
+    ))
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='인구 CSV 파일 (행정구역 + 연령별 인구 컬럼)')
+    parser.add_argument('--out', default='reports', help='출력 폴더 (기본: reports)')
+    parser.add_argument('--scheme', default=DEFAULT_SCHEME, choices=[ORIGINAL_SCHEME] + list(BUCKET_SCHEMES),
+                        help='연령 구간 체계')
+    parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--combined', action='store_true', help='모든 지역을 report.html 한 파일로')
+    parser.add_argument('--inline', action='store_true', help='plotly.js를 HTML 안에 넣어 파일 하나로 열리게')
+    parser.add_argument('--force', action='store_true', help='바뀌지 않은 지역도 모두 다시 그림')
+    args = parser.parse_args()
+
+    def progress(done, total):
+        print(f'\r{done}/{total} 지역', end='', flush=True)
+
+    result = build_reports(
+        Path(args.input).read_bytes(), args.out, scheme=args.scheme, workers=args.workers,
+        combined=args.combined, inline=args.inline, force=args.force, progress=progress
+    )
+    print(f"\n새로 그림 {result['rendered']}개, 건너뜀 {result['skipped']}개, "
+          f"{result['seconds']:.1f}초 -> {result['output']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+행정구역 검색 인덱스
+
+지역 이름/코드를 서버에서 검색해 상위 K개만 위젯에 보냅니다 (수천 개 전체 목록을 매번 브라우저로 보내지 않음).
+- 접두어: '용인', '기흥' 처럼 이름의 각 단어 또는 전체 이름의 앞부분 (정렬된 키에서 이진 탐색)
+- 초성: 'ㅇㅇㅅ' -> 용인시, 'ㄱㅎㄱ' -> 기흥구
+- 부분 문자열: '흥구', '덕1' 처럼 이름 중간 (1/2-gram 역색인으로 후보를 좁힌 뒤 확인)
+- 코드: '41463' 처럼 숫자로 시작하면 행정기관코드 접두어
+인덱스는 데이터셋마다 한 번 만들고 (st.cache_resource) 검색은 사전/이진 탐색만 사용합니다.
+"""
+from bisect import bisect_left
+
+import numpy as np
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+DEFAULT_LIMIT = 20
+
+# 점수가 낮을수록 먼저 (같은 점수면 상위 행정구역, 코드 순)
+EXACT, PREFIX, CHOSUNG_PREFIX, SUBSTRING, CHOSUNG_SUBSTRING, CODE_PREFIX = range(6)
+
+
+def chosung(text):
+    """한글 음절을 초성으로 바꾼 문자열 (한글이 아닌 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            result.append(CHOSUNG[(code - HANGUL_FIRST) // 588])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def is_chosung_query(query):
+    return all(ch in CHOSUNG for ch in query)
+
+
+def _normalize(text):
+    return ''.join(str(text).split()).lower()
+
+
+class RegionSearchIndex:
+    """행정구역 트리 노드에 대한 접두어/초성/n-gram 검색 인덱스"""
+
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self._names = [_normalize(n.name) for n in self.nodes]
+        self._chosung = [chosung(name) for name in self._names]
+        # 같은 점수 안의 순서 (상위 행정구역, 코드 순)를 정수 하나로
+        order = sorted(range(len(self.nodes)), key=lambda i: (self.nodes[i].depth, self.nodes[i].code))
+        self._rank = np.empty(len(self.nodes), dtype=np.int64)
+        self._rank[order] = np.arange(len(self.nodes))
+
+        # 이름 전체 또는 마지막 단어가 정확히 같은 노드
+        self._exact = {}
+        for i, node in enumerate(self.nodes):
+            for key in {self._names[i], _normalize(node.short_name)}:
+                self._exact.setdefault(key, []).append(i)
+
+        # 접두어 키: 각 단어, 단어 i부터 끝까지 이어 붙인 이름 (예: '기흥구영덕1동', 전체 이름 포함)
+        prefix_keys, chosung_keys = [], []
+        for i, node in enumerate(self.nodes):
+            words = [_normalize(w) for w in node.name.split()]
+            keys = {''.join(words[j:]) for j in range(len(words))} | set(words)
+            prefix_keys.extend((key, i) for key in keys)
+            chosung_keys.extend((chosung(key), i) for key in keys)
+        self._prefix = self._sorted_keys(prefix_keys)
+        self._chosung_prefix = self._sorted_keys(chosung_keys)
+        self._codes = self._sorted_keys([(n.code, i) for i, n in enumerate(self.nodes)])
+
+        # 1/2-gram 역색인 (이름과 초성의 부분 문자열 검색 후보)
+        self._grams = self._gram_index(self._names)
+        self._chosung_grams = self._gram_index(self._chosung)
+
+    @staticmethod
+    def _sorted_keys(pairs):
+        """(키, 번호) 목록 -> (정렬된 키 목록, 같은 순서의 번호 배열)"""
+        pairs.sort()
+        return [k for k, _ in pairs], np.array([i for _, i in pairs], dtype=np.int64)
+
+    @staticmethod
+    def _gram_index(texts):
+        index = {}
+        for i, text in enumerate(texts):
+            grams = set(text)
+            grams.update(text[j:j + 2] for j in range(len(text) - 1))
+            for gram in grams:
+                index.setdefault(gram, set()).add(i)
+        return index
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def _prefix_range(sorted_keys, query):
+        """query로 시작하는 키의 번호 배열 (이진 탐색 두 번 + 슬라이스)"""
+        keys, ids = sorted_keys
+        start = bisect_left(keys, query)
+        end = bisect_left(keys, query + '\uffff', lo=start)
+        return ids[start:end]
+
+    @staticmethod
+    def _candidates(index, query):
+        """n-gram 역색인으로 query를 부분 문자열로 가질 수 있는 노드 번호 집합"""
+        grams = [query[j:j + 2] for j in range(len(query) - 1)] or [query]
+        postings = sorted((index.get(g, set()) for g in grams), key=len)
+        if not postings or not postings[0]:
+            return set()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """query와 맞는 노드를 점수 순으로 최대 limit개"""
+        query = _normalize(query)
+        if not query:
+            return []
+        n = len(self.nodes)
+        # 노드별 정렬 키 = 점수 * n + 순위 (일치하지 않으면 큰 값), 나쁜 점수부터 덮어씀
+        keys = np.full(n, (CODE_PREFIX + 1) * n, dtype=np.int64)
+
+        def hit(ids, score):
+            ids = np.asarray(ids, dtype=np.int64)
+            keys[ids] = np.minimum(keys[ids], score * n + self._rank[ids])
+
+        # 접두어 일치가 이미 limit개 이상이면 점수가 더 나쁜 부분 문자열 검색은 건너뜀
+        if query.isdigit():
+            hit(self._prefix_range(self._codes, query), CODE_PREFIX)
+        elif is_chosung_query(query):
+            prefix = self._prefix_range(self._chosung_prefix, query)
+            hit(prefix, CHOSUNG_PREFIX)
+            if len(prefix) < limit:
+                hit([i for i in self._candidates(self._chosung_grams, query) if query in self._chosung[i]],
+                    CHOSUNG_SUBSTRING)
+        else:
+            prefix = self._prefix_range(self._prefix, query)
+            hit(prefix, PREFIX)
+            hit(self._exact.get(query, []), EXACT)
+            if len(prefix) < limit:
+                hit([i for i in self._candidates(self._grams, query) if query in self._names[i]], SUBSTRING)
+
+        matched = np.flatnonzero(keys < (CODE_PREFIX + 1) * n)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(keys[matched], limit)[:limit]]
+        matched = matched[np.argsort(keys[matched], kind='stable')]
+        return [self.nodes[i] for i in matched]
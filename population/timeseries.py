@@ -0,0 +1,318 @@
+"""
+월별 주민등록 인구 시계열 저장소
+
+컬럼 이름에 기준 월이 들어 있는 인구 파일('2025년05월_남_0세' ...)을 여러 개 받아
+(행정구역 코드, 월, 성별, 나이) 키의 긴(long) 형태로 Parquet에 추가만 하는(append-only) 저장소입니다.
+- 파일은 청크 단위로 읽어 바로 기록하므로, 여러 달치 파일 전체를 넓은 DataFrame으로 메모리에 올리지 않습니다.
+- 파일마다 (월, 성별)별 Parquet 파트(parts/월-성별-파일해시.parquet)를 쓰고, 새 달을 추가할 때는 그 파일만 파싱합니다.
+  같은 내용의 파일은 해시로 건너뜁니다. 이미 있는 (월, 성별)에 다른 파일이 들어오면 파트를 목록에 덧붙이고,
+  조회할 때 새 파일에 있는 지역만 새 값으로 덮습니다 (새 파일에 없는 지역은 이전 파일 값 유지, 파트는 지우지 않음).
+- 조회는 성별/나이/지역 조건을 Parquet 읽기에 넘겨(필터 푸시다운) 필요한 행만 읽습니다.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from population.age_index import AGE_COLUMN, MAX_AGE
+from population.ingest import REGION_COLUMN, detect_encoding
+from population.regions import parse_label
+from shared.paths import data_dir
+
+DEFAULT_ROOT = data_dir('population_ts')
+SEX_CODES = {'계': 0, '남': 1, '여': 2}
+CHUNK_ROWS = 2000
+HASH_BLOCK = 1 << 20
+
+SCHEMA = pa.schema([
+    ('code', pa.int64()),     # 10자리 행정기관코드
+    ('month', pa.int32()),    # YYYYMM
+    ('sex', pa.int8()),       # SEX_CODES
+    ('age', pa.int16()),      # 구간 시작 나이
+    ('age_hi', pa.int16()),   # 구간 끝 나이 (1세 단위면 age와 같음, '100세 이상'은 MAX_AGE)
+    ('count', pa.int32()),
+])
+
+
+def parse_month(text):
+    """'2025년05월' -> 202505"""
+    return int(text[:4]) * 100 + int(text[5:7])
+
+
+def month_label(month):
+    """202505 -> '2025-05'"""
+    return f'{month // 100}-{month % 100:02d}'
+
+
+def _open_binary(source):
+    """경로, 바이트 또는 바이너리 파일 객체를 처음 위치의 파일 객체로"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb')
+    source.seek(0)
+    return source
+
+
+def _stream_hash(f):
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(HASH_BLOCK), b''):
+        digest.update(block)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def _column_layout(columns):
+    """
+    머리글의 연령 컬럼을 월별로 묶습니다.
+    반환값: {월: [(컬럼 이름, 성별 코드, 시작 나이, 끝 나이)]}
+    남/여만 있는 달은 남 + 여로 '계'를 만들 수 있도록 ('계' 컬럼 없이) 그대로 둡니다.
+    """
+    layout = {}
+    for col in columns:
+        match = AGE_COLUMN.match(col)
+        if not match:
+            continue
+        lo = int(match['lo'])
+        hi = int(match['hi']) if match['hi'] else lo
+        if match['over']:
+            hi = max(hi, MAX_AGE)
+        layout.setdefault(parse_month(match['month']), []).append((col, SEX_CODES[match['sex']], lo, hi))
+    return layout
+
+
+def _long_tables(codes, values, layout):
+    """청크(지역 x 컬럼 값)를 성별마다 (코드, 나이) 긴 형태의 Arrow 테이블로 나눔: [(성별 코드, 테이블)]"""
+    sexes = np.array([c[1] for c in layout], dtype=np.int8)
+    lo = np.array([c[2] for c in layout], dtype=np.int16)
+    hi = np.array([c[3] for c in layout], dtype=np.int16)
+
+    if SEX_CODES['계'] not in sexes:
+        male, female = sexes == SEX_CODES['남'], sexes == SEX_CODES['여']
+        if male.any() and np.array_equal(lo[male], lo[female]) and np.array_equal(hi[male], hi[female]):
+            values = np.concatenate([values, values[:, male] + values[:, female]], axis=1)
+            sexes = np.concatenate([sexes, np.full(male.sum(), SEX_CODES['계'], dtype=np.int8)])
+            lo = np.concatenate([lo, lo[male]])
+            hi = np.concatenate([hi, hi[male]])
+
+    tables = []
+    for sex in np.unique(sexes):
+        columns = sexes == sex
+        n_rows, n_cols = values.shape[0], int(columns.sum())
+        tables.append((int(sex), pa.table({
+            'code': np.repeat(codes, n_cols),
+            'sex': np.full(n_rows * n_cols, sex, dtype=np.int8),
+            'age': np.tile(lo[columns], n_rows),
+            'age_hi': np.tile(hi[columns], n_rows),
+            'count': values[:, columns].astype(np.int32).ravel(),
+        })))
+    return tables
+
+
+class PopulationTimeSeries:
+    """월별 인구 파일을 추가만 하는 Parquet 시계열 저장소"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = Path(root)
+        (self.root / 'parts').mkdir(parents=True, exist_ok=True)
+        (self.root / 'regions').mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------- 목록
+
+    def _manifest_path(self):
+        return self.root / 'manifest.json'
+
+    def manifest(self):
+        """{'files': {해시: {'name', 'months'}}, 'parts': {'월-성별 코드': [파트 파일 (수집 순서)]}}"""
+        path = self._manifest_path()
+        if not path.exists():
+            return {'files': {}, 'parts': {}}
+        manifest = json.loads(path.read_text())
+        # (월, 성별)마다 파트 하나만 두던 이전 형식도 읽음
+        manifest['parts'] = {key: [parts] if isinstance(parts, str) else parts
+                             for key, parts in manifest['parts'].items()}
+        return manifest
+
+    def _write_manifest(self, manifest):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.manifest.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._manifest_path())
+
+    def months(self):
+        """저장된 월 목록 (오름차순, YYYYMM 정수)"""
+        return sorted({int(key.split('-')[0]) for key in self.manifest()['parts']})
+
+    @property
+    def version(self):
+        """저장소 내용이 바뀔 때마다 달라지는 값 (조회 결과 캐시 키로 사용)"""
+        path = self._manifest_path()
+        return path.stat().st_mtime_ns if path.exists() else 0
+
+    # ---------------------------------------------------------------- 수집
+
+    def ingest(self, source, name=None, chunk_rows=CHUNK_ROWS):
+        """
+        인구 파일 하나를 청크 단위로 읽어 월별 파트 파일로 추가합니다.
+        이미 수집한 내용(해시가 같은 파일)이면 아무것도 하지 않고 빈 목록을 반환합니다.
+        반환값: 새로 추가(또는 일부 지역을 갱신)한 월 목록
+        """
+        f = _open_binary(source)
+        try:
+            file_hash = _stream_hash(f)
+            if file_hash in self.manifest()['files']:
+                return []
+            encoding = detect_encoding(f.read(HASH_BLOCK))
+            f.seek(0)
+            with self._lock:
+                parts, names = self._write_parts(f, encoding, file_hash, chunk_rows)
+                self._commit(file_hash, name, parts, names)
+        finally:
+            if isinstance(source, (str, os.PathLike)):
+                f.close()
+        return sorted({int(key.split('-')[0]) for key in parts})
+
+    def _write_parts(self, f, encoding, file_hash, chunk_rows):
+        text = io.TextIOWrapper(f, encoding=encoding, newline='')
+        reader = pd.read_csv(text, thousands=',', dtype={REGION_COLUMN: str}, chunksize=chunk_rows)
+        writers, names = {}, {}
+        try:
+            for chunk in reader:
+                if REGION_COLUMN not in chunk.columns:
+                    raise ValueError(f"'{REGION_COLUMN}' 컬럼이 없는 파일입니다.")
+                layout = _column_layout(chunk.columns)
+                if not layout:
+                    raise ValueError("'2025년05월_계_0세' 같은 월별 연령 컬럼이 없는 파일입니다.")
+
+                parsed = [parse_label(label) for label in chunk[REGION_COLUMN]]
+                keep = np.array([code is not None for _, code in parsed], dtype=bool)
+                codes = np.array([int(code) for _, code in parsed if code is not None], dtype=np.int64)
+                for region_name, code in parsed:
+                    if code is not None:
+                        names[int(code)] = region_name
+
+                for month, columns in layout.items():
+                    values = (chunk.loc[keep, [c[0] for c in columns]]
+                              .apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=np.int64))
+                    for sex, table in _long_tables(codes, values, columns):
+                        table = table.add_column(1, 'month', pa.array(np.full(len(table), month, dtype=np.int32)))
+                        key = f'{month}-{sex}'
+                        if key not in writers:
+                            fd, tmp_path = tempfile.mkstemp(dir=self.root / 'parts', prefix=f'.{key}.', suffix='.tmp')
+                            os.close(fd)
+                            writers[key] = (pq.ParquetWriter(tmp_path, SCHEMA, compression='zstd'), tmp_path)
+                        writers[key][0].write_table(table.cast(SCHEMA))
+        except BaseException:
+            for writer, tmp_path in writers.values():
+                writer.close()
+                os.remove(tmp_path)
+            raise
+        finally:
+            text.detach()  # 업로드 파일 객체는 호출한 쪽에서 계속 쓸 수 있도록 닫지 않음
+
+        parts = {}
+        for key, (writer, tmp_path) in writers.items():
+            writer.close()
+            part = f'parts/{key}-{file_hash[:16]}.parquet'
+            os.replace(tmp_path, self.root / part)
+            parts[key] = part
+        return parts, names
+
+    def _commit(self, file_hash, name, parts, names):
+        """지역 이름 파일과 목록을 갱신 (목록을 바꾸는 순간 새 파트가 보이기 시작함)"""
+        regions = pa.table({
+            'code': pa.array(list(names), pa.int64()),
+            'name': pa.array(list(names.values()), pa.string()),
+        })
+        pq.write_table(regions, self.root / 'regions' / f'{file_hash[:16]}.parquet')
+
+        manifest = self.manifest()
+        months = sorted({int(key.split('-')[0]) for key in parts})
+        manifest['files'][file_hash] = {'name': name, 'months': months}
+        for key, part in parts.items():
+            manifest['parts'].setdefault(key, []).append(part)
+        self._write_manifest(manifest)
+
+    # ---------------------------------------------------------------- 조회
+
+    def regions(self):
+        """코드 -> 이름 (나중에 수집한 파일의 이름 우선)"""
+        files = sorted((self.root / 'regions').glob('*.parquet'), key=lambda p: p.stat().st_mtime_ns)
+        names = {}
+        for path in files:
+            table = pq.read_table(path)
+            names.update(zip(table['code'].to_pylist(), table['name'].to_pylist()))
+        return names
+
+    def labels(self):
+        """행정구역 트리를 만들 수 있는 '이름(코드)' 표"""
+        names = self.regions()
+        return pd.DataFrame({REGION_COLUMN: [f'{name}({code:010d})' for code, name in sorted(names.items())]})
+
+    def _part_groups(self, sex, months):
+        """성별과 월(None이면 전부)에 해당하는 (월, 성별)별 파트 목록 (다른 성별의 파일은 열지 않음)"""
+        suffix = f'-{SEX_CODES[sex]}'
+        wanted = None if months is None else {int(m) for m in months}
+        return [parts for key, parts in sorted(self.manifest()['parts'].items())
+                if key.endswith(suffix) and (wanted is None or int(key.split('-')[0]) in wanted)]
+
+    def _part_codes(self, part):
+        """파트를 만든 파일에 들어 있던 지역 코드 (수집할 때 쓴 지역 이름 파일에서 읽음)"""
+        file_key = Path(part).stem.rsplit('-', 1)[1]
+        return pq.read_table(self.root / 'regions' / f'{file_key}.parquet', columns=['code'])['code'].combine_chunks()
+
+    def _read(self, sex, months, condition, columns):
+        """
+        조건에 맞는 행을 읽음. (월, 성별)마다 가장 나중 파트는 그대로, 이전 파트는 그 뒤 파일에 있는 지역을 빼고 읽어
+        같은 달에 여러 파일이 들어와도 지역마다 가장 나중 값 하나만 남깁니다. 읽을 파트가 없으면 None
+        """
+        groups = self._part_groups(sex, months)
+        if not groups:
+            return None
+        latest = [str(self.root / parts[-1]) for parts in groups]
+        tables = [pq.ParquetDataset(latest, filters=condition).read(columns=columns)]
+        for parts in groups:
+            newer = self._part_codes(parts[-1])
+            for part in reversed(parts[:-1]):
+                kept = condition & ~pc.field('code').isin(newer)
+                tables.append(pq.read_table(self.root / part, filters=kept, columns=columns))
+                newer = pa.concat_arrays([newer, self._part_codes(part)])
+        return pa.concat_tables(tables)
+
+    def series(self, codes=None, sex='계', start_age=0, end_age=MAX_AGE, months=None):
+        """
+        월 x 지역 인구 표 (start_age ~ end_age와 겹치는 연령 구간의 합).
+        범위 끝이 파일의 연령 구간 중간에 걸리면 그 구간을 통째로 포함하며(AgeIndex.snap_range와 같은 방식),
+        실제로 합한 범위는 result.attrs['age_range']에 (시작, 끝)으로 남깁니다.
+        codes가 None이면 모든 지역, months가 None이면 저장된 모든 달.
+        """
+        condition = (pc.field('age') <= end_age) & (pc.field('age_hi') >= start_age)
+        if codes is not None:
+            condition &= pc.field('code').isin([int(c) for c in codes])
+        table = self._read(sex, months, condition, ['code', 'month', 'age', 'age_hi', 'count'])
+        if table is None or table.num_rows == 0:
+            return pd.DataFrame(dtype=np.int64)
+        summed = table.group_by(['month', 'code']).aggregate([('count', 'sum')]).to_pandas()
+        result = summed.pivot(index='month', columns='code', values='count_sum').fillna(0).astype(np.int64)
+        result = result.sort_index()
+        result.attrs['age_range'] = (min(start_age, pc.min(table['age']).as_py()),
+                                     max(end_age, pc.max(table['age_hi']).as_py()))
+        return result
+
+    def age_profile(self, code, sex='계', months=None):
+        """지역 하나의 월 x 연령 구간 인구 (열: 구간 시작 나이)"""
+        table = self._read(sex, months, pc.field('code') == int(code), ['month', 'age', 'count'])
+        if table is None:
+            return pd.DataFrame(dtype=np.int64)
+        return (table.to_pandas().pivot_table(index='month', columns='age', values='count', aggfunc='sum')
+                .fillna(0).astype(np.int64).sort_index())
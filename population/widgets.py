@@ -0,0 +1,52 @@
+"""
+인구 페이지에서 함께 쓰는 Streamlit 위젯
+"""
+import streamlit as st
+
+
+def select_region(tree, key_prefix='region_depth'):
+    """시도 → 시군구 → 구 → 읍면동 순으로 좁혀가며 지역 선택"""
+    selected = None
+    children = tree.roots
+    depth = 0
+    cols = st.columns(4)
+    while children:
+        # 최상위는 반드시 하나를 고르고, 그 아래부터는 '(전체)'로 멈출 수 있음
+        options = [c.code for c in children] if selected is None else [None] + [c.code for c in children]
+        code = cols[depth % 4].selectbox(
+            f"📍 {tree.level_name(children[0])}",
+            options,
+            index=1 if selected is not None and len(children) == 1 else 0,  # 하위 지역이 하나면 바로 선택
+            format_func=lambda c: '(전체)' if c is None else tree.get(c).short_name,
+            key=f"{key_prefix}_{depth}"
+        )
+        if code is None:
+            break
+        selected = tree.get(code)
+        children = selected.children
+        depth += 1
+    return selected
+
+
+def search_region(tree, index, key_prefix='region_search', limit=20):
+    """
+    이름/초성/코드로 검색해 지역 선택 (검색 결과 상위 limit개만 위젯으로 보냄).
+    검색어가 없거나 결과가 없으면 시도부터 좁혀가는 선택으로 대신합니다.
+    """
+    query = st.text_input(
+        "🔎 지역 검색 (이름, 초성, 행정기관코드)",
+        placeholder="예: 기흥, ㄱㅎㄱ, 41463",
+        key=f"{key_prefix}_query"
+    )
+    if query.strip():
+        matches = index.search(query, limit)
+        if matches:
+            code = st.selectbox(
+                f"🔎 검색 결과 (상위 {len(matches)}개)",
+                [n.code for n in matches],
+                format_func=lambda c: tree.get(c).name,
+                key=f"{key_prefix}_result"
+            )
+            return tree.get(code)
+        st.warning(f"⚠️ '{query}'와 일치하는 지역이 없습니다.")
+    return select_region(tree, key_prefix=f"{key_prefix}_depth")
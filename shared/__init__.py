@@ -0,0 +1 @@
+"""모든 페이지가 함께 쓰는 지연 import, 세션 공유 데이터 캐시, 실행 시간 추적, 저장소 위치 모듈"""
@@ -0,0 +1,182 @@
+"""
+세션 공유 데이터 캐시 (메모리 예산 + LRU 제거)
+
+페이지마다 st.cache_resource(max_entries=N)로 따로 들고 있던 파싱 결과/인덱스/조회 결과를
+프로세스에 하나뿐인 DataCache에 (이름공간, 키)로 모아 둡니다.
+- 항목을 넣을 때 크기(bytes)를 어림해 전체 합이 예산(APP_CACHE_MB, 기본 512MB)을 넘으면
+  가장 오래 쓰지 않은 항목부터 제거합니다. 항목 수가 아니라 메모리로 제한하므로 큰 파일 몇 개와
+  작은 조회 결과 여러 개가 같은 예산을 나눠 씁니다.
+- 같은 키를 여러 세션이 동시에 요청하면 한 세션만 만들고 나머지는 그 결과를 기다립니다.
+- 예산보다 큰 항목은 저장하지 않고 만든 값만 돌려줍니다.
+numpy/pandas는 이미 import된 경우에만 크기 계산에 사용하므로 이 모듈 자체는 가볍습니다.
+"""
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+
+DEFAULT_BUDGET_MB = 512
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_MISSING = object()
+
+
+def estimate_size(value):
+    """
+    값이 차지하는 메모리(bytes) 어림값.
+    numpy 배열은 데이터 크기(메모리 맵은 파일이 페이지 캐시에 있으므로 머리 부분만),
+    pandas 객체는 memory_usage(deep=True), 그 밖의 객체는 속성/요소를 따라가며 sys.getsizeof를 더합니다.
+    같은 객체는 한 번만 셉니다.
+    """
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        if np is not None and isinstance(obj, np.ndarray):
+            total += sys.getsizeof(obj)  # 데이터를 가진 배열이면 데이터 크기 포함
+            if not isinstance(obj, np.memmap) and obj.base is not None:
+                stack.append(obj.base)  # 뷰는 원본 배열을 한 번만 셈
+            if obj.dtype == object:
+                stack.extend(obj.ravel().tolist())
+            continue
+        if pd is not None and isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = obj.memory_usage(deep=True)
+            total += int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+            continue
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)):
+            continue
+        if isinstance(obj, memoryview):
+            total += obj.nbytes
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            attrs = getattr(obj, '__dict__', None)
+            if attrs is not None:
+                stack.append(attrs)
+            for cls in type(obj).__mro__:
+                for name in cls.__dict__.get('__slots__', ()):
+                    slot = getattr(obj, name, None)
+                    if slot is not None:
+                        stack.append(slot)
+    return total
+
+
+class CacheNamespace:
+    """DataCache의 한 이름공간을 dict처럼 쓰는 보기 (get / [] = / in / clear)"""
+
+    def __init__(self, cache, name):
+        self.cache = cache
+        self.name = name
+
+    def get(self, key, default=None):
+        return self.cache.get(self.name, key, default)
+
+    def __setitem__(self, key, value):
+        self.cache.put(self.name, key, value)
+
+    def __contains__(self, key):
+        return self.cache.get(self.name, key, _MISSING, count=False) is not _MISSING
+
+    def __len__(self):
+        return self.cache.stats().get(self.name, {}).get('entries', 0)
+
+    def clear(self):
+        self.cache.clear(self.name)
+
+
+class DataCache:
+    """(이름공간, 키) -> 값을 메모리 예산 안에서 LRU로 보관하는 스레드 안전 캐시"""
+
+    def __init__(self, budget_bytes):
+        self.budget = budget_bytes
+        self.used = 0
+        self._entries = OrderedDict()  # (이름공간, 키) -> (값, 크기), 오래 안 쓴 것부터
+        self._building = {}            # (이름공간, 키) -> 만드는 중인 세션이 잡은 잠금
+        self._counters = {}            # 이름공간 -> [적중, 실패, 제거]
+        self._lock = threading.Lock()
+
+    def _count(self, namespace, which):
+        self._counters.setdefault(namespace, [0, 0, 0])[which] += 1
+
+    def get(self, namespace, key, default=None, count=True):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                if count:
+                    self._count(namespace, 1)
+                return default
+            self._entries.move_to_end((namespace, key))
+            if count:
+                self._count(namespace, 0)
+            return entry[0]
+
+    def put(self, namespace, key, value, size=None):
+        """값을 넣고 예산을 넘으면 오래된 항목부터 제거. 예산보다 큰 값은 넣지 않고 False"""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            old = self._entries.pop((namespace, key), None)
+            if old is not None:
+                self.used -= old[1]
+            if size > self.budget:
+                return False
+            self._entries[(namespace, key)] = (value, size)
+            self.used += size
+            while self.used > self.budget:
+                (evicted_namespace, _), (_, evicted_size) = self._entries.popitem(last=False)
+                self.used -= evicted_size
+                self._count(evicted_namespace, 2)
+        return True
+
+    def get_or_build(self, namespace, key, build):
+        """
+        캐시된 값이 있으면 (값, True), 없으면 build()로 만들어 넣고 (값, False).
+        같은 키를 동시에 만들지 않도록 키별 잠금을 잡고, 잠금을 얻은 뒤 다시 확인합니다.
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING:
+            return value, True
+        with self._lock:
+            build_lock = self._building.setdefault((namespace, key), threading.Lock())
+        with build_lock:
+            try:
+                value = self.get(namespace, key, _MISSING, count=False)
+                if value is not _MISSING:
+                    return value, True
+                value = build()
+                self.put(namespace, key, value)
+                return value, False
+            finally:
+                with self._lock:
+                    self._building.pop((namespace, key), None)
+
+    def namespace(self, name):
+        return CacheNamespace(self, name)
+
+    def clear(self, namespace=None):
+        with self._lock:
+            for k in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                self.used -= self._entries.pop(k)[1]
+
+    def stats(self):
+        """이름공간 -> {'entries', 'bytes', 'hits', 'misses', 'evictions'}"""
+        with self._lock:
+            result = {name: {'entries': 0, 'bytes': 0, 'hits': hits, 'misses': misses, 'evictions': evictions}
+                      for name, (hits, misses, evictions) in self._counters.items()}
+            for (name, _), (_, size) in self._entries.items():
+                row = result.setdefault(name, {'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 0, 'evictions': 0})
+                row['entries'] += 1
+                row['bytes'] += size
+        return result
+
+
+DATA_CACHE = DataCache(int(float(os.environ.get('APP_CACHE_MB', DEFAULT_BUDGET_MB)) * 1024 * 1024))
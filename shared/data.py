@@ -0,0 +1,125 @@
+"""
+페이지 공용 데이터 계층
+
+파일 읽기와 인구 데이터(파싱, 행정구역 트리, 연령 누적합, 검색 인덱스, 성별 큐브, 경계 단순화)를
+모든 페이지가 shared.cache.DATA_CACHE를 거쳐 가져오게 합니다.
+- 같은 파일을 여러 페이지가 열어도 한 번만 파싱하고, 메모리 예산을 넘으면 오래 안 쓴 데이터부터 내립니다.
+- 기본 파일은 (경로, 수정 시각, 크기)가 같으면 다시 읽거나 해시하지 않습니다.
+- 캐시를 거치는 호출마다 실행 추적에 구간을 남기고, 새로 만들 때만 spinner를 보여줍니다.
+"""
+import functools
+import inspect
+import os
+
+import streamlit as st
+
+from population.age_index import AgeIndex
+from population.cube import ingest_cube, region_tree as cube_region_tree
+from population.geometry import GeometryCache
+from population.ingest import content_hash, parse_population_csv
+from population.regions import RegionTree
+from population.search import RegionSearchIndex
+from shared.cache import DATA_CACHE
+from shared.trace import span
+
+
+def memoize(namespace, kind='compute', spinner=None, cache=DATA_CACHE):
+    """
+    함수 결과를 공유 캐시의 namespace에 보관하는 데코레이터.
+    st.cache_resource처럼 이름이 '_'로 시작하는 인자는 키에서 빼므로 (해시, _데이터)처럼 부르면 됩니다.
+    반환값은 모든 세션이 같은 객체를 공유하므로 호출한 쪽에서 고치지 않아야 합니다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple((name, value) for name, value in bound.arguments.items() if not name.startswith('_'))
+
+            def build():
+                if spinner is None:
+                    return func(*args, **kwargs)
+                with st.spinner(spinner):
+                    return func(*args, **kwargs)
+
+            with span(kind, namespace) as record:
+                value, hit = cache.get_or_build(namespace, key, build)
+                if record is not None:
+                    record['cached'] = hit
+            return value
+
+        return wrapper
+    return decorator
+
+
+def read_file(path):
+    """파일 내용과 내용 해시 (수정 시각과 크기가 그대로면 캐시된 값)"""
+    stat = os.stat(path)
+    return _read_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@memoize('file', kind='fetch')
+def _read_file(path, mtime_ns, size):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, content_hash(data)
+
+
+def read_upload(uploaded_file):
+    """업로드 파일 내용과 내용 해시 (같은 업로드는 rerun마다 다시 해시하지 않음)"""
+    data = uploaded_file.getvalue()
+    return data, _upload_hash(uploaded_file.file_id, len(data), _data=data)
+
+
+@memoize('upload', kind='parse')
+def _upload_hash(file_id, size, _data):
+    return content_hash(_data)
+
+
+# ---------------------------------------------------------------- 인구 데이터
+
+@memoize('population', kind='parse', spinner="📂 파일을 읽는 중...")
+def population_table(file_hash, _data):
+    """인구 CSV 파일별 파싱 결과 (인구 수는 파싱하면서 int32로 변환)"""
+    return parse_population_csv(_data)
+
+
+@memoize('region_tree', kind='compute')
+def region_tree(file_hash, _data):
+    """파일별 행정구역 코드 트리와 모든 계층의 사전 집계"""
+    return RegionTree(population_table(file_hash, _data))
+
+
+@memoize('age_index', kind='compute')
+def age_index(file_hash, _data):
+    """파일별 연령 누적합 인덱스 - 트리의 모든 노드(상위 지역 합계 포함)를 행으로 사용"""
+    return AgeIndex.from_table(region_tree(file_hash, _data).table())
+
+
+@memoize('search_index', kind='compute')
+def search_index(source, key, _tree):
+    """트리별 지역 이름/초성/코드 검색 인덱스 (source: 트리 종류, key: 트리를 만든 파일 해시나 저장소 버전)"""
+    return RegionSearchIndex(_tree.order)
+
+
+@memoize('cube', kind='parse', spinner="📦 인구 큐브를 준비하는 중...")
+def population_cube(file_hash, _data):
+    """
+    남/여 연령별 파일의 int32 큐브 (디스크에 한 번 만들고 메모리 맵으로 엶).
+    메모리 맵은 OS 페이지 캐시에 있으므로 캐시 예산에는 머리 부분만 잡힙니다.
+    """
+    return ingest_cube(_data)
+
+
+@memoize('cube_tree', kind='compute')
+def cube_tree(file_hash, _data):
+    """큐브 지역 목록의 행정구역 트리"""
+    return cube_region_tree(population_cube(file_hash, _data))
+
+
+@memoize('geometry', kind='parse', spinner="🗺️ 경계를 확대 수준별로 단순화하는 중...")
+def geometry(file_hash, _data):
+    """GeoJSON 파일별 확대 수준 단순화 캐시 (디스크에 한 번 만들고 재사용)"""
+    return GeometryCache(_data)
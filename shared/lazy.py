@@ -0,0 +1,63 @@
+"""
+무거운 모듈의 지연 import
+
+lazy_import('plotly.express')는 모듈 대신 대리 객체를 돌려주고, 속성을 처음 읽을 때 실제로 import합니다.
+- 차트를 그리지 않는 실행 경로(파일 업로드 전, 버튼을 누르기 전 등)는 import 비용을 내지 않습니다.
+- 한 번 import한 모듈은 프로세스에 남으므로 비용은 프로세스당 처음 한 번뿐이며,
+  그 시간은 실행 추적에 'import' 구간으로 남습니다.
+실행 경로에 따라 쓰지 않을 수 있는 모듈만 지연합니다. 다음은 일부러 그대로 import합니다.
+- pandas: market/population/mbti/bookmarks의 데이터 모듈이 모두 쓰므로 페이지에서만 지연해도 결국 import됩니다
+  (데이터 모듈을 쓰지 않는 자료구조 페이지만 지연).
+- folium, streamlit_folium: 지도 페이지는 매 실행 지도를 그리고, 지도 레이어 모듈(bookmarks.render,
+  population.choropleth)도 folium으로 레이어를 만듭니다.
+- plotly.graph_objects: plotly가 안에서 이미 필요할 때 불러오도록 되어 있어 import 자체가 가볍습니다.
+"""
+import importlib
+import sys
+import threading
+
+from shared.trace import span
+
+
+class LazyModule:
+    """처음 속성을 읽을 때 import되는 모듈 대리 객체"""
+
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    if self._name in sys.modules:
+                        self._module = sys.modules[self._name]
+                    else:
+                        with span('import', self._name):
+                            self._module = importlib.import_module(self._name)
+                module = self._module
+        return module
+
+    @property
+    def loaded(self):
+        """이미 import되었는지 (이 대리 객체 밖에서 import된 경우 포함)"""
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """모듈 이름 -> 처음 사용할 때 import되는 대리 객체"""
+    return LazyModule(name)
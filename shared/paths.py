@@ -0,0 +1,30 @@
+"""
+디스크 저장소 위치
+
+주가/패널/내보내기, 인구 큐브/시계열, 설문 응답, 즐겨찾기, 실행 추적 같은 저장소는 모두 data_dir() 아래에 둡니다.
+기본은 저장소 루트의 .cache이고, 환경 변수 APP_DATA_DIR로 통째로 다른 곳에 둘 수 있습니다
+(부하 테스트처럼 실제 저장소를 건드리면 안 되는 실행에서 사용).
+각 모듈은 import할 때 기본 위치를 정하므로 환경 변수는 프로세스를 시작할 때 정해 두어야 합니다.
+이 모듈은 다른 모듈을 import하지 않으므로 어느 패키지에서든 쓸 수 있습니다.
+"""
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# streamlit의 정적 파일 폴더 (.streamlit/config.toml의 server.enableStaticServing) -> /app/static/...
+STATIC_ROOT = ROOT / 'static'
+
+
+def data_dir(*parts):
+    """저장소 위치 (APP_DATA_DIR 또는 .cache) 아래 경로"""
+    base = os.environ.get('APP_DATA_DIR')
+    return (Path(base) if base else ROOT / '.cache').joinpath(*parts)
+
+
+def static_dir(*parts):
+    """
+    브라우저가 정적 파일로 받아 가는 파일의 위치.
+    APP_DATA_DIR이 있으면 그 아래 static에 쓰므로 실제 정적 폴더는 건드리지 않습니다 (이때는 브라우저로 제공되지 않음).
+    """
+    base = os.environ.get('APP_DATA_DIR')
+    return (Path(base) / 'static' if base else STATIC_ROOT).joinpath(*parts)
@@ -0,0 +1,169 @@
+"""
+페이지 실행(rerun)별 시간 추적
+
+페이지 맨 위에서 start_trace(페이지 이름), 맨 아래에서 finish_trace()를 부르고,
+그 사이 구간을 span(종류, 이름)으로 감싸면 한 번의 실행이 구간 목록이 됩니다.
+- 종류(KINDS): fetch(원격/디스크 조회), parse(파일 해석), compute(계산), figure(차트 만들기),
+  serialize(차트/표를 브라우저로 보낼 형태로 바꾸기), import(지연 import)
+- 끝난 실행은 JSON 한 줄로 저장소 위치의 traces.jsonl(APP_TRACE_FILE, 빈 문자열이면 끔)에 덧붙이고,
+  ?debug=1 주소나 APP_DEBUG=1이면 페이지 아래에 디버그 패널로도 보여줍니다.
+- st.stop()/st.rerun()으로 끝까지 가지 못한 실행은 다음 실행을 시작할 때 'interrupted'로 기록합니다
+  (총 시간은 마지막 구간이 끝난 시각까지).
+추적 중인 실행이 없으면 span()은 아무것도 하지 않으므로 모듈 코드에서도 그대로 쓸 수 있습니다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from shared.cache import DATA_CACHE
+from shared.paths import data_dir
+
+KINDS = ('fetch', 'parse', 'compute', 'figure', 'serialize', 'import')
+DEFAULT_PATH = data_dir('traces.jsonl')
+MAX_FILE_BYTES = 20 * 1024 * 1024  # 넘으면 traces.jsonl.1로 돌리고 새로 씀
+SESSION_KEY = '_trace'
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+class Trace:
+    """한 번의 페이지 실행에서 잰 구간 목록 (시각은 실행 시작부터의 ms)"""
+
+    def __init__(self, page, session):
+        self.page = page
+        self.session = session
+        self.started = time.time()
+        self.finished = False
+        self.spans = []         # [{'kind', 'name', 'start_ms', 'ms', 'depth'}] (시작 순서)
+        self._t0 = time.perf_counter()
+        self._open = []         # 열려 있는 구간의 [자식 구간 시간 합]
+        self._self_ms = {}      # 종류 -> 자식 구간을 뺀 시간 합
+
+    def now_ms(self):
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def span(self, kind, name=None):
+        record = {'kind': kind, 'name': name, 'start_ms': self.now_ms(), 'ms': None, 'depth': len(self._open)}
+        self.spans.append(record)
+        self._open.append([0.0])
+        try:
+            yield record
+        finally:
+            children = self._open.pop()[0]
+            record['ms'] = self.now_ms() - record['start_ms']
+            self._self_ms[kind] = self._self_ms.get(kind, 0.0) + record['ms'] - children
+            if self._open:
+                self._open[-1][0] += record['ms']
+
+    def to_record(self, status, total_ms):
+        return {
+            'page': self.page,
+            'session': self.session,
+            'started': datetime.fromtimestamp(self.started).isoformat(timespec='milliseconds'),
+            'status': status,
+            'total_ms': round(total_ms, 3),
+            'kinds': {kind: round(ms, 3) for kind, ms in self._self_ms.items()},
+            'spans': [dict(s, start_ms=round(s['start_ms'], 3), ms=None if s['ms'] is None else round(s['ms'], 3))
+                      for s in self.spans],
+        }
+
+
+def current_trace():
+    """이 스레드에서 진행 중인 실행의 Trace (없으면 None)"""
+    trace = getattr(_local, 'trace', None)
+    return trace if trace is not None and not trace.finished else None
+
+
+@contextmanager
+def span(kind, name=None):
+    """진행 중인 실행에 구간을 남김 (추적 중이 아니면 아무것도 하지 않음)"""
+    trace = current_trace()
+    if trace is None:
+        yield None
+        return
+    with trace.span(kind, name) as record:
+        yield record
+
+
+def trace_path():
+    path = os.environ.get('APP_TRACE_FILE')
+    if path is None:
+        return DEFAULT_PATH
+    return Path(path) if path else None
+
+
+def write_record(record):
+    """JSON 한 줄을 추적 파일에 덧붙임 (여러 세션이 동시에 써도 줄이 섞이지 않게 잠금)"""
+    path = trace_path()
+    if path is None:
+        return
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > MAX_FILE_BYTES:
+            os.replace(path, path.with_name(path.name + '.1'))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+
+def start_trace(page):
+    """페이지 실행 추적 시작 (이 세션의 이전 실행이 끝나지 못했으면 먼저 기록)"""
+    previous = st.session_state.get(SESSION_KEY)
+    if previous is not None and not previous.finished:
+        previous.finished = True
+        last = max((s['start_ms'] + (s['ms'] or 0) for s in previous.spans), default=0.0)
+        write_record(previous.to_record('interrupted', last))
+    ctx = get_script_run_ctx()
+    trace = Trace(page, ctx.session_id if ctx is not None else None)
+    _local.trace = trace
+    st.session_state[SESSION_KEY] = trace
+    return trace
+
+
+def debug_enabled():
+    return os.environ.get('APP_DEBUG') == '1' or st.query_params.get('debug') == '1'
+
+
+def finish_trace():
+    """실행 추적을 끝내고 기록 (디버그 모드면 패널 표시). 기록한 dict 또는 None"""
+    trace = current_trace()
+    if trace is None:
+        return None
+    trace.finished = True
+    _local.trace = None
+    record = trace.to_record('complete', trace.now_ms())
+    write_record(record)
+    if debug_enabled():
+        debug_panel(record)
+    return record
+
+
+def debug_panel(record):
+    """실행 구간 표, 종류별 시간, 공유 캐시 사용량"""
+    with st.expander(f"🐞 실행 시간 추적 ({record['total_ms']:,.0f}ms)"):
+        st.dataframe(
+            [{'구간': '　' * s['depth'] + s['kind'] + (f" · {s['name']}" if s['name'] else ''),
+              '시작 (ms)': round(s['start_ms'], 1), '시간 (ms)': round(s['ms'], 1)} for s in record['spans']],
+            hide_index=True
+        )
+        if record['kinds']:
+            st.caption("종류별 시간 (하위 구간 제외, ms)")
+            st.bar_chart({kind: [ms] for kind, ms in record['kinds'].items()}, horizontal=True, stack=False)
+        stats = DATA_CACHE.stats()
+        st.caption(f"📦 공유 데이터 캐시 {DATA_CACHE.used / 2**20:,.1f}MB / {DATA_CACHE.budget / 2**20:,.0f}MB")
+        if stats:
+            st.dataframe(
+                [{'이름공간': name, '항목': row['entries'], '크기 (MB)': round(row['bytes'] / 2**20, 2),
+                  '적중': row['hits'], '실패': row['misses'], '제거': row['evictions']}
+                 for name, row in sorted(stats.items())],
+                hide_index=True
+            )
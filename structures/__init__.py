@@ -0,0 +1 @@
+"""01_stack 페이지에서 사용하는 배열 기반 스택/큐 자료구조"""
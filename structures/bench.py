@@ -0,0 +1,219 @@
+"""
+스택/큐 연산 복잡도 벤치마크
+
+list(pop(0)으로 큐), collections.deque, 배열 기반 스택/원형 버퍼(structures.ring)의
+push/pop/enqueue/dequeue를 입력 크기(1e3~1e7)별로 잽니다.
+- (구현, 연산, 크기) 칸마다 워밍업 실행 뒤 repeats번 재고 중앙값과 백분위를 남깁니다 (측정 중에는 GC를 끔).
+- 요소는 모두 같은 객체(0)를 넣어 요소 객체가 아니라 자료구조 자체의 시간/메모리만 잽니다.
+- 크기별 총 시간의 log-log 기울기로 성장 차수를 맞춥니다 (1이면 연산당 O(1), 2면 연산당 O(n)).
+- list.pop(0)은 연산당 O(n)이라 LIST_DEQUEUE_MAX보다 큰 크기는 건너뛰고 결과에 남깁니다.
+칸마다 별도 작업으로 실행하므로 페이지는 작업 프로세스에 맡기고 끝난 칸 수로 진행률을 보여줍니다.
+
+실행: python -m structures.bench [--sizes 1000 10000 100000] [--repeats 5] [--json result.json]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+from collections import deque
+from functools import partial
+from itertools import repeat
+
+import numpy as np
+
+from structures.ring import ArrayStack, RingQueue
+
+IMPLEMENTATIONS = {'list': 'list', 'deque': 'collections.deque', 'ring': '배열 기반 (원형 버퍼)'}
+OPERATIONS = ('push', 'pop', 'enqueue', 'dequeue')
+STRUCTURES = {'stack': '스택', 'queue': '큐'}  # 메모리를 잴 용도 (배열 기반은 스택과 큐가 다른 자료구조)
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+LIST_DEQUEUE_MAX = 100_000  # list.pop(0)을 잴 최대 크기 (1e6이면 한 번에 몇 분)
+PERCENTILES = (10, 90)
+
+
+def _filled(impl, op, n):
+    """연산을 잴 자료구조 (꺼내는 연산이면 n개를 미리 채움)"""
+    fill = n if op in ('pop', 'dequeue') else 0
+    if impl == 'list':
+        return [0] * fill
+    if impl == 'deque':
+        return deque(repeat(0, fill))
+    container = ArrayStack() if op in ('push', 'pop') else RingQueue()
+    if fill:
+        (container.push_many if op == 'pop' else container.enqueue_many)([0] * fill)
+    return container
+
+
+def _operation(container, impl, op):
+    """자료구조의 연산 메서드 (반복문 안에서 속성 조회를 하지 않도록 미리 묶음)"""
+    if impl == 'list':
+        return {'push': container.append, 'pop': container.pop,
+                'enqueue': container.append, 'dequeue': partial(container.pop, 0)}[op]
+    if impl == 'deque':
+        return {'push': container.append, 'pop': container.pop,
+                'enqueue': container.append, 'dequeue': container.popleft}[op]
+    return getattr(container, op)  # ArrayStack.push/pop, RingQueue.enqueue/dequeue
+
+
+def _run_once(impl, op, n):
+    container = _filled(impl, op, n)
+    func = _operation(container, impl, op)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if op in ('push', 'enqueue'):
+            start = time.perf_counter()
+            for _ in repeat(None, n):
+                func(0)
+        else:
+            start = time.perf_counter()
+            for _ in repeat(None, n):
+                func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def skipped(impl, op, n):
+    """너무 오래 걸려 재지 않는 칸인지"""
+    return impl == 'list' and op == 'dequeue' and n > LIST_DEQUEUE_MAX
+
+
+def time_operation(impl, op, n, repeats=5, warmup=1):
+    """(구현, 연산, 크기) 한 칸: 워밍업 warmup번 뒤 repeats번 잰 n번 연산의 총 시간(초) 목록"""
+    for _ in range(warmup):
+        _run_once(impl, op, n)
+    runs = [_run_once(impl, op, n) for _ in range(repeats)]
+    return {'impl': impl, 'op': op, 'n': n, 'runs': runs}
+
+
+def container_bytes(impl, n, structure='stack'):
+    """
+    n개를 담은 자료구조 자체의 크기 (bytes, 요소 객체 제외).
+    list/deque는 스택과 큐가 같은 객체이고, 배열 기반은 structure에 따라 ArrayStack 또는 RingQueue를 잽니다.
+    """
+    if impl == 'list':
+        container = []
+        container.extend(repeat(0, n))  # append로 늘린 것과 같은 여유 공간
+        return sys.getsizeof(container)
+    if impl == 'deque':
+        return sys.getsizeof(deque(repeat(0, n)))
+    if structure == 'stack':
+        container = ArrayStack()
+        container.push_many([0] * n)
+    else:
+        container = RingQueue()
+        container.enqueue_many([0] * n)
+    return sys.getsizeof(container) + sys.getsizeof(container._items)
+
+
+def memory_usage(impl, n, structure='stack'):
+    size = container_bytes(impl, n, structure)
+    return {'impl': impl, 'structure': structure, 'n': n, 'bytes': size, 'bytes_per_element': size / n}
+
+
+def fit_growth(sizes, seconds):
+    """log(시간) = k * log(n) + c 최소제곱 -> (차수 k, 계수 10^c). 크기가 둘 미만이면 None"""
+    if len(sizes) < 2:
+        return None
+    k, c = np.polyfit(np.log10(sizes), np.log10(seconds), 1)
+    return float(k), float(10 ** c)
+
+
+def summarize(timings, memory, params, percentiles=PERCENTILES):
+    """칸별 측정을 중앙값/백분위/연산당 시간과 성장 차수로 정리 (JSON으로 내보낼 수 있는 dict)"""
+    rows = []
+    for t in timings:
+        runs = np.array(t['runs'])
+        median = float(np.median(runs))
+        low, high = (float(v) for v in np.percentile(runs, percentiles))
+        rows.append({
+            'impl': t['impl'], 'op': t['op'], 'n': t['n'], 'runs': t['runs'],
+            'median_s': median, f'p{percentiles[0]}_s': low, f'p{percentiles[1]}_s': high,
+            'per_op_ns': median / t['n'] * 1e9,
+        })
+    fits = []
+    for impl in IMPLEMENTATIONS:
+        for op in OPERATIONS:
+            cells = sorted((r['n'], r['median_s']) for r in rows if r['impl'] == impl and r['op'] == op)
+            fit = fit_growth([n for n, _ in cells], [s for _, s in cells])
+            if fit is not None:
+                fits.append({'impl': impl, 'op': op, 'exponent': fit[0], 'coefficient': fit[1]})
+    skipped_cells = [{'impl': impl, 'op': op, 'n': n}
+                     for impl in params['impls'] for op in params['ops'] for n in params['sizes']
+                     if skipped(impl, op, n)]
+    return {'params': params, 'percentiles': list(percentiles), 'timings': rows,
+            'memory': memory, 'fits': fits, 'skipped': skipped_cells}
+
+
+class BenchmarkJob:
+    """executor에 칸별 작업을 넣고 진행률과 (모두 끝나면) 정리된 결과를 돌려줌"""
+
+    def __init__(self, executor, sizes, impls, ops, repeats=5, warmup=1):
+        self.params = {'sizes': list(sizes), 'impls': list(impls), 'ops': list(ops),
+                       'repeats': repeats, 'warmup': warmup}
+        self.started = time.time()
+        self._result = None
+        # 작은 크기부터 넣어 결과가 빨리 쌓이게 함
+        self._timing = [executor.submit(time_operation, impl, op, n, repeats, warmup)
+                        for n in sorted(sizes) for impl in impls for op in ops if not skipped(impl, op, n)]
+        self._memory = [executor.submit(memory_usage, impl, n, structure)
+                        for n in sorted(sizes) for impl in impls for structure in STRUCTURES]
+
+    def progress(self):
+        """(끝난 작업 수, 전체 작업 수)"""
+        futures = self._timing + self._memory
+        return sum(f.done() for f in futures), len(futures)
+
+    def done(self):
+        finished, total = self.progress()
+        return finished == total
+
+    def elapsed(self):
+        return time.time() - self.started
+
+    def result(self):
+        """모든 작업이 끝난 뒤의 정리 결과 (작업 중 오류는 여기서 다시 발생)"""
+        if self._result is None:
+            timings = [f.result() for f in self._timing]
+            memory = [f.result() for f in self._memory]
+            self._result = summarize(timings, memory, self.params)
+        return self._result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='입력 크기 목록')
+    parser.add_argument('--impls', nargs='+', default=list(IMPLEMENTATIONS), choices=list(IMPLEMENTATIONS))
+    parser.add_argument('--ops', nargs='+', default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument('--repeats', type=int, default=5, help='칸마다 잴 횟수')
+    parser.add_argument('--warmup', type=int, default=1, help='재기 전에 버리는 실행 횟수')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    params = {'sizes': args.sizes, 'impls': args.impls, 'ops': args.ops,
+              'repeats': args.repeats, 'warmup': args.warmup}
+    timings = [time_operation(impl, op, n, args.repeats, args.warmup)
+               for n in sorted(args.sizes) for impl in args.impls for op in args.ops if not skipped(impl, op, n)]
+    memory = [memory_usage(impl, n, structure)
+              for n in sorted(args.sizes) for impl in args.impls for structure in STRUCTURES]
+    result = summarize(timings, memory, params)
+
+    header = f"{'구현':<8}{'연산':<10}{'크기':>12}{'중앙값(ms)':>14}{'연산당(ns)':>14}"
+    print(header)
+    print('-' * len(header))
+    for row in result['timings']:
+        print(f"{row['impl']:<8}{row['op']:<10}{row['n']:>12,}{row['median_s'] * 1000:>14.2f}{row['per_op_ns']:>14.1f}")
+    for fit in result['fits']:
+        print(f"{fit['impl']:<8}{fit['op']:<10} 성장 차수 {fit['exponent']:.2f}")
+    for cell in result['skipped']:
+        print(f"{cell['impl']:<8}{cell['op']:<10}{cell['n']:>12,} 건너뜀")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
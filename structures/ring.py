@@ -0,0 +1,178 @@
+"""
+배열 기반 스택과 원형 버퍼(ring buffer) 큐
+
+파이썬 list/deque에 한 칸씩 넣는 대신, 미리 잡아 둔 고정 크기 배열(capacity) 위에서 위치만 움직입니다.
+- 스택은 [0, size) 구간, 큐는 head부터 size개가 배열 끝에서 처음으로 이어지는 원형 구간을 씁니다.
+- 가득 차면 용량을 두 배로 늘려 한 번에 옮기므로 push/enqueue는 분할 상환 O(1), pop/dequeue는 O(1)입니다.
+- N개 일괄 추가/제거는 요소마다 메서드를 부르지 않고 슬라이스 대입(큐는 최대 두 조각) 한 번으로 처리합니다.
+- 화면에는 window()로 맨 위/맨 앞에서 K개만 꺼내 보여주므로 요소가 10만 개여도 그리는 양은 K개입니다.
+"""
+
+DEFAULT_CAPACITY = 16
+
+
+class ArrayStack:
+    """미리 할당한 배열 위의 스택 (맨 위 = 마지막 위치)"""
+
+    __slots__ = ('_items', '_size')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._items = [None] * max(capacity, 1)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._items)
+
+    def _reserve(self, needed):
+        if needed > len(self._items):
+            capacity = len(self._items)
+            while capacity < needed:
+                capacity *= 2
+            self._items.extend([None] * (capacity - len(self._items)))
+
+    def push(self, value):
+        if self._size == len(self._items):
+            self._reserve(self._size + 1)
+        self._items[self._size] = value
+        self._size += 1
+
+    def push_many(self, values):
+        """여러 값을 순서대로 쌓음 (마지막 값이 맨 위)"""
+        values = list(values)
+        self._reserve(self._size + len(values))
+        self._items[self._size:self._size + len(values)] = values
+        self._size += len(values)
+
+    def pop(self):
+        if self._size == 0:
+            raise IndexError("스택이 비어 있습니다.")
+        self._size -= 1
+        value = self._items[self._size]
+        self._items[self._size] = None  # 참조를 놓아 메모리 회수
+        return value
+
+    def pop_many(self, n):
+        """맨 위에서 n개(남은 수보다 많으면 전부)를 꺼내 꺼낸 순서(맨 위부터)로 반환"""
+        n = min(n, self._size)
+        start = self._size - n
+        values = self._items[start:self._size][::-1]
+        self._items[start:self._size] = [None] * n
+        self._size = start
+        return values
+
+    def peek(self):
+        if self._size == 0:
+            raise IndexError("스택이 비어 있습니다.")
+        return self._items[self._size - 1]
+
+    def clear(self):
+        self._items[:self._size] = [None] * self._size
+        self._size = 0
+
+    def window(self, k, offset=0):
+        """맨 위에서 offset개를 건너뛴 뒤 k개 [(위치, 값)] (맨 위부터)"""
+        end = max(self._size - offset, 0)
+        start = max(end - k, 0)
+        return [(i, self._items[i]) for i in range(end - 1, start - 1, -1)]
+
+
+class RingQueue:
+    """미리 할당한 배열을 원형으로 쓰는 큐 (head = 맨 앞 위치)"""
+
+    __slots__ = ('_items', '_head', '_size')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._items = [None] * max(capacity, 1)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._items)
+
+    def _reserve(self, needed):
+        if needed > len(self._items):
+            capacity = len(self._items)
+            while capacity < needed:
+                capacity *= 2
+            # 원형 구간을 0부터 펼쳐서 새 배열로 옮김
+            items = self._ordered(0, self._size)
+            self._items = items + [None] * (capacity - len(items))
+            self._head = 0
+
+    def _ordered(self, offset, count):
+        """맨 앞에서 offset번째부터 count개 (배열 끝을 넘으면 두 조각을 이어 붙임)"""
+        capacity = len(self._items)
+        start = (self._head + offset) % capacity
+        end = start + count
+        if end <= capacity:
+            return self._items[start:end]
+        return self._items[start:] + self._items[:end - capacity]
+
+    def enqueue(self, value):
+        items = self._items
+        if self._size == len(items):
+            self._reserve(self._size + 1)
+            items = self._items
+        items[(self._head + self._size) % len(items)] = value
+        self._size += 1
+
+    def enqueue_many(self, values):
+        """여러 값을 순서대로 뒤에 추가 (슬라이스 대입 최대 두 번)"""
+        values = list(values)
+        self._reserve(self._size + len(values))
+        capacity = len(self._items)
+        start = (self._head + self._size) % capacity
+        first = min(len(values), capacity - start)
+        self._items[start:start + first] = values[:first]
+        self._items[:len(values) - first] = values[first:]
+        self._size += len(values)
+
+    def dequeue(self):
+        if self._size == 0:
+            raise IndexError("큐가 비어 있습니다.")
+        value = self._items[self._head]
+        self._items[self._head] = None
+        self._head = (self._head + 1) % len(self._items)
+        self._size -= 1
+        return value
+
+    def dequeue_many(self, n):
+        """맨 앞에서 n개(남은 수보다 많으면 전부)를 꺼내 순서대로 반환"""
+        n = min(n, self._size)
+        values = self._ordered(0, n)
+        capacity = len(self._items)
+        first = min(n, capacity - self._head)
+        self._items[self._head:self._head + first] = [None] * first
+        self._items[:n - first] = [None] * (n - first)
+        self._head = (self._head + n) % capacity
+        self._size -= n
+        return values
+
+    def front(self):
+        if self._size == 0:
+            raise IndexError("큐가 비어 있습니다.")
+        return self._items[self._head]
+
+    def rear(self):
+        if self._size == 0:
+            raise IndexError("큐가 비어 있습니다.")
+        return self._items[(self._head + self._size - 1) % len(self._items)]
+
+    def clear(self):
+        self._items = [None] * len(self._items)
+        self._head = 0
+        self._size = 0
+
+    def window(self, k, offset=0):
+        """맨 앞에서 offset개를 건너뛴 뒤 k개 [(위치, 값)] (맨 앞부터)"""
+        offset = min(offset, self._size)
+        count = min(k, self._size - offset)
+        return list(zip(range(offset, offset + count), self._ordered(offset, count)))